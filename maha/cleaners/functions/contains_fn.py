@@ -47,7 +47,7 @@ from maha.expressions import (
     EXPRESSION_LINKS,
     EXPRESSION_MENTIONS,
 )
-from maha.rexy import Expression, ExpressionGroup
+from maha.rexy import Expression, ExpressionGroup, StringSet
 from maha.utils import check_positive_integer
 
 
@@ -81,7 +81,7 @@ def contains(
     links: bool = False,
     mentions: bool = False,
     emojis: bool = False,
-    custom_strings: list[str] | str | None = None,
+    custom_strings: list[str] | str | StringSet | None = None,
     custom_expressions: ExpressionGroup | Expression | None = None,
     operator: str | None = None,
 ) -> dict[str, bool] | bool:
@@ -160,7 +160,7 @@ def contains(
     emojis : bool, optional
         Check for emojis using the expression :data:`~.EXPRESSION_EMOJIS`,
         by default False
-    custom_strings : Union[List[str], str], optional
+    custom_strings : Union[List[str], str, :class:`~.StringSet`], optional
         Include any other string(s), by default None
     custom_expressions :
         Include any other expressions, by default None
@@ -386,14 +386,14 @@ def contains_expressions(
     raise ValueError("'expressions' must be of type Expression, ExpressionGroup or str")
 
 
-def contain_strings(text: str, strings: list[str] | str) -> bool:
+def contain_strings(text: str, strings: list[str] | str | StringSet) -> bool:
     """Check for the input ``strings`` in the given ``text``
 
     Parameters
     ----------
     text : str
         Text to check
-    strings : Union[List[str], str]
+    strings : Union[List[str], str, :class:`~.StringSet`]
         String or list of strings to check for
 
     Returns
@@ -420,6 +420,9 @@ def contain_strings(text: str, strings: list[str] | str) -> bool:
     if not strings:
         raise ValueError("'strings cannot be empty.")
 
+    if isinstance(strings, StringSet):
+        return contains_expressions(text, strings)
+
     # convert list to str
     if isinstance(strings, list):
         strings = "|".join(str(re.escape(c)) for c in strings)
@@ -12,6 +12,8 @@ __all__ = [
     "keep_arabic_letters_with_harakat",
 ]
 
+from functools import lru_cache
+
 import maha.cleaners.functions as functions
 from maha.constants import (
     ALL_HARAKAT,
@@ -32,6 +34,7 @@ from maha.constants import (
     SPACE,
     TATWEEL,
 )
+from maha.rexy import StringSet
 
 
 def keep(
@@ -51,7 +54,7 @@ def keep(
     arabic_punctuations: bool = False,
     english_punctuations: bool = False,
     use_space: bool = True,
-    custom_strings: list[str] | str | None = None,
+    custom_strings: list[str] | str | StringSet | None = None,
 ):
     """Keeps only certain characters in the given text and removes everything else.
 
@@ -93,7 +96,7 @@ def keep(
     use_space : bool, optional
         False to not replace with space, check :func:`~.keep_strings`
         for more information, by default True
-    custom_strings : List[str], optional
+    custom_strings : Union[List[str], str, :class:`~.StringSet`], optional
         Include any other string(s), by default None
 
     Returns
@@ -122,6 +125,11 @@ def keep(
 
     custom_strings = custom_strings or []
 
+    # a compiled set of strings is extended with the other arguments
+    string_set = None
+    if isinstance(custom_strings, StringSet):
+        string_set, custom_strings = custom_strings, []
+
     # current function arguments
     current_arguments = locals()
     constants = globals()
@@ -141,6 +149,11 @@ def keep(
         if const and value is True:
             chars_to_keep += const
 
+    if string_set:
+        if chars_to_keep:
+            string_set = _extend_string_set(string_set, tuple(sorted(chars_to_keep)))
+        return keep_strings(text, string_set, use_space)
+
     if not chars_to_keep:
         raise ValueError("At least one argument should be True")
 
@@ -256,7 +269,9 @@ def keep_arabic_letters_with_harakat(text: str) -> str:
     return keep_strings(text, ARABIC_LETTERS + HARAKAT)
 
 
-def keep_strings(text: str, strings: list[str] | str, use_space: bool = True) -> str:
+def keep_strings(
+    text: str, strings: list[str] | str | StringSet, use_space: bool = True
+) -> str:
 
     """Keeps only the input strings ``strings`` in the given text ``text``
 
@@ -274,7 +289,7 @@ def keep_strings(text: str, strings: list[str] | str, use_space: bool = True) ->
     ----------
     text : str
         Text to be processed
-    strings : Union[List[str], str]
+    strings : Union[List[str], str, :class:`~.StringSet`]
         list of strings to keep
     use_space :
         False to not replace with space, defaults to True
@@ -323,3 +338,10 @@ def keep_strings(text: str, strings: list[str] | str, use_space: bool = True) ->
         output_text = functions.replace_except(text, strings, EMPTY)
 
     return output_text.strip()
+
+
+@lru_cache(maxsize=32)
+def _extend_string_set(string_set: StringSet, strings: tuple[str, ...]) -> StringSet:
+    """Returns a new set that contains the strings of ``string_set`` and
+    ``strings``, cached to avoid recompiling large sets on every call."""
+    return StringSet(string_set.strings.union(strings))
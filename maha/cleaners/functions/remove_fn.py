@@ -26,6 +26,8 @@ __all__ = [
 ]
 
 
+from typing import Any
+
 import maha.cleaners.functions as functions
 from maha.constants import (
     ALL_HARAKAT,
@@ -61,7 +63,7 @@ from maha.expressions import (
     EXPRESSION_LINKS,
     EXPRESSION_MENTIONS,
 )
-from maha.rexy import Expression, ExpressionGroup
+from maha.rexy import Expression, ExpressionGroup, StringSet
 from maha.utils import check_positive_integer
 
 
@@ -93,7 +95,7 @@ def remove(
     mentions: bool = False,
     emojis: bool = False,
     use_space: bool = True,
-    custom_strings: list[str] | str | None = None,
+    custom_strings: list[str] | str | StringSet | None = None,
     custom_expressions: ExpressionGroup | Expression | list[str] | str | None = None,
 ):
 
@@ -169,7 +171,8 @@ def remove(
         False to not replace with space, check :func:`~.remove_strings`
         for more information, by default True
     custom_strings:
-        Include any other string(s), by default None
+        Include any other string(s), by default None. A :class:`~.StringSet` is
+        removed before the other characters
     custom_expressions:
         Include any other regular expression expressions, by default None
 
@@ -205,18 +208,17 @@ def remove(
     custom_strings = custom_strings or []
     custom_expressions = custom_expressions or ExpressionGroup()
 
+    # a compiled set of strings is removed on its own
+    string_set = None
+    if isinstance(custom_strings, StringSet):
+        string_set, custom_strings = custom_strings, []
+
     # current function arguments
     current_arguments = locals()
-    constants = globals()
-
-    # characters to remove
-    chars_to_remove = []
 
     if isinstance(custom_strings, str):
         custom_strings = [custom_strings]
 
-    chars_to_remove.extend(custom_strings)
-
     # expressions to remove
     if isinstance(custom_expressions, str):
         custom_expressions = Expression(custom_expressions)
@@ -226,22 +228,14 @@ def remove(
 
     expressions_to_remove = ExpressionGroup(custom_expressions)
 
-    # Since each argument has the same name as the corresponding constant
-    # (But, expressions should be prefixed with "EXPRESSION_" to match the actual expression.)
-    # Looping through all arguments and appending constants that correspond to the
-    # True arguments can work
-    # TODO: Maybe find a good pythonic way to do this
-    for arg, value in current_arguments.items():
-        const = constants.get(arg.upper())
-        if const and value is True:
-            chars_to_remove += const
-            continue
-        # check for expression
-        expression = constants.get("EXPRESSION_" + arg.upper())
-        if expression and value is True:
-            expressions_to_remove.add(expression)
+    chars_to_delete, chars_to_remove, expressions = _get_removed_constants(
+        current_arguments
+    )
+    chars_to_remove = list(custom_strings) + chars_to_remove
+    for expression in expressions:
+        expressions_to_remove.add(expression)
 
-    if not (chars_to_remove or expressions_to_remove):
+    if not (chars_to_remove or expressions_to_remove or string_set):
         raise ValueError("At least one argument should be True")
 
     output = text
@@ -249,14 +243,13 @@ def remove(
     if expressions_to_remove:
         output = remove_expressions(output, expressions_to_remove)
 
+    if string_set:
+        output = remove_strings(output, string_set, use_space)
+
     if chars_to_remove:
-        # check for constants that cannot be replaced with a space
-        if all_harakat:
-            output = remove_strings(output, ALL_HARAKAT, False)
-        elif harakat:
-            output = remove_strings(output, HARAKAT, False)
-        if tatweel:
-            output = remove_strings(output, TATWEEL, False)
+        # constants that cannot be replaced with a space are removed first
+        if chars_to_delete:
+            output = remove_strings(output, chars_to_delete, False)
 
         # remove duplicates
         chars_to_remove = list(set(chars_to_remove))
@@ -265,6 +258,56 @@ def remove(
     return output
 
 
+def _get_removed_constants(
+    arguments: dict[str, Any]
+) -> tuple[list[str], list[str], list[Expression]]:
+    """Returns the constants and expressions selected by the ``True`` arguments of
+    :func:`remove`.
+
+    Since each argument has the same name as the corresponding constant (But,
+    expressions should be prefixed with "EXPRESSION_" to match the actual
+    expression), looping through all arguments and appending constants that
+    correspond to the ``True`` arguments can work.
+
+    Parameters
+    ----------
+    arguments : dict[str, Any]
+        Arguments of :func:`remove` mapped to their values
+
+    Returns
+    -------
+    tuple[list[str], list[str], list[Expression]]
+        Characters that should be removed without a space before any other
+        string, strings to remove and expressions to remove
+    """
+    constants = globals()
+
+    chars_to_remove = []
+    expressions = []
+    for arg, value in arguments.items():
+        if value is not True:
+            continue
+        const = constants.get(arg.upper())
+        if const:
+            chars_to_remove += const
+            continue
+        # check for expression
+        expression = constants.get("EXPRESSION_" + arg.upper())
+        if expression:
+            expressions.append(expression)
+
+    # check for constants that cannot be replaced with a space
+    chars_to_delete = []
+    if arguments.get("all_harakat"):
+        chars_to_delete += ALL_HARAKAT
+    elif arguments.get("harakat"):
+        chars_to_delete += HARAKAT
+    if arguments.get("tatweel"):
+        chars_to_delete.append(TATWEEL)
+
+    return chars_to_delete, chars_to_remove, expressions
+
+
 def reduce_repeated_substring(
     text: str, min_repeated: int = 3, reduce_to: int = 2
 ) -> str:
@@ -665,7 +708,9 @@ def remove_expressions(
     return output_text.strip()
 
 
-def remove_strings(text: str, strings: list[str] | str, use_space: bool = True) -> str:
+def remove_strings(
+    text: str, strings: list[str] | str | StringSet, use_space: bool = True
+) -> str:
 
     """Removes the input strings ``strings`` in the given text ``text``
 
@@ -683,7 +728,7 @@ def remove_strings(text: str, strings: list[str] | str, use_space: bool = True)
     ----------
     text : str
         Text to be processed
-    strings : Union[List[str], str]
+    strings : Union[List[str], str, :class:`~.StringSet`]
         list of strings to remove
     use_space :
         False to not replace with space, defaults to True
@@ -755,6 +800,10 @@ def remove_extra_spaces(text: str, max_spaces: int = 1) -> str:
 
     check_positive_integer(max_spaces, "max_spaces")
 
+    # Nothing to replace if there are no extra spaces
+    if SPACE * (max_spaces + 1) not in text:
+        return text
+
     return functions.replace_expression(
         text, SPACE * max_spaces + "+", SPACE * max_spaces
     )
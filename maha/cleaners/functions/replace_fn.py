@@ -13,6 +13,7 @@ __all__ = [
 ]
 
 
+from functools import lru_cache
 from typing import Callable
 
 # To enjoy infinite width lookbehind
@@ -31,7 +32,7 @@ from maha.constants import (
     TEH,
     WAW,
 )
-from maha.rexy import Expression, ExpressionGroup
+from maha.rexy import Expression, ExpressionGroup, StringSet
 
 
 def connect_single_letter_word(
@@ -43,7 +44,7 @@ def connect_single_letter_word(
     kaf: bool | None = None,
     teh: bool | None = None,
     all: bool | None = None,
-    custom_strings: list[str] | str | None = None,
+    custom_strings: list[str] | str | StringSet | None = None,
 ):
     """Connects single-letter word with the letter following it.
 
@@ -65,11 +66,14 @@ def connect_single_letter_word(
         Connect :data:`.TEH` letter, by default None
     all : bool, optional
         Connect all letter except the ones set to False, by default None
-    custom_strings : Union[List[str], str], optional
+    custom_strings : Union[List[str], str, :class:`~.StringSet`], optional
         Include any other string(s) to connect, by default None
     """
     letters = []
-    if isinstance(custom_strings, str):
+    if isinstance(custom_strings, StringSet):
+        letters.append(custom_strings.pattern)
+        custom_strings = None
+    elif isinstance(custom_strings, str):
         custom_strings = [custom_strings]
 
     if waw or (all and waw is not False):
@@ -172,7 +176,7 @@ def replace_expression(
     return expression.sub(with_value, text)
 
 
-def replace(text: str, strings: list[str] | str, with_value: str) -> str:
+def replace(text: str, strings: list[str] | str | StringSet, with_value: str) -> str:
     """Replaces the input ``strings`` in the given text with the given value
 
     Parameters
@@ -180,7 +184,7 @@ def replace(text: str, strings: list[str] | str, with_value: str) -> str:
     text : str
         Text to process
     strings :
-        Strings to replace
+        Strings to replace, use :class:`~.StringSet` for large lists of strings
     with_value :
         Value to replace the input strings with
 
@@ -205,6 +209,16 @@ def replace(text: str, strings: list[str] | str, with_value: str) -> str:
         >>> replace(text, "$", "دولار")
         'ولقد كلف هذا المنتج 100 دولار'
     """
+    if isinstance(strings, StringSet):
+        return replace_expression(text, strings, with_value)
+
+    keys = (strings,) if isinstance(strings, str) else tuple(strings)
+    # Backslashes are processed as a replacement template by the regex module
+    if isinstance(with_value, str) and "\\" not in with_value:
+        character_map = _get_character_map(keys, (with_value,) * len(keys))
+        if character_map is not None:
+            return _replace_characters(text, character_map)
+
     # convert list to str
     if isinstance(strings, list):
         strings = "|".join(str(re.escape(c)) for c in strings)
@@ -214,7 +228,9 @@ def replace(text: str, strings: list[str] | str, with_value: str) -> str:
     return replace_expression(text, f"({strings})", with_value)
 
 
-def replace_except(text: str, strings: list[str] | str, with_value: str) -> str:
+def replace_except(
+    text: str, strings: list[str] | str | StringSet, with_value: str
+) -> str:
     """Replaces everything except the input ``strings`` in the given text
     with the given value
 
@@ -243,7 +259,9 @@ def replace_except(text: str, strings: list[str] | str, with_value: str) -> str:
         'ليت الذين تحب العين رؤيتهم'
     """
     # convert list to str
-    if isinstance(strings, list):
+    if isinstance(strings, StringSet):
+        strings = strings.pattern
+    elif isinstance(strings, list):
         strings = "|".join(str(re.escape(c)) for c in strings)
     else:
         strings = str(re.escape(strings))
@@ -293,6 +311,10 @@ def replace_pairs(text: str, keys: list[str], values: list[str]) -> str:
     if len(keys) != len(values):
         raise ValueError("'keys' and 'values' should have the same length")
 
+    character_map = _get_character_map(tuple(keys), tuple(values))
+    if character_map is not None:
+        return _replace_characters(text, character_map)
+
     escaped = [str(re.escape(c)) for c in keys]
     pattern = "|".join(escaped)
 
@@ -300,3 +322,34 @@ def replace_pairs(text: str, keys: list[str], values: list[str]) -> str:
         return values[keys.index(match.group(0))]
 
     return replace_expression(text, pattern, func)
+
+
+@lru_cache(maxsize=256)
+def _get_character_map(
+    keys: tuple[str, ...], values: tuple[str, ...]
+) -> dict[str, str] | None:
+    """Returns a map from each key to its value if all keys are single characters and
+    no value contains a key, None otherwise. Such maps can be applied with
+    :meth:`str.replace` one key at a time with the same result as a single regex pass.
+    """
+    if not keys or not all(len(key) == 1 for key in keys):
+        return None
+
+    character_map: dict[str, str] = {}
+    for key, value in zip(keys, values):
+        character_map.setdefault(key, value)
+    # Replacing a character with itself changes nothing
+    character_map = {k: v for k, v in character_map.items() if k != v}
+
+    if any(key in value for key in character_map for value in character_map.values()):
+        return None
+    return character_map
+
+
+def _replace_characters(text: str, character_map: dict[str, str]) -> str:
+    # Checking membership first is much faster than copying the text when the
+    # character is absent, which is the common case.
+    for key, value in character_map.items():
+        if key in text:
+            text = text.replace(key, value)
+    return text
@@ -1 +1,6 @@
-from .rules import *
+from . import rules
+
+
+def __getattr__(name: str):
+    # Rules are loaded lazily, see :mod:`maha.parsers.rules`
+    return getattr(rules, name)
@@ -1,2 +1,5 @@
+from .parse_batch import *
 from .parse_dimensions import *
 from .parse_fn import *
+from .parse_stream import *
+from .result_cache import *
@@ -0,0 +1,418 @@
+"""Functions that extract dimensions in parallel"""
+
+from __future__ import annotations
+
+__all__ = ["parse_dimension_batch", "parse_dimension_parallel", "shutdown_batch_pool"]
+
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Tuple
+
+import regex as re
+
+from maha.parsers.templates import Dimension, DimensionType
+from maha.rexy import Expression
+
+from .parse_dimensions import (
+    _get_dimension_types,
+    _get_gate,
+    _get_rule,
+    _parse_dimension_type,
+)
+
+# Pools by workers and dimension types, the most recently used last
+_POOLS: OrderedDict[tuple, ProcessPoolExecutor] = OrderedDict()
+# Number of batches that are using each pool, a pool is stopped only when it is not
+# used
+_POOL_USERS: dict[tuple, int] = {}
+_POOL_CONDITION = threading.Condition()
+# Pools that are not used are stopped when there are more pools than this, the least
+# recently used first
+_MAX_POOLS = 4
+_WORKER_DIMENSION_TYPES: tuple[DimensionType, ...] = ()
+
+# Start, end and value of a parsed dimension. Values of each dimension are parsed by
+# its rule, so the body and the rule are added back in the main process instead of
+# being pickled with each value.
+_ParsedValue = Tuple[int, int, Any]
+
+_BOUNDARY = re.compile(r"[\n.!?؟؛]")
+
+
+def parse_dimension_batch(
+    texts: Iterable[str],
+    amount_of_money: bool | None = None,
+    duration: bool | None = None,
+    distance: bool | None = None,
+    numeral: bool | None = None,
+    ordinal: bool | None = None,
+    quantity: bool | None = None,
+    temperature: bool | None = None,
+    time: bool | None = None,
+    volume: bool | None = None,
+    names: bool | None = None,
+    workers: int | None = None,
+    chunksize: int = 256,
+) -> list[list[Dimension]]:
+    """Extract dimensions from each text of ``texts``, same as calling
+    :func:`~.parse_dimension` on each text.
+
+    Texts are split into chunks of ``chunksize`` texts that are parsed by a pool of
+    worker processes. The pool is kept for the next calls with the same ``workers``
+    and dimensions, along with the pools of up to three other pairs of arguments.
+    Each worker loads and compiles the selected rules once when it starts. Batches of a single chunk are parsed in the current process. See
+    :func:`~.shutdown_batch_pool` to stop the workers.
+
+    Parameters
+    ----------
+    texts : Iterable[str]
+        Texts to extract dimensions from
+    amount_of_money : bool, optional
+        Extract amount of money, by default None
+    duration : bool, optional
+        Extract duration, by default None
+    distance : bool, optional
+        Extract distance, by default None
+    numeral : bool, optional
+        Extract numeral, by default None
+    ordinal : bool, optional
+        Extract ordinal, by default None
+    quantity : bool, optional
+        Extract quantity, by default None
+    temperature : bool, optional
+        Extract temperature, by default None
+    time : bool, optional
+        Extract time, by default None
+    volume : bool, optional
+        Extract volume, by default None
+    names : bool, optional
+        Extract names, by default None
+    workers : int, optional
+        Number of worker processes, by default the number of CPUs. Set to 1 to
+        parse in the current process.
+    chunksize : int, optional
+        Number of texts sent to a worker at once, by default 256
+
+    Returns
+    -------
+    List[List[:class:`~.Dimension`]]
+        Dimensions of each text, in the order of ``texts``
+
+    Raises
+    ------
+    ValueError
+        If no dimension is set to True or ``chunksize`` is not positive
+    """
+    dimension_types = tuple(
+        _get_dimension_types(
+            amount_of_money,
+            duration,
+            distance,
+            numeral,
+            ordinal,
+            quantity,
+            temperature,
+            time,
+            volume,
+            names,
+        )
+    )
+    if chunksize < 1:
+        raise ValueError("chunksize should be positive")
+
+    texts = list(texts)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(texts) <= chunksize:
+        return [_parse_text(text, dimension_types) for text in texts]
+
+    chunks = [texts[i : i + chunksize] for i in range(0, len(texts), chunksize)]
+    with _use_pool(workers, dimension_types) as pool:
+        parsed_chunks = list(pool.map(_parse_chunk, chunks))
+    output = []
+    for chunk, parsed_chunk in zip(chunks, parsed_chunks):
+        for text, parsed_text in zip(chunk, parsed_chunk):
+            output.append(_to_dimensions(text, parsed_text, dimension_types))
+    return output
+
+
+def parse_dimension_parallel(
+    text: str,
+    amount_of_money: bool | None = None,
+    duration: bool | None = None,
+    distance: bool | None = None,
+    numeral: bool | None = None,
+    ordinal: bool | None = None,
+    quantity: bool | None = None,
+    temperature: bool | None = None,
+    time: bool | None = None,
+    volume: bool | None = None,
+    names: bool | None = None,
+    workers: int | None = None,
+    piece_size: int = 100000,
+    overlap: int = 1000,
+) -> list[Dimension]:
+    """Extract dimensions from a long text in parallel, same as
+    :func:`~.parse_dimension`.
+
+    The text is split into pieces of about ``piece_size`` characters that end at a
+    new line or a sentence punctuation when possible. Each piece is parsed by a
+    worker of the pool of :func:`~.parse_dimension_batch` together with ``overlap``
+    characters before and after it, so matches can look around and continue past the
+    piece. Values that cross the end of a piece are parsed again from the text in the
+    current process until the parse of the next piece agrees, so no value is lost
+    or duplicated.
+
+    The output equals :func:`~.parse_dimension` if no value together with the text
+    its rule looks at is longer than ``overlap``.
+
+    Parameters
+    ----------
+    text : str
+        Text to extract dimensions from
+    amount_of_money : bool, optional
+        Extract amount of money, by default None
+    duration : bool, optional
+        Extract duration, by default None
+    distance : bool, optional
+        Extract distance, by default None
+    numeral : bool, optional
+        Extract numeral, by default None
+    ordinal : bool, optional
+        Extract ordinal, by default None
+    quantity : bool, optional
+        Extract quantity, by default None
+    temperature : bool, optional
+        Extract temperature, by default None
+    time : bool, optional
+        Extract time, by default None
+    volume : bool, optional
+        Extract volume, by default None
+    names : bool, optional
+        Extract names, by default None
+    workers : int, optional
+        Number of worker processes, by default the number of CPUs. Set to 1 to
+        parse in the current process.
+    piece_size : int, optional
+        Number of characters of each piece, by default 100000
+    overlap : int, optional
+        Number of characters around each piece that are parsed with it, by default
+        1000
+
+    Returns
+    -------
+    List[:class:`~.Dimension`]
+        List of :class:`~.Dimension` objects extracted from the text
+
+    Raises
+    ------
+    ValueError
+        If no dimension is set to True or ``piece_size`` is not positive
+    """
+    dimension_types = tuple(
+        _get_dimension_types(
+            amount_of_money,
+            duration,
+            distance,
+            numeral,
+            ordinal,
+            quantity,
+            temperature,
+            time,
+            volume,
+            names,
+        )
+    )
+    if piece_size < 1:
+        raise ValueError("piece_size should be positive")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(text) <= piece_size:
+        return _parse_text(text, dimension_types)
+
+    boundaries = _split_text(text, piece_size)
+    windows, offsets, positions, ends = [], [], [], []
+    for start, end in zip(boundaries, boundaries[1:]):
+        offset = max(0, start - overlap)
+        windows.append(text[offset : end + overlap])
+        offsets.append(offset)
+        positions.append(start - offset)
+        ends.append(end - offset)
+
+    with _use_pool(workers, dimension_types) as pool:
+        pieces = list(pool.map(_parse_window, windows, offsets, positions, ends))
+
+    output: list[Dimension] = []
+    for i, dimension_type in enumerate(dimension_types):
+        rule = _get_rule(dimension_type)
+        values = _merge_pieces(rule, text, boundaries, [p[i] for p in pieces])
+        output.extend(
+            Dimension(rule, text[start:end], value, start, end, dimension_type)
+            for start, end, value in values
+        )
+    return output
+
+
+def shutdown_batch_pool():
+    """Stops the worker processes of :func:`~.parse_dimension_batch`, after the
+    running batches are done. A new pool is started by the next parallel batch."""
+    with _POOL_CONDITION:
+        _POOL_CONDITION.wait_for(lambda: not _POOL_USERS)
+        _stop_idle_pools(0)
+
+
+@contextmanager
+def _use_pool(
+    workers: int, dimension_types: tuple[DimensionType, ...]
+) -> Iterator[ProcessPoolExecutor]:
+    """Provides the pool of ``workers`` processes that parse ``dimension_types``.
+    Each pair of arguments has its own pool, so batches of other threads with other
+    arguments neither wait for each other nor stop each other's pool."""
+    key = (workers, dimension_types)
+    with _POOL_CONDITION:
+        pool = _POOLS.pop(key, None)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(dimension_types,)
+            )
+        _POOLS[key] = pool
+        _POOL_USERS[key] = _POOL_USERS.get(key, 0) + 1
+        _stop_idle_pools(_MAX_POOLS)
+    try:
+        yield pool
+    finally:
+        with _POOL_CONDITION:
+            _POOL_USERS[key] -= 1
+            if not _POOL_USERS[key]:
+                del _POOL_USERS[key]
+            _POOL_CONDITION.notify_all()
+
+
+def _stop_idle_pools(max_pools: int):
+    """Stops the least recently used pools that are not used until at most
+    ``max_pools`` pools are left, should be called with the condition held."""
+    for key in list(_POOLS):
+        if len(_POOLS) <= max_pools:
+            break
+        if key not in _POOL_USERS:
+            _POOLS.pop(key).shutdown()
+
+
+def _init_worker(dimension_types: tuple[DimensionType, ...]):
+    global _WORKER_DIMENSION_TYPES
+    _WORKER_DIMENSION_TYPES = dimension_types
+    for dimension_type in dimension_types:
+        rule = _get_rule(dimension_type)
+        rule.compile()
+        if dimension_type is not DimensionType.NAME:
+            _get_gate(rule, dimension_type)
+
+
+def _parse_chunk(texts: list[str]) -> List[List[List[_ParsedValue]]]:
+    return [
+        [
+            [(d.start, d.end, d.value) for d in _parse_dimension_type(text, t)]
+            for t in _WORKER_DIMENSION_TYPES
+        ]
+        for text in texts
+    ]
+
+
+def _parse_window(
+    window: str, offset: int, pos: int, endpos: int
+) -> List[List[_ParsedValue]]:
+    # Values that start in [pos, endpos) of the window, with offsets in the text
+    output: List[List[_ParsedValue]] = []
+    for dimension_type in _WORKER_DIMENSION_TYPES:
+        rule = _get_rule(dimension_type)
+        values = []
+        if dimension_type is DimensionType.NAME or _passes_gate(
+            rule, dimension_type, window
+        ):
+            for match in rule.finditer(window, pos):
+                if match.start() >= endpos:
+                    break
+                result = rule._parse(match, window)
+                values.append(
+                    (result.start + offset, result.end + offset, result.value)
+                )
+        output.append(values)
+    return output
+
+
+def _passes_gate(rule: Expression, dimension_type: DimensionType, text: str) -> bool:
+    gate = _get_gate(rule, dimension_type)
+    return gate is None or gate.search(text) is not None
+
+
+def _merge_pieces(
+    rule: Expression, text: str, boundaries: list[int], pieces: List[List[_ParsedValue]]
+) -> List[_ParsedValue]:
+    output: List[_ParsedValue] = []
+    for start, end, values in zip(boundaries, boundaries[1:], pieces):
+        position = output[-1][1] if output else 0
+        if position <= start:
+            # The scan of the text reaches the piece at its start, like the piece
+            output.extend(values)
+            continue
+
+        # The last value crosses the start of the piece. Scan the text from its end
+        # until the scan finds a value of the piece, both scans continue the same
+        # way from there.
+        spans = {(s, e): i for i, (s, e, _) in enumerate(values)}
+        first = len(values)
+        for match in rule.finditer(text, position):
+            if match.start() >= end:
+                break
+            if match.span() in spans:
+                first = spans[match.span()]
+                break
+            result = rule._parse(match, text)
+            output.append((result.start, result.end, result.value))
+        output.extend(values[first:])
+    return output
+
+
+def _split_text(text: str, piece_size: int) -> list[int]:
+    """Returns the start of each piece and the end of the text. Pieces end after a
+    boundary character within half a piece of their size, if any."""
+    boundaries = [0]
+    while len(text) - boundaries[-1] > piece_size:
+        end = boundaries[-1] + piece_size
+        match = _BOUNDARY.search(text, end, end + piece_size // 2)
+        boundaries.append(match.end() if match else end)
+    if boundaries[-1] < len(text):
+        boundaries.append(len(text))
+    return boundaries
+
+
+def _parse_text(
+    text: str, dimension_types: tuple[DimensionType, ...]
+) -> list[Dimension]:
+    output = []
+    for dimension_type in dimension_types:
+        output.extend(_parse_dimension_type(text, dimension_type))
+    return output
+
+
+def _to_dimensions(
+    text: str,
+    parsed_text: List[List[_ParsedValue]],
+    dimension_types: tuple[DimensionType, ...],
+) -> list[Dimension]:
+    output = []
+    for dimension_type, values in zip(dimension_types, parsed_text):
+        rule = _get_rule(dimension_type)
+        for start, end, value in values:
+            output.append(
+                Dimension(rule, text[start:end], value, start, end, dimension_type)
+            )
+    return output
+
+
+atexit.register(shutdown_batch_pool)
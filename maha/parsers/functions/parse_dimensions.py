@@ -3,16 +3,23 @@ from __future__ import annotations
 __all__ = ["parse_dimension"]
 
 
-from maha.parsers.rules import (
-    RULE_DISTANCE,
-    RULE_DURATION,
-    RULE_NAME,
-    RULE_NUMERAL,
-    RULE_ORDINAL,
-    RULE_TIME,
-)
+import hashlib
+
+import maha.parsers.rules as rules
 from maha.parsers.templates import Dimension, DimensionType
-from maha.rexy import Expression
+from maha.rexy import PATTERN_CACHE, Expression, derive_anchors
+
+from .result_cache import RESULT_CACHE, rules_fingerprint
+
+_GATES: dict[DimensionType, tuple[Expression, Expression | None]] = {}
+_RULE_NAMES = {
+    DimensionType.DURATION: "RULE_DURATION",
+    DimensionType.DISTANCE: "RULE_DISTANCE",
+    DimensionType.NUMERAL: "RULE_NUMERAL",
+    DimensionType.ORDINAL: "RULE_ORDINAL",
+    DimensionType.TIME: "RULE_TIME",
+    DimensionType.NAME: "RULE_NAME",
+}
 
 
 def parse_dimension(
@@ -30,6 +37,11 @@ def parse_dimension(
 ) -> list[Dimension]:
     """Extract dimensions from a given text.
 
+    Each rule runs only if the text contains one of its anchors, such as unit words,
+    month names, numerals or digits, which are derived from the rule pattern by
+    :func:`~.derive_anchors`. Texts without anchors cannot match the rule, so the
+    output is the same as running every rule.
+
     Parameters
     ----------
     text : str
@@ -72,52 +84,89 @@ def parse_dimension(
     ValueError
         If no argument is set to True
     """
+    dimension_types = _get_dimension_types(
+        amount_of_money,
+        duration,
+        distance,
+        numeral,
+        ordinal,
+        quantity,
+        temperature,
+        time,
+        volume,
+        names,
+    )
+    key = None
+    if RESULT_CACHE.enabled:
+        fingerprint = rules_fingerprint(_get_rule(t) for t in dimension_types)
+        key = ("parse_dimension", text, tuple(dimension_types), fingerprint)
+        cached = RESULT_CACHE.get(key)
+        if cached is not None:
+            return cached
+
     output = []
+    for dimension_type in dimension_types:
+        output.extend(_parse_dimension_type(text, dimension_type))
+
+    if key is not None:
+        RESULT_CACHE.put(key, output)
+    return output
 
+
+def _get_dimension_types(
+    amount_of_money: bool | None = None,
+    duration: bool | None = None,
+    distance: bool | None = None,
+    numeral: bool | None = None,
+    ordinal: bool | None = None,
+    quantity: bool | None = None,
+    temperature: bool | None = None,
+    time: bool | None = None,
+    volume: bool | None = None,
+    names: bool | None = None,
+) -> list[DimensionType]:
+    """Returns the selected dimension types in the order they are parsed."""
     if amount_of_money:
         raise NotImplementedError("amount_of_money is not implemented yet")
-    if duration:
-        output.extend(_get_dimensions(RULE_DURATION, text, DimensionType.DURATION))
-    if distance:
-        output.extend(_get_dimensions(RULE_DISTANCE, text, DimensionType.DISTANCE))
-    if numeral:
-        output.extend(_get_dimensions(RULE_NUMERAL, text, DimensionType.NUMERAL))
-    if ordinal:
-        output.extend(_get_dimensions(RULE_ORDINAL, text, DimensionType.ORDINAL))
     if quantity:
         raise NotImplementedError("quantity is not implemented yet")
     if temperature:
         raise NotImplementedError("temperature is not implemented yet")
-    if time:
-        output.extend(_get_dimensions(RULE_TIME, text, DimensionType.TIME))
     if volume:
         raise NotImplementedError("volume is not implemented yet")
-    if names:
-        output.extend(_get_dimensions(RULE_NAME, text, DimensionType.NAME))
-
-    if not any(
-        [
-            amount_of_money,
-            duration,
-            distance,
-            numeral,
-            ordinal,
-            quantity,
-            temperature,
-            time,
-            volume,
-            names,
-        ]
-    ):
+
+    selected = {
+        DimensionType.DURATION: duration,
+        DimensionType.DISTANCE: distance,
+        DimensionType.NUMERAL: numeral,
+        DimensionType.ORDINAL: ordinal,
+        DimensionType.TIME: time,
+        DimensionType.NAME: names,
+    }
+    dimension_types = [t for t, value in selected.items() if value]
+    if not dimension_types:
         raise ValueError("At least one argument should be True")
+    return dimension_types
 
-    return output
+
+def _get_rule(dimension_type: DimensionType) -> Expression:
+    return getattr(rules, _RULE_NAMES[dimension_type])
+
+
+def _parse_dimension_type(text: str, dimension_type: DimensionType) -> list[Dimension]:
+    # Names are a list of words, their anchors would cost as much as the rule
+    gated = dimension_type is not DimensionType.NAME
+    return _get_dimensions(_get_rule(dimension_type), text, dimension_type, gated)
 
 
 def _get_dimensions(
-    rule: Expression, text: str, dimension_type: DimensionType
+    rule: Expression, text: str, dimension_type: DimensionType, gated: bool = True
 ) -> list[Dimension]:
-    output = []
+    output: list[Dimension] = []
+    if gated:
+        gate = _get_gate(rule, dimension_type)
+        if gate is not None and not gate.search(text):
+            return output
     for result in rule(text):
         output.append(
             Dimension(
@@ -130,3 +179,27 @@ def _get_dimensions(
             )
         )
     return output
+
+
+def _get_gate(rule: Expression, dimension_type: DimensionType) -> Expression | None:
+    """Returns an expression that matches the anchors of ``rule``, None if the rule
+    has no anchors. Deriving anchors from large rules such as :data:`~.RULE_TIME`
+    takes a few seconds, so the anchors of the rules are read from the pattern
+    cache, saved there by ``tools/update_anchors.py``. Anchors of other rules are
+    derived and kept in memory, the cache is never written while parsing."""
+    cached = _GATES.get(dimension_type)
+    # A replaced rule needs new anchors
+    if cached is None or cached[0] is not rule:
+        pattern = PATTERN_CACHE.get_source(_get_anchors_name(rule))
+        if pattern is None:
+            pattern = "|".join(derive_anchors(rule.pattern))
+        gate = Expression(pattern, pickle=False, prefilter=False) if pattern else None
+        cached = _GATES[dimension_type] = (rule, gate)
+    return cached[1]
+
+
+def _get_anchors_name(rule: Expression) -> str:
+    """Returns the name the anchors of ``rule`` are saved under in the pattern
+    cache."""
+    md5 = hashlib.md5(rule.pattern.encode()).hexdigest()
+    return f"anchors-{md5}"
@@ -4,6 +4,9 @@ from __future__ import annotations
 
 __all__ = ["parse", "parse_expression"]
 
+from functools import lru_cache
+from typing import Iterable
+
 from maha.constants import (
     ALL_HARAKAT,
     ARABIC,
@@ -36,7 +39,9 @@ from maha.expressions import (
     EXPRESSION_MENTIONS,
 )
 from maha.parsers.templates import Dimension, DimensionType, TextExpression
-from maha.rexy import Expression, ExpressionGroup
+from maha.rexy import Expression, ExpressionGroup, ExpressionResult
+
+from .result_cache import RESULT_CACHE, rules_fingerprint
 
 
 def parse(
@@ -79,6 +84,8 @@ def parse(
 
         Add the ability to combine all expressions before parsing.
 
+    Results are cached by :data:`~.RESULT_CACHE` if it is enabled.
+
     Parameters
     ----------
     text : str
@@ -163,44 +170,69 @@ def parse(
 
     # current function arguments
     current_arguments = locals()
-    constants = globals()
+    selected = tuple(
+        arg
+        for arg, value in current_arguments.items()
+        if value is True and arg != "include_space"
+    )
+
+    plan = _get_parse_plan(selected, include_space)
+    key = None
+    if RESULT_CACHE.enabled and (selected or custom_expressions):
+        expressions: list[Expression | ExpressionGroup] = [e for e, _ in plan]
+        if custom_expressions:
+            expressions.append(custom_expressions)
+        key = ("parse", text, selected, include_space, rules_fingerprint(expressions))
+        cached = RESULT_CACHE.get(key)
+        if cached is not None:
+            return cached
 
     output = []
-    any_argument_set = False
+    for text_exp, dimension_type in plan:
+        output.extend(_get_dimensions(text, text_exp.parse(text), dimension_type))
+
+    if custom_expressions:
+        output.extend(parse_expression(text, custom_expressions))
+    elif not selected:
+        raise ValueError("At least one argument should be True")
+
+    if key is not None:
+        RESULT_CACHE.put(key, output)
+    return output
+
+
+@lru_cache(maxsize=128)
+def _get_parse_plan(
+    arguments: tuple[str, ...], include_space: bool
+) -> tuple[tuple[TextExpression, DimensionType], ...]:
+    """Returns the expression and dimension type of each argument of :func:`parse`,
+    cached so that the expressions are built and compiled once per set of
+    arguments."""
+    constants = globals()
+    plan = []
 
     # Since each argument has the same name as the corresponding constant
     # (But, expressions should be prefixed with "EXPRESSION_" to match the actual expression.)
     # Looping through all arguments and appending constants that correspond to the
     # True arguments can work
-    # TODO: Maybe find a good pythonic way to do this
-    for arg, value in current_arguments.items():
+    for arg in arguments:
         const = constants.get(arg.upper())
-        if const and value is True:
-            any_argument_set = True
+        if const:
             if include_space:
                 pattern = f"(?:[{''.join(const)}](?:\\s+)?)+"
             else:
                 pattern = f"[{''.join(const)}]+"
             text_exp = TextExpression(pattern)
-            parsed = parse_expression(text, text_exp, DimensionType[arg.upper()])
-            output.extend(parsed)
-            continue
-        # check for expression
-        expression: Expression | None = constants.get("EXPRESSION_" + arg.upper())
-        if expression and value is True:
-            any_argument_set = True
+        else:
+            # check for expression
+            expression: Expression | None = constants.get("EXPRESSION_" + arg.upper())
+            if not expression:
+                continue
             text_exp = TextExpression(str(expression))
-            parsed = parse_expression(text, text_exp, DimensionType[arg.upper()])
-            output.extend(parsed)
+        text_exp.compile()
+        plan.append((text_exp, DimensionType[arg.upper()]))
 
-    if custom_expressions:
-        any_argument_set = True
-        output.extend(parse_expression(text, custom_expressions))
-
-    if not any_argument_set:
-        raise ValueError("At least one argument should be True")
-
-    return output
+    return tuple(plan)
 
 
 def parse_expression(
@@ -243,8 +275,14 @@ def parse_expression(
     if isinstance(expressions, Expression):
         expressions = ExpressionGroup(expressions)
 
+    return _get_dimensions(text, expressions.parse(text), dimension_type)
+
+
+def _get_dimensions(
+    text: str, results: Iterable[ExpressionResult], dimension_type: DimensionType
+) -> list[Dimension]:
     output = []
-    for result in expressions.parse(text):
+    for result in results:
         start = result.start
         end = result.end
         value = result.value
@@ -0,0 +1,186 @@
+"""Functions that extract dimensions from text streams"""
+
+from __future__ import annotations
+
+__all__ = ["parse_dimension_stream"]
+
+from bisect import bisect_right
+from typing import IO, Iterable, Iterator
+
+import regex as re
+
+from maha.parsers.templates import Dimension, DimensionType
+from maha.processors import StreamFileProcessor, StreamTextProcessor
+
+from .parse_dimensions import _get_dimension_types, _get_gate, _get_rule
+
+_NEW_LINE = re.compile("\n")
+
+
+def parse_dimension_stream(
+    stream: IO[str] | Iterable[str] | StreamTextProcessor,
+    amount_of_money: bool | None = None,
+    duration: bool | None = None,
+    distance: bool | None = None,
+    numeral: bool | None = None,
+    ordinal: bool | None = None,
+    quantity: bool | None = None,
+    temperature: bool | None = None,
+    time: bool | None = None,
+    volume: bool | None = None,
+    names: bool | None = None,
+    chunk_size: int = 1 << 20,
+    overlap: int = 1000,
+) -> Iterator[tuple[int, Dimension]]:
+    """Extract dimensions from a text stream without reading the whole stream.
+
+    The stream is read in chunks of ``chunk_size`` characters. Values close to the
+    end of the read text are parsed after the next chunk is read, so values that
+    cross chunks are found once. ``overlap`` characters before the unparsed text are
+    kept for the rules to look behind. Memory does not grow with the size of the
+    stream.
+
+    The values are the same as :func:`~.parse_dimension` of the whole text, with
+    offsets in the whole text, if no value together with the text its rule looks at
+    is longer than ``overlap``. They are yielded as the stream is read, values read
+    at the same time are yielded in the order of :func:`~.parse_dimension`.
+
+    Parameters
+    ----------
+    stream : Union[IO[str], Iterable[str], :class:`~.StreamTextProcessor`]
+        Text stream, such as an open file, or an iterable of strings that are
+        concatenated. The input file of :class:`~.StreamFileProcessor` is read from
+        the start, the input lines of :class:`~.StreamTextProcessor` are read as is.
+    amount_of_money : bool, optional
+        Extract amount of money, by default None
+    duration : bool, optional
+        Extract duration, by default None
+    distance : bool, optional
+        Extract distance, by default None
+    numeral : bool, optional
+        Extract numeral, by default None
+    ordinal : bool, optional
+        Extract ordinal, by default None
+    quantity : bool, optional
+        Extract quantity, by default None
+    temperature : bool, optional
+        Extract temperature, by default None
+    time : bool, optional
+        Extract time, by default None
+    volume : bool, optional
+        Extract volume, by default None
+    names : bool, optional
+        Extract names, by default None
+    chunk_size : int, optional
+        Number of characters to read at a time, by default 1048576
+    overlap : int, optional
+        Number of characters kept around the parsed text, by default 1000
+
+    Yields
+    -------
+    Tuple[int, :class:`~.Dimension`]
+        Line number, starting from 1, of the start of the value and the value
+
+    Raises
+    ------
+    ValueError
+        If no dimension is set to True or ``chunk_size`` is not positive
+    """
+    dimension_types = _get_dimension_types(
+        amount_of_money,
+        duration,
+        distance,
+        numeral,
+        ordinal,
+        quantity,
+        temperature,
+        time,
+        volume,
+        names,
+    )
+    if chunk_size < 1:
+        raise ValueError("chunk_size should be positive")
+
+    return _parse_stream(_read_chunks(stream, chunk_size), dimension_types, overlap)
+
+
+def _parse_stream(
+    chunks: Iterator[str], dimension_types: list[DimensionType], overlap: int
+) -> Iterator[tuple[int, Dimension]]:
+    rules = [(_get_rule(t), t) for t in dimension_types]
+    gates = [
+        None if t is DimensionType.NAME else _get_gate(rule, t) for rule, t in rules
+    ]
+    # The buffer holds the text from offset ``base``, ``lines`` new lines precede it.
+    # Each rule scans the text from its own position, like a scan of the whole text.
+    buffer = ""
+    base = lines = 0
+    positions = [0] * len(rules)
+
+    end_of_stream = False
+    while not end_of_stream:
+        chunk = next(chunks, "")
+        end_of_stream = not chunk
+        buffer += chunk
+        # Values that start before the limit are parsed, the text after it is kept
+        # for values that continue in the next chunk
+        limit = len(buffer) if end_of_stream else len(buffer) - overlap
+        new_lines = [m.start() for m in _NEW_LINE.finditer(buffer)]
+
+        for i, (rule, dimension_type) in enumerate(rules):
+            pos = positions[i] - base
+            if pos >= limit:
+                continue
+            gate = gates[i]
+            if gate is None or gate.search(buffer, pos):
+                for match in rule.finditer(buffer, pos):
+                    if match.start() >= limit:
+                        break
+                    result = rule._parse(match, buffer)
+                    line = lines + bisect_right(new_lines, result.start - 1) + 1
+                    yield line, Dimension(
+                        rule,
+                        buffer[result.start : result.end],
+                        result.value,
+                        result.start + base,
+                        result.end + base,
+                        dimension_type,
+                    )
+                    pos = result.end
+            # No value starts between the last value and the limit
+            positions[i] = max(pos, limit) + base
+
+        # Keep the text that the rules may look behind
+        trim = max(0, min(positions) - base - overlap)
+        lines += bisect_right(new_lines, trim - 1)
+        buffer = buffer[trim:]
+        base += trim
+
+
+def _read_chunks(
+    stream: IO[str] | Iterable[str] | StreamTextProcessor, chunk_size: int
+) -> Iterator[str]:
+    if isinstance(stream, StreamFileProcessor):
+        stream.openfile.seek(0)
+        stream = stream.openfile
+    elif isinstance(stream, StreamTextProcessor):
+        stream = stream.lines
+
+    read = getattr(stream, "read", None)
+    if read is not None:
+        chunk = read(chunk_size)
+        while chunk:
+            yield chunk
+            chunk = read(chunk_size)
+        return
+
+    pieces: list[str] = []
+    size = 0
+    for piece in stream:
+        pieces.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(pieces)
+            pieces, size = [], 0
+    if size:
+        yield "".join(pieces)
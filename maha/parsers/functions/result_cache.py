@@ -0,0 +1,207 @@
+"""Cache of the results of the parsing functions"""
+
+from __future__ import annotations
+
+__all__ = ["ResultCache", "ResultCacheInfo", "RESULT_CACHE", "rules_fingerprint"]
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, NamedTuple
+
+from maha.parsers.templates import Dimension
+from maha.rexy import Expression, ExpressionGroup
+
+
+class ResultCacheInfo(NamedTuple):
+    """Statistics of a :class:`~.ResultCache`"""
+
+    hits: int
+    """Number of results found in the cache"""
+    misses: int
+    """Number of results not found in the cache"""
+    maxsize: int
+    """Maximum number of results, 0 if the cache is disabled"""
+    currsize: int
+    """Number of cached results"""
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the lookups that found a result, 0 if there were none"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultCache:
+    """Least recently used cache of the dimensions extracted from texts, used by
+    :func:`~.parse_dimension` and :func:`~.parse` to skip texts that were parsed
+    before, such as repeated posts.
+
+    Results are keyed by the text, the selected dimensions and the fingerprint of
+    the rules that parse them, see :func:`~.rules_fingerprint`. Results are stored as
+    tuples and a new list of new :class:`~.Dimension` objects is returned for each
+    hit. The values of the dimensions are shared, they should not be modified.
+
+    The cache is disabled until its size is set, see :meth:`~.ResultCache.resize`.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of results, by default 0 (disabled)
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[Hashable, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether results are cached"""
+        return self.maxsize > 0
+
+    def get(self, key: Hashable) -> list[Dimension] | None:
+        """Returns the dimensions cached under ``key``, None if there are none.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the result.
+
+        Returns
+        -------
+        Optional[List[:class:`~.Dimension`]]
+            Cached dimensions.
+        """
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+        return [Dimension(*fields) for fields in result]
+
+    def put(self, key: Hashable, dimensions: Iterable[Dimension]):
+        """Caches ``dimensions`` under ``key``, the least recently used result is
+        removed if the cache is full.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the result.
+        dimensions : Iterable[:class:`~.Dimension`]
+            Dimensions to cache.
+        """
+        if not self.enabled:
+            return
+        result = tuple(
+            (d.expression, d.body, d.value, d.start, d.end, d.dimension_type)
+            for d in dimensions
+        )
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def resize(self, maxsize: int):
+        """Sets the maximum number of results, least recently used results are
+        removed if there are more. 0 disables the cache.
+
+        Parameters
+        ----------
+        maxsize : int
+            Maximum number of results.
+
+        Raises
+        ------
+        ValueError
+            If ``maxsize`` is negative.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize should not be negative")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._results) > maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        """Removes all results and resets the counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> ResultCacheInfo:
+        """Returns the counters and the size of the cache.
+
+        Returns
+        -------
+        :class:`~.ResultCacheInfo`
+            Statistics of the cache.
+        """
+        with self._lock:
+            return ResultCacheInfo(
+                self.hits, self.misses, self.maxsize, len(self._results)
+            )
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+RESULT_CACHE = ResultCache()
+""" Cache of :func:`~.parse_dimension` and :func:`~.parse`, disabled by default.
+Enable it with ``RESULT_CACHE.resize(10000)``. """
+
+# Maps the identity of a rule, its pattern and its value to them and the fingerprint
+# of the rule. Keeping them keeps their identities from being reused.
+_FINGERPRINTS: dict[tuple[int, int, int], tuple[Any, Any, Any, str]] = {}
+_FINGERPRINTS_LOCK = threading.Lock()
+_MAX_FINGERPRINTS = 4096
+
+
+def rules_fingerprint(rules: Iterable[Expression | ExpressionGroup]) -> str:
+    """Returns the fingerprint of ``rules``.
+
+    The fingerprint of a rule consists of the md5 hash of its pattern and the
+    identity of its function, the hash is computed once per rule. Changing the
+    pattern or the function of a rule, or replacing it, changes the fingerprint.
+
+    Parameters
+    ----------
+    rules : Iterable[Union[:class:`~.Expression`, :class:`~.ExpressionGroup`]]
+        Rules to fingerprint, expressions of groups are included.
+
+    Returns
+    -------
+    str
+        Fingerprint.
+    """
+    fingerprints = []
+    for rule in rules:
+        if isinstance(rule, ExpressionGroup):
+            # The parsing mode of a group changes its results
+            fingerprints.append(f"group:{rule.smart}:{rule.combined}")
+            fingerprints.extend(map(_expression_fingerprint, rule.expressions))
+        else:
+            fingerprints.append(_expression_fingerprint(rule))
+    return ",".join(fingerprints)
+
+
+def _expression_fingerprint(expression: Expression) -> str:
+    value: Any = getattr(expression, "value", None)
+    key = (id(expression), id(expression.pattern), id(value))
+    cached = _FINGERPRINTS.get(key)
+    if cached is None:
+        md5 = hashlib.md5(expression.pattern.encode()).hexdigest()
+        function = id(value) if callable(value) else repr(value)
+        cached = (expression, expression.pattern, value, f"{md5}:{function}")
+        with _FINGERPRINTS_LOCK:
+            # Expressions that are created for each call would fill the dictionary
+            if len(_FINGERPRINTS) >= _MAX_FINGERPRINTS:
+                _FINGERPRINTS.clear()
+            _FINGERPRINTS[key] = cached
+    return cached[3]
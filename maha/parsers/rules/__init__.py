@@ -1,72 +1,99 @@
+"""
+Rules of the parsers. The rules of each dimension are loaded the first time one of
+them is accessed, e.g. ``maha.parsers.rules.RULE_TIME`` builds the time patterns but
+not the names or numeral ones. ``from maha.parsers.rules import *`` loads all rules.
+"""
+from importlib import import_module
+
+from . import common
 from .common import *
-from .distance import *
-from .duration import *
-from .names import *
-from .numeral import *
-from .ordinal import *
-from .time import *
+
+_LAZY_MODULES = {
+    "RULE_DISTANCE": "distance",
+    "RULE_DURATION": "duration",
+    "parse_duration": "duration",
+    "RULE_NAME": "names",
+    "RULE_NUMERAL": "numeral",
+    "RULE_ORDINAL": "ordinal",
+    "parse_ordinal": "ordinal",
+    "RULE_TIME": "time",
+    "parse_time": "time",
+}
+""" Maps a name (or a prefix of the names) to the module that defines it """
+
+
+def __getattr__(name: str):
+    if name == "__all__":
+        return _load_all()
+    for prefix, module in _LAZY_MODULES.items():
+        if name == prefix or name.startswith(prefix + "_"):
+            value = getattr(import_module(f".{module}", __name__), name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_MODULES))
+
+
+def _load_all() -> list:
+    """Loads the rules of all dimensions and returns the names exported by a star
+    import, the names of :mod:`~.common`, the rules and the compile functions."""
+    names = list(common.__all__)
+    for module in sorted(set(_LAZY_MODULES.values())):
+        rule_module = import_module(f".{module}", __name__)
+        public = getattr(
+            rule_module,
+            "__all__",
+            [name for name in vars(rule_module) if not name.startswith("_")],
+        )
+        for name in public:
+            globals()[name] = getattr(rule_module, name)
+            if name not in names:
+                names.append(name)
+    names += [name for name in globals() if name.startswith("compile_")]
+    globals()["__all__"] = names
+    return names
+
+
+def _compile_module_rules(module: str):
+    rule_module = import_module(f".{module}", __name__)
+    for name in dir(rule_module):
+        if name.startswith("RULE_"):
+            getattr(rule_module, name).compile()
 
 
 def compile_rules():
+    """Compiles all rules, see ``python -m maha.rexy build-cache`` to compile them in
+    parallel and save them to the pattern cache."""
     compile_numeral_rules()
     compile_ordinal_rules()
     compile_time_rules()
     compile_duration_rules()
+    compile_distance_rules()
+    compile_names_rules()
 
 
 def compile_numeral_rules():
-    for rule in [
-        RULE_NUMERAL_ONES,
-        RULE_NUMERAL_TENS,
-        RULE_NUMERAL_HUNDREDS,
-        RULE_NUMERAL_THOUSANDS,
-        RULE_NUMERAL_MILLIONS,
-        RULE_NUMERAL_BILLIONS,
-        RULE_NUMERAL_TRILLIONS,
-        RULE_NUMERAL_INTEGERS,
-        RULE_NUMERAL,
-    ]:
-        rule.compile()
+    _compile_module_rules("numeral")
 
 
 def compile_ordinal_rules():
-    for rule in [
-        RULE_ORDINAL_ONES,
-        RULE_ORDINAL_TENS,
-        RULE_ORDINAL_HUNDREDS,
-        RULE_ORDINAL_THOUSANDS,
-        RULE_ORDINAL_MILLIONS,
-        RULE_ORDINAL_BILLIONS,
-        RULE_ORDINAL_TRILLIONS,
-        RULE_ORDINAL,
-    ]:
-        rule.compile()
+    _compile_module_rules("ordinal")
 
 
 def compile_time_rules():
-    for rule in [
-        RULE_TIME_YEARS,
-        RULE_TIME_MONTHS,
-        RULE_TIME_WEEKS,
-        RULE_TIME_DAYS,
-        RULE_TIME_HOURS,
-        RULE_TIME_MINUTES,
-        RULE_TIME_AM_PM,
-        RULE_TIME_NOW,
-        RULE_TIME,
-    ]:
-        rule.compile()
+    _compile_module_rules("time")
 
 
 def compile_duration_rules():
-    for rule in [
-        RULE_DURATION_SECONDS,
-        RULE_DURATION_MINUTES,
-        RULE_DURATION_HOURS,
-        RULE_DURATION_DAYS,
-        RULE_DURATION_WEEKS,
-        RULE_DURATION_MONTHS,
-        RULE_DURATION_YEARS,
-        RULE_DURATION,
-    ]:
-        rule.compile()
+    _compile_module_rules("duration")
+
+
+def compile_distance_rules():
+    _compile_module_rules("distance")
+
+
+def compile_names_rules():
+    _compile_module_rules("names")
@@ -1,6 +1,6 @@
 __all__ = ["Value", "MatchedValue", "FunctionValue"]
 
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Union
 
 from regex.regex import Match
 
@@ -13,9 +13,15 @@ class Value(Expression):
     __slots__ = ["value"]
     value: Any
 
-    def __init__(self, value: Any, pattern: str, pickle: bool = False):
+    def __init__(
+        self,
+        value: Any,
+        pattern: str,
+        pickle: bool = False,
+        prefilter: Union[Iterable[str], bool] = True,
+    ):
         self.value = value
-        super().__init__(pattern, pickle)
+        super().__init__(pattern, pickle, prefilter)
 
     def _parse(self, match: Match, _: str) -> ExpressionResult:
         return ExpressionResult(match.start(), match.end(), self.value, self)
@@ -65,8 +71,14 @@ class FunctionValue(Value):
         The result of the expression.
     """
 
-    def __init__(self, function: Callable[..., Any], pattern: str, pickle: bool = True):
-        super().__init__(function, pattern, pickle)
+    def __init__(
+        self,
+        function: Callable[..., Any],
+        pattern: str,
+        pickle: bool = True,
+        prefilter: Union[Iterable[str], bool] = True,
+    ):
+        super().__init__(function, pattern, pickle, prefilter)
 
     def _parse(self, match: Match, _: str) -> ExpressionResult:
         value = self.value(match)
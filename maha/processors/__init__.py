@@ -1,3 +1,5 @@
 from .base_processor import *
 from .basic_processors import *
+from .line_index import *
+from .steps import *
 from .stream_processors import *
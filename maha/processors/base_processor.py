@@ -7,24 +7,12 @@ __all__ = [
 
 
 from abc import ABC, abstractmethod
-from functools import partial
-from typing import Callable
-
-from maha.cleaners.functions import (
-    connect_single_letter_word,
-    contains,
-    contains_repeated_substring,
-    contains_single_letter_word,
-    keep,
-    normalize,
-    reduce_repeated_substring,
-    remove,
-    replace,
-    replace_expression,
-    replace_pairs,
-)
-from maha.rexy import Expression, ExpressionGroup
+from typing import Any, Callable, Iterable
 
+from maha.rexy import Expression, ExpressionGroup, StringSet
+
+from .plan import APPLY, FILTER, ExecutionPlan
+from .steps import StepSpec
 from .utils import ObjectGet
 
 
@@ -55,7 +43,10 @@ class BaseProcessor(ABC):
         """
         raise NotImplementedError()
 
-    @abstractmethod
+    def __init__(self) -> None:
+        self.steps: list[StepSpec] = []
+        self._plan: ExecutionPlan | None = None
+
     def apply(self, fn: Callable[[str], str]):
         """Applies a function to each line
 
@@ -64,9 +55,8 @@ class BaseProcessor(ABC):
         fn :
             Function to apply
         """
-        raise NotImplementedError()
+        self._add_step(StepSpec(APPLY, {"fn": fn}))
 
-    @abstractmethod
     def filter(self, fn: Callable[[str], bool]):
         """Keeps lines for which the input function is True
 
@@ -75,7 +65,60 @@ class BaseProcessor(ABC):
         fn :
             Function to check
         """
-        raise NotImplementedError()
+        self._add_step(StepSpec(FILTER, {"fn": fn}))
+
+    @property
+    def plan(self) -> ExecutionPlan:
+        """Returns the execution plan of the queued steps. Adjacent character-level
+        steps are fused into one step, see :class:`~.ExecutionPlan`.
+
+        Returns
+        -------
+        :class:`~.ExecutionPlan`
+            Execution plan of the queued steps
+        """
+        if self._plan is None:
+            self._plan = ExecutionPlan((s.kind, s.build()) for s in self.steps)
+        return self._plan
+
+    def clear_steps(self):
+        """Removes all queued steps"""
+        self.steps = []
+        self._plan = None
+
+    def add_steps(self, steps: Iterable[StepSpec | dict[str, Any]]):
+        """Queues the input steps, such as the steps of another processor or steps
+        loaded from JSON.
+
+        Example
+        -------
+
+        .. code:: pycon
+
+            >>> import json
+            >>> from maha.processors import StepSpec, TextProcessor
+            >>> processor = TextProcessor("أهلا").normalize(alef=True)
+            >>> saved = json.dumps([step.to_dict() for step in processor.steps])
+            >>> TextProcessor(["إلى"]).add_steps(json.loads(saved)).text
+            'الى'
+
+        Parameters
+        ----------
+        steps : Iterable[Union[:class:`~.StepSpec`, Dict[str, Any]]]
+            Steps to queue, dictionaries are converted using
+            :meth:`~.StepSpec.from_dict`
+        """
+        for step in steps:
+            if not isinstance(step, StepSpec):
+                step = StepSpec.from_dict(step)
+            self._add_step(step)
+        return self
+
+    def _add_step(self, step: StepSpec):
+        # Invalid arguments raise where the step is added, not when it runs
+        step.validate()
+        self.steps.append(step)
+        self._plan = None
 
     def get(
         self,
@@ -169,10 +212,10 @@ class BaseProcessor(ABC):
         arabic_punctuations: bool = False,
         english_punctuations: bool = False,
         use_space: bool = True,
-        custom_strings: list[str] | str | None = None,
+        custom_strings: list[str] | str | StringSet | None = None,
     ):
         """Applies :func:`~.keep` to each line"""
-        self.apply(partial(keep, **self._arguments_except_self(locals())))
+        self._add_step(StepSpec("keep", self._arguments_except_self(locals())))
         return self
 
     def normalize(
@@ -187,7 +230,7 @@ class BaseProcessor(ABC):
         all: bool | None = None,
     ):
         """Applies :func:`~.normalize` to each line"""
-        self.apply(partial(normalize, **self._arguments_except_self(locals())))
+        self._add_step(StepSpec("normalize", self._arguments_except_self(locals())))
         return self
 
     def connect_single_letter_word(
@@ -199,17 +242,19 @@ class BaseProcessor(ABC):
         kaf: bool | None = None,
         teh: bool | None = None,
         all: bool | None = None,
-        custom_strings: list[str] | str | None = None,
+        custom_strings: list[str] | str | StringSet | None = None,
     ):
         """Applies :func:`~.connect_single_letter_word` to each line"""
-        self.apply(
-            partial(connect_single_letter_word, **self._arguments_except_self(locals()))
+        self._add_step(
+            StepSpec(
+                "connect_single_letter_word", self._arguments_except_self(locals())
+            )
         )
         return self
 
-    def replace(self, strings: list[str] | str, with_value: str):
+    def replace(self, strings: list[str] | str | StringSet, with_value: str):
         """Applies :func:`~.replace` to each line"""
-        self.apply(partial(replace, **self._arguments_except_self(locals())))
+        self._add_step(StepSpec("replace", self._arguments_except_self(locals())))
         return self
 
     def replace_expression(
@@ -218,18 +263,20 @@ class BaseProcessor(ABC):
         with_value: Callable[..., str] | str,
     ):
         """Applies :func:`~.replace_expression` to each line"""
-        self.apply(partial(replace_expression, **self._arguments_except_self(locals())))
+        self._add_step(
+            StepSpec("replace_expression", self._arguments_except_self(locals()))
+        )
         return self
 
     def replace_pairs(self, keys: list[str], values: list[str]):
         """Applies :func:`~.replace_pairs` to each line"""
-        self.apply(partial(replace_pairs, **self._arguments_except_self(locals())))
+        self._add_step(StepSpec("replace_pairs", self._arguments_except_self(locals())))
         return self
 
     def reduce_repeated_substring(self, min_repeated: int = 3, reduce_to: int = 2):
         """Applies :func:`~.reduce_repeated_substring` to each line"""
-        self.apply(
-            partial(reduce_repeated_substring, **self._arguments_except_self(locals()))
+        self._add_step(
+            StepSpec("reduce_repeated_substring", self._arguments_except_self(locals()))
         )
         return self
 
@@ -261,11 +308,11 @@ class BaseProcessor(ABC):
         mentions: bool = False,
         emojis: bool = False,
         use_space: bool = True,
-        custom_strings: list[str] | str | None = None,
+        custom_strings: list[str] | str | StringSet | None = None,
         custom_expressions: list[str] | str | None = None,
     ):
         """Applies :func:`~.remove` to each line"""
-        self.apply(partial(remove, **self._arguments_except_self(locals())))
+        self._add_step(StepSpec("remove", self._arguments_except_self(locals())))
         return self
 
     def drop_lines_contain(
@@ -298,7 +345,7 @@ class BaseProcessor(ABC):
         links: bool = False,
         mentions: bool = False,
         emojis: bool = False,
-        custom_strings: list[str] | str | None = None,
+        custom_strings: list[str] | str | StringSet | None = None,
         custom_expressions: list[str] | str | None = None,
         operator: str = "or",
     ):
@@ -313,11 +360,9 @@ class BaseProcessor(ABC):
         if operator is None:
             raise ValueError("operator cannot be None")
 
-        arguments = locals()
-        self.filter(
-            lambda text: not contains(text, **self._arguments_except_self(arguments))
+        self._add_step(
+            StepSpec("drop_lines_contain", self._arguments_except_self(locals()))
         )
-
         return self
 
     def drop_empty_lines(self):
@@ -335,8 +380,8 @@ class BaseProcessor(ABC):
             True to switch to word level, which splits the text by space,
             by default False
         """
-        self.filter(
-            lambda line: (len(line.split()) if word_level else len(line)) >= length
+        self._add_step(
+            StepSpec("drop_lines_below_len", self._arguments_except_self(locals()))
         )
         return self
 
@@ -351,10 +396,9 @@ class BaseProcessor(ABC):
             True to switch to word level, which splits the text by space,
             by default False
         """
-        filter_fn = (
-            lambda line: (len(line.split()) if word_level else len(line)) <= length
+        self._add_step(
+            StepSpec("drop_lines_above_len", self._arguments_except_self(locals()))
         )
-        self.filter(filter_fn)
         return self
 
     def drop_lines_contain_repeated_substring(self, repeated=3):
@@ -366,7 +410,12 @@ class BaseProcessor(ABC):
             Minimum number of repetitions, by default 3
 
         """
-        self.filter(lambda line: not contains_repeated_substring(line, repeated))
+        self._add_step(
+            StepSpec(
+                "drop_lines_contain_repeated_substring",
+                self._arguments_except_self(locals()),
+            )
+        )
         return self
 
     def drop_lines_contain_single_letter_word(
@@ -385,10 +434,10 @@ class BaseProcessor(ABC):
         See also :func:`~.connect_single_letter_word`.
         """
 
-        arguments = locals()
-        self.filter(
-            lambda text: not contains_single_letter_word(
-                text, **self._arguments_except_self(arguments)
+        self._add_step(
+            StepSpec(
+                "drop_lines_contain_single_letter_word",
+                self._arguments_except_self(locals()),
             )
         )
         return self
@@ -423,7 +472,7 @@ class BaseProcessor(ABC):
         links: bool = False,
         mentions: bool = False,
         emojis: bool = False,
-        custom_strings: list[str] | str | None = None,
+        custom_strings: list[str] | str | StringSet | None = None,
         custom_expressions: list[str] | str | None = None,
         operator: str = "or",
     ):
@@ -438,9 +487,8 @@ class BaseProcessor(ABC):
         if operator is None:
             raise ValueError("operator cannot be None")
 
-        arguments = locals()
-        self.filter(
-            lambda text: bool(contains(text, **self._arguments_except_self(arguments)))
+        self._add_step(
+            StepSpec("filter_lines_contain", self._arguments_except_self(locals()))
         )
         return self
 
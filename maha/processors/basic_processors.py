@@ -9,9 +9,9 @@ __all__ = [
 
 
 import pathlib
-from typing import Callable
 
 from .base_processor import BaseProcessor
+from .line_index import LineIndex
 
 
 class TextProcessor(BaseProcessor):
@@ -23,14 +23,24 @@ class TextProcessor(BaseProcessor):
         A text or list of strings to process
     """
 
+    _lines: list[str]
+
     def __init__(self, text: list[str] | str) -> None:
+        super().__init__()
         self.set_lines(text)
 
-    def apply(self, fn: Callable[[str], str]):
-        self.lines: list[str] = list(map(fn, self.lines))
-
-    def filter(self, fn: Callable[[str], bool]):
-        self.lines = list(filter(fn, self.lines))
+    @property
+    def lines(self) -> list[str]:
+        """Returns the processed lines, queued steps are applied first."""
+        if self.steps:
+            self._lines = self.plan(self._lines)
+            self.clear_steps()
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines: list[str]):
+        self.clear_steps()
+        self._lines = lines
 
     def get_lines(self, n_lines: int = 100):
         for i in range(0, len(self.lines), n_lines):
@@ -44,11 +54,10 @@ class TextProcessor(BaseProcessor):
         text : Union[List[str], str]
             New text or list of strings
         """
-        self.lines = []
         if isinstance(text, str):
             self.lines = [text]
         else:
-            self.lines.extend(text)
+            self.lines = list(text)
 
     @property
     def text(self) -> str:
@@ -115,6 +124,8 @@ class FileProcessor(TextProcessor):
     ----------
     path : Union[str, :obj:`pathlib.Path`]
         Path of the file to process.
+    encoding : str
+        File encoding.
 
     Raises
     ------
@@ -124,7 +135,7 @@ class FileProcessor(TextProcessor):
         If the file is empty.
     """
 
-    def __init__(self, path: str | pathlib.Path) -> None:
+    def __init__(self, path: str | pathlib.Path, encoding: str = "utf8") -> None:
 
         if isinstance(path, str):
             path = pathlib.Path(path)
@@ -132,14 +143,33 @@ class FileProcessor(TextProcessor):
         if not path.is_file():
             raise FileNotFoundError(f"{str(path)} doesn't exist.")
 
-        with path.open("r", encoding="utf8") as f:
+        with path.open("r", encoding=encoding) as f:
             text = f.read()
 
         if not text:
             raise ValueError("File empty.")
 
+        self.encoding = encoding
+        self.file = path
         super().__init__(text.split("\n"))
 
+    def get_line_index(self, save: bool = False) -> LineIndex:
+        """Returns the :class:`~.LineIndex` of the input file, for reading any line of
+        the file or splitting it for parallel workers.
+
+        Parameters
+        ----------
+        save : bool, optional
+            True to save the index next to the file if it was not saved, by default
+            False. See :meth:`~.LineIndex.of`.
+
+        Returns
+        -------
+        :class:`~.LineIndex`
+            Index of the input file
+        """
+        return LineIndex.of(self.file, self.encoding, save)
+
 
 class DataFrameProcessor:
     def __init__(self):
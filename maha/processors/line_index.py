@@ -0,0 +1,306 @@
+""" Index of the line offsets of a file """
+from __future__ import annotations
+
+__all__ = ["LineIndex"]
+
+
+import mmap
+import os
+import pathlib
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import BinaryIO
+
+_MAGIC = b"MAHALIDX"
+_VERSION = 1
+# Magic, version, byte order (0 little, 1 big), file size, file mtime_ns, lines
+_HEADER = struct.Struct("<8sBBQqQ")
+_NEW_LINE = re.compile(b"\n")
+
+
+class LineIndex:
+    """Byte offsets of the lines of a file, for reading any line without reading the
+    lines before it and for splitting the file into parts for parallel workers.
+
+    Lines end after each new line character ``\\n`` or at the end of the file, like
+    iterating over the file. The offsets take 8 bytes per line.
+
+    The index is built with one pass over a memory map of the file, see
+    :meth:`~.LineIndex.build`. It can be saved next to the file and loaded while the
+    file does not change, see :meth:`~.LineIndex.of`.
+
+    Example
+    -------
+
+    .. code:: pycon
+
+        >>> import pathlib, tempfile
+        >>> from maha.processors import LineIndex
+        >>> path = pathlib.Path(tempfile.mkdtemp()) / "text.txt"
+        >>> _ = path.write_bytes("سطر\\nsecond line\\r\\nأخير".encode("utf8"))
+        >>> index = LineIndex.build(path)
+        >>> len(index)
+        3
+        >>> index[2]
+        'أخير'
+        >>> index.split(2)
+        [(0, 20), (20, 28)]
+
+    Parameters
+    ----------
+    path : Union[str, :obj:`pathlib.Path`]
+        Path of the file.
+    offsets : array
+        Start offset of each line, array of type ``Q``.
+    size : int
+        Size of the file in bytes.
+    encoding : str
+        File encoding, by default utf8.
+    """
+
+    SUFFIX = ".lineidx"
+    """ Suffix of the saved index, added to the name of the file """
+
+    def __init__(
+        self,
+        path: str | pathlib.Path,
+        offsets: array,
+        size: int,
+        encoding: str = "utf8",
+    ):
+        self.path = pathlib.Path(path)
+        self.offsets = offsets
+        self.size = size
+        self.encoding = encoding
+        self._file: BinaryIO | None = None
+
+    @classmethod
+    def build(cls, path: str | pathlib.Path, encoding: str = "utf8") -> LineIndex:
+        """Builds the index of the input file.
+
+        Parameters
+        ----------
+        path : Union[str, :obj:`pathlib.Path`]
+            Path of the file.
+        encoding : str
+            File encoding, by default utf8. The new line character should be encoded
+            as the byte ``\\n``.
+
+        Returns
+        -------
+        :class:`~.LineIndex`
+            Index of the file
+        """
+        path = pathlib.Path(path)
+        offsets = array("Q")
+        with path.open("rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size:
+                offsets.append(0)
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    # Scanned by the regex engine, not line by line in Python
+                    offsets.extend(m.end() for m in _NEW_LINE.finditer(data))
+                # A new line at the end of the file doesn't start a line
+                if offsets[-1] == size:
+                    offsets.pop()
+        return cls(path, offsets, size, encoding)
+
+    @classmethod
+    def of(
+        cls, path: str | pathlib.Path, encoding: str = "utf8", save: bool = False
+    ) -> LineIndex:
+        """Returns the index of the input file, loaded from the saved index if the
+        file did not change since it was saved, built otherwise.
+
+        Parameters
+        ----------
+        path : Union[str, :obj:`pathlib.Path`]
+            Path of the file.
+        encoding : str
+            File encoding, by default utf8.
+        save : bool
+            True to save the built index next to the file, by default False
+
+        Returns
+        -------
+        :class:`~.LineIndex`
+            Index of the file
+        """
+        index = cls.load(path, encoding)
+        if index is None:
+            index = cls.build(path, encoding)
+            if save:
+                index.save()
+        return index
+
+    @classmethod
+    def get_index_path(cls, path: str | pathlib.Path) -> pathlib.Path:
+        """Returns the path of the saved index of the input file."""
+        path = pathlib.Path(path)
+        return path.with_name(path.name + cls.SUFFIX)
+
+    @classmethod
+    def load(cls, path: str | pathlib.Path, encoding: str = "utf8") -> LineIndex | None:
+        """Loads the saved index of the input file.
+
+        Parameters
+        ----------
+        path : Union[str, :obj:`pathlib.Path`]
+            Path of the file.
+        encoding : str
+            File encoding, by default utf8.
+
+        Returns
+        -------
+        Optional[:class:`~.LineIndex`]
+            Index of the file, None if there is no saved index or the size or the
+            modification time of the file changed since it was saved.
+        """
+        path = pathlib.Path(path)
+        index_path = cls.get_index_path(path)
+        if not index_path.is_file():
+            return None
+
+        stat = path.stat()
+        with index_path.open("rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, version, big_endian, size, mtime_ns, count = _HEADER.unpack(header)
+            if (magic, version) != (_MAGIC, _VERSION):
+                return None
+            if (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                return None
+            offsets = array("Q")
+            try:
+                offsets.fromfile(file, count)
+            except EOFError:
+                return None
+
+        if big_endian != (sys.byteorder == "big"):
+            offsets.byteswap()
+        return cls(path, offsets, size, encoding)
+
+    def save(self):
+        """Saves the index next to the file, see :meth:`~.LineIndex.get_index_path`.
+        The index is valid while the size and the modification time of the file do
+        not change."""
+        stat = self.path.stat()
+        index_path = self.get_index_path(self.path)
+        temporary = index_path.with_name(index_path.name + ".tmp")
+        with temporary.open("wb") as file:
+            file.write(
+                _HEADER.pack(
+                    _MAGIC,
+                    _VERSION,
+                    sys.byteorder == "big",
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    len(self.offsets),
+                )
+            )
+            self.offsets.tofile(file)
+        os.replace(temporary, index_path)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def span(self, i: int) -> tuple[int, int]:
+        """Returns the start and end byte offsets of line ``i``, including its line
+        ending.
+
+        Parameters
+        ----------
+        i : int
+            Line number, starting from 0. Negative numbers count from the end.
+
+        Returns
+        -------
+        Tuple[int, int]
+            Start and end offsets
+
+        Raises
+        ------
+        IndexError
+            If the line doesn't exist
+        """
+        start = self.offsets[i]
+        i = i + len(self) if i < 0 else i
+        end = self.offsets[i + 1] if i + 1 < len(self) else self.size
+        return start, end
+
+    def __getitem__(self, i: int) -> str:
+        """Returns line ``i`` without its line ending, ``\\n`` or ``\\r\\n``."""
+        start, end = self.span(i)
+        if self._file is None:
+            self._file = self.path.open("rb")
+        self._file.seek(start)
+        line = self._file.read(end - start).decode(self.encoding)
+        if line.endswith("\n"):
+            line = line[:-1]
+            if line.endswith("\r"):
+                line = line[:-1]
+        return line
+
+    def line_number(self, offset: int) -> int:
+        """Returns the number of the line that contains the byte ``offset``.
+
+        Parameters
+        ----------
+        offset : int
+            Byte offset in the file
+
+        Returns
+        -------
+        int
+            Line number, starting from 0
+        """
+        return max(0, bisect_right(self.offsets, offset) - 1)
+
+    def split(self, parts: int) -> list[tuple[int, int]]:
+        """Splits the file into ``parts`` byte ranges of whole lines with about the
+        same size.
+
+        Parameters
+        ----------
+        parts : int
+            Number of ranges
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            Start and end offsets of each range, in order. There are less ranges if
+            the file has less lines than ``parts``.
+
+        Raises
+        ------
+        ValueError
+            If ``parts`` is not positive
+        """
+        if parts < 1:
+            raise ValueError("parts should be positive")
+
+        parts = min(parts, len(self))
+        if not parts:
+            return []
+
+        lines = [0]
+        for part in range(1, parts):
+            # The first line that starts at or after the ideal boundary, each range
+            # keeps at least one line
+            i = bisect_left(self.offsets, part * self.size // parts)
+            lines.append(min(max(i, lines[-1] + 1), len(self) - parts + part))
+        boundaries = [self.offsets[i] for i in lines] + [self.size]
+        return list(zip(boundaries, boundaries[1:]))
+
+    def close(self):
+        """Closes the file opened to read lines."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,313 @@
+""" Execution plan that runs the queued processor steps over each line once """
+from __future__ import annotations
+
+__all__ = ["ExecutionPlan", "CharacterStep", "APPLY", "FILTER"]
+
+
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from inspect import signature
+from typing import Callable, Iterable
+
+from maha.cleaners.functions import (
+    normalize,
+    remove,
+    remove_extra_spaces,
+    replace,
+    replace_pairs,
+)
+from maha.cleaners.functions.remove_fn import _get_removed_constants
+from maha.constants import (
+    ALEF,
+    ALEF_VARIATIONS,
+    ARABIC_LIGATURES,
+    ARABIC_LIGATURES_NORMALIZED,
+    EMPTY,
+    HEH,
+    LAM,
+    LAM_ALEF_VARIATIONS,
+    SPACE,
+    TEH_MARBUTA,
+    WAW,
+    WAW_VARIATIONS,
+    YEH,
+    YEH_VARIATIONS,
+)
+from maha.expressions import EXPRESSION_ALL_SPACES
+from maha.rexy import StringSet
+
+APPLY = "apply"
+""" Step that maps each line to a new line """
+FILTER = "filter"
+""" Step that keeps lines for which the step function is True """
+
+
+@dataclass
+class CharacterStep:
+    """Step that maps each character independently using :meth:`str.translate`.
+
+    Adjacent character steps are fused into a single step by composing their
+    translation tables, see :meth:`~.CharacterStep.then`.
+    """
+
+    __slots__ = ["table", "squeeze_spaces", "strip", "_replacements"]
+
+    table: dict[int, str]
+    """Translation table, maps a character ordinal to its replacement"""
+    squeeze_spaces: bool
+    """Whether to collapse consecutive spaces after translating"""
+    strip: bool
+    """Whether to strip the output after translating"""
+
+    def __init__(
+        self, table: dict[int, str], squeeze_spaces: bool = False, strip: bool = False
+    ):
+        self.table = table
+        self.squeeze_spaces = squeeze_spaces
+        self.strip = strip
+
+        # str.translate looks up every character of the text, replacing the
+        # characters of the table one by one is much faster for Arabic text. This
+        # is only possible if no replacement contains a character of the table.
+        replacements = {chr(k): v for k, v in table.items() if chr(k) != v}
+        if any(k in v for k in replacements for v in replacements.values()):
+            self._replacements = None
+        else:
+            self._replacements = list(replacements.items())
+
+    def then(self, other: CharacterStep) -> CharacterStep | None:
+        """Returns a step equivalent to applying this step then ``other``.
+
+        Returns None if the steps cannot be fused, which is the case when this step
+        squeezes spaces or strips the output.
+        """
+        if self.squeeze_spaces or self.strip:
+            return None
+
+        table = {key: value.translate(other.table) for key, value in self.table.items()}
+        for key, value in other.table.items():
+            table.setdefault(key, value)
+
+        return CharacterStep(table, other.squeeze_spaces, other.strip)
+
+    def __call__(self, text: str) -> str:
+        if self._replacements is None:
+            output = text.translate(self.table)
+        else:
+            output = text
+            for key, value in self._replacements:
+                if key in output:
+                    output = output.replace(key, value)
+        if self.squeeze_spaces:
+            output = remove_extra_spaces(output)
+        if self.strip:
+            output = output.strip()
+        return output
+
+
+class ExecutionPlan:
+    """Compiled form of the steps queued in a processor.
+
+    Adjacent character-level steps (e.g. harakat removal and alef normalization) are
+    fused into one :meth:`str.translate` call. All steps are then applied to each line
+    in a single pass instead of one pass per step. The output is the same as applying
+    the steps one after another.
+
+    Parameters
+    ----------
+    steps : Iterable[Tuple[str, Callable]]
+        Steps to compile, each step is a tuple of the step kind (:data:`~.APPLY` or
+        :data:`~.FILTER`) and the function to apply.
+    """
+
+    def __init__(self, steps: Iterable[tuple[str, Callable]]):
+        self.steps = self._fuse(steps)
+
+    def __call__(self, lines: Iterable[str]) -> list[str]:
+        """Applies the plan to the input ``lines``.
+
+        Parameters
+        ----------
+        lines : Iterable[str]
+            Lines to process
+
+        Returns
+        -------
+        List[str]
+            Processed lines
+        """
+        output = []
+        steps = self.steps
+        for line in lines:
+            for kind, fn in steps:
+                if kind == FILTER:
+                    if not fn(line):
+                        break
+                else:
+                    line = fn(line)
+            else:
+                output.append(line)
+        return output
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    @staticmethod
+    def _fuse(steps: Iterable[tuple[str, Callable]]) -> list[tuple[str, Callable]]:
+        output: list[tuple[str, Callable]] = []
+        for kind, fn in steps:
+            step = get_character_step(fn) if kind == APPLY else None
+            if step is None:
+                output.append((kind, fn))
+                continue
+
+            if output and isinstance(output[-1][1], CharacterStep):
+                fused = output[-1][1].then(step)
+                if fused is not None:
+                    output[-1] = (APPLY, fused)
+                    continue
+            output.append((APPLY, step))
+
+        return output
+
+
+def get_character_step(fn: Callable) -> CharacterStep | None:
+    """Returns the equivalent :class:`~.CharacterStep` of the input function if the
+    function only maps single characters, None otherwise.
+
+    Parameters
+    ----------
+    fn : Callable
+        Step function, usually a :func:`functools.partial` of a cleaning function
+
+    Returns
+    -------
+    Optional[:class:`~.CharacterStep`]
+        Equivalent character step
+    """
+    if isinstance(fn, CharacterStep):
+        return fn
+    if not isinstance(fn, partial) or fn.args:
+        return None
+
+    builder = _STEP_BUILDERS.get(fn.func)
+    if builder is None:
+        return None
+    try:
+        return builder(**fn.keywords)
+    except TypeError:
+        # Invalid arguments, the original function raises when called.
+        return None
+
+
+def _translation_table(keys: Iterable[str], value: str) -> dict[int, str]:
+    return {ord(key): value for key in keys}
+
+
+def _all_single_characters(strings: Iterable[str]) -> bool:
+    return all(isinstance(s, str) and len(s) == 1 for s in strings)
+
+
+@lru_cache(maxsize=None)
+def _all_spaces() -> tuple[str, ...]:
+    """Space variations matched by :data:`~.EXPRESSION_ALL_SPACES`"""
+    return tuple(
+        chr(i) for i in range(0x10000) if EXPRESSION_ALL_SPACES.fullmatch(chr(i))
+    )
+
+
+def _normalize_step(
+    lam_alef: bool | None = None,
+    alef: bool | None = None,
+    waw: bool | None = None,
+    yeh: bool | None = None,
+    teh_marbuta: bool | None = None,
+    ligatures: bool | None = None,
+    spaces: bool | None = None,
+    all: bool | None = False,
+) -> CharacterStep | None:
+    if not (
+        lam_alef or alef or waw or yeh or teh_marbuta or ligatures or spaces or all
+    ):
+        return None
+
+    tables = []
+    if lam_alef or (all and lam_alef is not False):
+        tables.append(_translation_table(LAM_ALEF_VARIATIONS, LAM + ALEF))
+    if alef or (all and alef is not False):
+        tables.append(_translation_table(ALEF_VARIATIONS, ALEF))
+    if waw or (all and waw is not False):
+        tables.append(_translation_table(WAW_VARIATIONS, WAW))
+    if yeh or (all and yeh is not False):
+        tables.append(_translation_table(YEH_VARIATIONS, YEH))
+    if teh_marbuta or (all and teh_marbuta is not False):
+        tables.append(_translation_table(TEH_MARBUTA, HEH))
+    if ligatures or (all and ligatures is not False):
+        table: dict[int, str] = {}
+        for key, value in zip(ARABIC_LIGATURES, ARABIC_LIGATURES_NORMALIZED):
+            table.setdefault(ord(key), value)
+        tables.append(table)
+    if spaces or (all and spaces is not False):
+        tables.append(_translation_table(_all_spaces(), SPACE))
+
+    step = CharacterStep({})
+    for table in tables:
+        step = step.then(CharacterStep(table))  # type: ignore
+    return step
+
+
+def _replace_pairs_step(keys: list[str], values: list[str]) -> CharacterStep | None:
+    if len(keys) != len(values) or not keys or not _all_single_characters(keys):
+        return None
+
+    table: dict[int, str] = {}
+    for key, value in zip(keys, values):
+        table.setdefault(ord(key), value)
+    return CharacterStep(table)
+
+
+def _replace_step(strings: list[str] | str, with_value: str) -> CharacterStep | None:
+    if isinstance(strings, str):
+        strings = [strings]
+    # Backslashes are processed as a replacement template by the regex module
+    if not strings or not isinstance(with_value, str) or "\\" in with_value:
+        return None
+    if not _all_single_characters(strings):
+        return None
+
+    return CharacterStep(_translation_table(strings, with_value))
+
+
+def _remove_step(
+    use_space: bool = True,
+    custom_strings: list[str] | str | StringSet | None = None,
+    custom_expressions=None,
+    **kwargs,
+) -> CharacterStep | None:
+    if custom_expressions or not set(kwargs).issubset(signature(remove).parameters):
+        return None
+
+    custom_strings = custom_strings or []
+    if isinstance(custom_strings, str):
+        custom_strings = [custom_strings]
+
+    chars_to_delete, chars_to_remove, expressions = _get_removed_constants(kwargs)
+    if expressions:
+        # Expressions cannot be translated
+        return None
+    chars_to_remove = list(custom_strings) + chars_to_remove
+
+    if not chars_to_remove or not _all_single_characters(chars_to_remove):
+        return None
+
+    table = _translation_table(chars_to_remove, SPACE if use_space else EMPTY)
+    table.update(_translation_table(chars_to_delete, EMPTY))
+    return CharacterStep(table, squeeze_spaces=use_space, strip=True)
+
+
+_STEP_BUILDERS: dict[Callable, Callable[..., CharacterStep | None]] = {
+    normalize: _normalize_step,
+    replace_pairs: _replace_pairs_step,
+    replace: _replace_step,
+    remove: _remove_step,
+}
@@ -0,0 +1,300 @@
+""" Declarative specification of the processor steps """
+from __future__ import annotations
+
+__all__ = ["StepSpec", "OPERATIONS", "steps_fingerprint"]
+
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Iterable
+
+import maha.cleaners.functions as cleaner_functions
+from maha.cleaners.functions import (
+    connect_single_letter_word,
+    contains,
+    contains_repeated_substring,
+    contains_single_letter_word,
+    keep,
+    normalize,
+    reduce_repeated_substring,
+    remove,
+    replace,
+    replace_expression,
+    replace_pairs,
+)
+from maha.rexy import Expression, StringSet
+
+from .plan import APPLY, FILTER
+
+
+def _drop_contains(text: str, **kwargs) -> bool:
+    return not contains(text, **kwargs)
+
+
+def _filter_contains(text: str, **kwargs) -> bool:
+    return bool(contains(text, **kwargs))
+
+
+def _length(text: str, word_level: bool) -> int:
+    return len(text.split()) if word_level else len(text)
+
+
+def _drop_below_len(text: str, length: int, word_level: bool = False) -> bool:
+    return _length(text, word_level) >= length
+
+
+def _drop_above_len(text: str, length: int, word_level: bool = False) -> bool:
+    return _length(text, word_level) <= length
+
+
+def _drop_contains_repeated_substring(text: str, repeated: int = 3) -> bool:
+    return not contains_repeated_substring(text, repeated)
+
+
+def _drop_contains_single_letter_word(text: str, **kwargs) -> bool:
+    return not contains_single_letter_word(text, **kwargs)
+
+
+OPERATIONS: dict[str, tuple[str, Callable]] = {
+    "keep": (APPLY, keep),
+    "normalize": (APPLY, normalize),
+    "connect_single_letter_word": (APPLY, connect_single_letter_word),
+    "replace": (APPLY, replace),
+    "replace_expression": (APPLY, replace_expression),
+    "replace_pairs": (APPLY, replace_pairs),
+    "reduce_repeated_substring": (APPLY, reduce_repeated_substring),
+    "remove": (APPLY, remove),
+    "drop_lines_contain": (FILTER, _drop_contains),
+    "drop_lines_below_len": (FILTER, _drop_below_len),
+    "drop_lines_above_len": (FILTER, _drop_above_len),
+    "drop_lines_contain_repeated_substring": (
+        FILTER,
+        _drop_contains_repeated_substring,
+    ),
+    "drop_lines_contain_single_letter_word": (
+        FILTER,
+        _drop_contains_single_letter_word,
+    ),
+    "filter_lines_contain": (FILTER, _filter_contains),
+}
+""" Maps the name of each operation to the kind of its step and the function that is
+called with the line and the arguments of the step. :data:`~.APPLY` and
+:data:`~.FILTER` are also operations, their only argument ``fn`` is the step
+function. """
+
+
+# Line the operations run on to validate their arguments, most of the functions
+# return empty lines without checking the arguments
+_SAMPLE_LINE = "a"
+
+
+@dataclass
+class StepSpec:
+    """Serializable specification of a processor step, the name of the operation and
+    its arguments. The step function is built from the specification, see
+    :meth:`~.StepSpec.build`.
+
+    Specifications can be pickled, so processors can send their steps to worker
+    processes, and converted to dictionaries of JSON values, see
+    :meth:`~.StepSpec.to_dict`.
+
+    Example
+    -------
+
+    .. code:: pycon
+
+        >>> from maha.processors import StepSpec
+        >>> step = StepSpec("drop_lines_below_len", {"length": 3})
+        >>> step.to_dict()
+        {'operation': 'drop_lines_below_len', 'arguments': {'length': 3}}
+        >>> step.kind
+        'filter'
+        >>> step.build()("ab")
+        False
+
+    Parameters
+    ----------
+    operation : str
+        Name of the operation, a key of :data:`~.OPERATIONS`
+    arguments : Dict[str, Any], optional
+        Keyword arguments of the operation, by default no arguments
+
+    Raises
+    ------
+    ValueError
+        If the operation is unknown
+    """
+
+    operation: str
+    """Name of the operation"""
+    arguments: dict[str, Any] = field(default_factory=dict)
+    """Keyword arguments of the operation"""
+
+    def __post_init__(self):
+        if self.operation not in OPERATIONS and self.operation not in (APPLY, FILTER):
+            raise ValueError(f"Unknown operation '{self.operation}'")
+
+    @property
+    def kind(self) -> str:
+        """Kind of the step, :data:`~.APPLY` or :data:`~.FILTER`"""
+        if self.operation in (APPLY, FILTER):
+            return self.operation
+        return OPERATIONS[self.operation][0]
+
+    def build(self) -> Callable:
+        """Returns the step function, it takes a line and returns the new line for
+        :data:`~.APPLY` steps or whether to keep the line for :data:`~.FILTER` steps.
+
+        Returns
+        -------
+        Callable
+            Step function
+        """
+        if self.operation in (APPLY, FILTER):
+            return self.arguments["fn"]
+        return partial(OPERATIONS[self.operation][1], **self.arguments)
+
+    def validate(self):
+        """Raises the error of invalid arguments, e.g. ``remove`` without
+        arguments, by running the step on a sample line. :data:`~.APPLY` and
+        :data:`~.FILTER` steps are not run.
+
+        Raises
+        ------
+        ValueError
+            If the arguments are invalid
+        TypeError
+            If the arguments have invalid types
+        """
+        if self.operation not in (APPLY, FILTER):
+            self.build()(_SAMPLE_LINE)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the specification as a dictionary of JSON values.
+
+        :class:`~.StringSet` and :class:`~.Expression` arguments are saved as their
+        strings and pattern. Functions are saved as their import path, so only
+        functions defined at the top level of a module can be saved.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Dictionary with the operation and its arguments
+
+        Raises
+        ------
+        TypeError
+            If an argument cannot be converted
+        """
+        return {
+            "operation": self.operation,
+            "arguments": {k: _to_json(v) for k, v in self.arguments.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> StepSpec:
+        """Returns the specification of a dictionary returned by
+        :meth:`~.StepSpec.to_dict`.
+
+        Only functions of :data:`~.OPERATIONS` and the cleaning functions of
+        :mod:`maha.cleaners.functions` are loaded, since loaded functions run on
+        each line. Steps of other functions should be built in code.
+
+        Parameters
+        ----------
+        data : Dict[str, Any]
+            Dictionary with the operation and its arguments
+
+        Returns
+        -------
+        :class:`~.StepSpec`
+            Specification of the step
+
+        Raises
+        ------
+        ValueError
+            If the operation, a value or a function is unknown
+        """
+        arguments = data.get("arguments", {})
+        return cls(data["operation"], {k: _from_json(v) for k, v in arguments.items()})
+
+
+def steps_fingerprint(steps: Iterable[StepSpec]) -> str:
+    """Returns the md5 hash of the input steps, used to check that saved outputs
+    were processed by the same steps.
+
+    Steps that cannot be converted to JSON are hashed by their representation, which
+    includes the identity of functions, so their fingerprint changes in each process.
+
+    Parameters
+    ----------
+    steps : Iterable[:class:`~.StepSpec`]
+        Steps to hash
+
+    Returns
+    -------
+    str
+        Fingerprint of the steps
+    """
+    specs = []
+    for step in steps:
+        try:
+            specs.append(step.to_dict())
+        except TypeError:
+            specs.append(
+                {"operation": step.operation, "arguments": repr(step.arguments)}
+            )
+    return hashlib.md5(json.dumps(specs, sort_keys=True).encode()).hexdigest()
+
+
+def _to_json(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, StringSet):
+        return {"string_set": sorted(value)}
+    if type(value) is Expression:
+        return {"expression": value.pattern}
+    if callable(value):
+        module = getattr(value, "__module__", None)
+        name = getattr(value, "__qualname__", "")
+        if module and name and "<" not in name:
+            return {"function": f"{module}:{name}"}
+    raise TypeError(f"Cannot convert {value!r} to JSON")
+
+
+def _from_json(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "string_set" in value:
+        return StringSet(value["string_set"])
+    if "expression" in value:
+        return Expression(value["expression"])
+    if "function" in value:
+        function = _get_loadable_functions().get(value["function"])
+        if function is None:
+            raise ValueError(f"Unknown function '{value['function']}'")
+        return function
+    raise ValueError(f"Unknown value {value!r}")
+
+
+_LOADABLE_FUNCTIONS: dict[str, Callable] = {}
+
+
+def _get_loadable_functions() -> dict[str, Callable]:
+    # Functions that steps loaded from JSON may call, by their saved import path
+    if not _LOADABLE_FUNCTIONS:
+        functions = [fn for _, fn in OPERATIONS.values()] + [
+            value
+            for name, value in vars(cleaner_functions).items()
+            if not name.startswith("_")
+            and callable(value)
+            and getattr(value, "__module__", "").startswith(cleaner_functions.__name__)
+        ]
+        _LOADABLE_FUNCTIONS.update((_to_json(fn)["function"], fn) for fn in functions)
+    return _LOADABLE_FUNCTIONS
@@ -3,16 +3,35 @@ from __future__ import annotations
 __all__ = [
     "StreamTextProcessor",
     "StreamFileProcessor",
+    "StreamFolderProcessor",
 ]
 
 
+import codecs
+import io
+import json
+import os
 import pathlib
+import pickle
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from functools import partial
-from typing import Callable, Iterable
+from typing import IO, Any, Callable, Iterable, Iterator
 
 from tqdm import tqdm
 
+from maha.deprecation import deprecated_fn
+
 from .base_processor import BaseProcessor
+from .line_index import LineIndex
+from .plan import APPLY, ExecutionPlan
+from .steps import steps_fingerprint
+
+PENDING_CHUNKS_PER_WORKER = 4
+""" Number of chunks per worker that are processed or waiting to be written. Chunks
+are written in order, so a slow chunk holds back at most this many chunks per worker
+in memory """
 
 
 class StreamTextProcessor(BaseProcessor):
@@ -25,15 +44,18 @@ class StreamTextProcessor(BaseProcessor):
     """
 
     def __init__(self, lines: Iterable[str]) -> None:
-
+        super().__init__()
         self.lines = lines
-        self.functions: list[Callable] = []
-
-    def apply(self, fn: Callable[[str], str]):
-        self.functions.append(partial(map, fn))
 
-    def filter(self, fn: Callable[[str], bool]):
-        self.functions.append(partial(filter, fn))
+    @property
+    @deprecated_fn(from_v="0.4.0", to_v="1.0.0", alt_fn="steps")
+    def functions(self) -> list[Callable]:
+        """Returns the queued steps as functions that take and return an iterable of
+        lines, changing the returned list does not change the steps."""
+        return [
+            partial(map if kind == APPLY else filter, fn)
+            for kind, fn in ((step.kind, step.build()) for step in self.steps)
+        ]
 
     def get_lines(self, n_lines: int = 100):
         selected_lines = []
@@ -47,13 +69,24 @@ class StreamTextProcessor(BaseProcessor):
         if selected_lines:
             yield selected_lines
 
-    def process(self, n_lines: int = 100):
+    def process(self, n_lines: int = 100, workers: int = 1):
         """Applies all functions in sequence to the given iterable
 
+        With more than one worker, chunks of ``n_lines`` lines are processed by a pool
+        of worker processes while the next chunks are read. Processed chunks are
+        yielded in the order they were read, the output is the same as with one
+        worker. The steps are pickled to be sent to the workers, so functions given
+        to :meth:`~.BaseProcessor.apply` or :meth:`~.BaseProcessor.filter` should be
+        defined at module level. Workers run the steps directly,
+        :meth:`~.StreamTextProcessor.apply_functions` is not called, so overriding it
+        has no effect with more than one worker.
+
         Parameters
         ----------
         n_lines : int, optional
             Number of lines to process at a time, by default 100
+        workers : int, optional
+            Number of worker processes, by default 1
 
         Yields
         -------
@@ -63,26 +96,55 @@ class StreamTextProcessor(BaseProcessor):
         Raises
         ------
         ValueError
-            If no functions were selected.
+            If no functions were selected, or the steps cannot be sent to worker
+            processes.
+        Exception
+            Any exception raised by a function in a worker process.
         """
-        if len(self.functions) == 0:
+        if len(self.steps) == 0:
             raise ValueError("No functions were selected")
 
-        for lines in self.get_lines(n_lines):
-            yield self.apply_functions(lines)
+        yield from self._process_chunks(self.get_lines(n_lines), workers)
+
+    def _process_chunks(
+        self, chunks: Iterable[list[str]], workers: int
+    ) -> Iterator[list[str]]:
+        if workers <= 1:
+            for lines in chunks:
+                yield self.apply_functions(lines)
+            return
+
+        _check_picklable(self.plan)
+        # Chunks are yielded in the order they were submitted. Reading stops while
+        # the oldest chunk is not processed and the queue is full, which bounds the
+        # number of chunks in memory.
+        max_pending = workers * PENDING_CHUNKS_PER_WORKER
+        pending: deque[Future] = deque()
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(self.plan,)
+        ) as executor:
+            try:
+                for lines in chunks:
+                    pending.append(executor.submit(_apply_plan, lines))
+                    if len(pending) >= max_pending:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # Stop the queued chunks if a worker failed or the caller stopped
+                for future in pending:
+                    future.cancel()
 
     def apply_functions(self, text: list[str]):
-        """Applies all functions in sequence to a given list of strings
+        """Applies all functions in sequence to a given list of strings, used when
+        processing in the current process
 
         Parameters
         ----------
         text : List[str]
             List of strings to process
         """
-        output = text
-        for function in self.functions:
-            output = list(function(output))
-        return output
+        return self.plan(text)
 
 
 class StreamFileProcessor(StreamTextProcessor):
@@ -138,10 +200,27 @@ class StreamFileProcessor(StreamTextProcessor):
             yield selected_lines
 
     def process_and_save(
-        self, path: str | pathlib.Path, n_lines: int = 100, override: bool = False
+        self,
+        path: str | pathlib.Path,
+        n_lines: int = 100,
+        override: bool = False,
+        workers: int = 1,
+        checkpoint: bool = False,
+        checkpoint_interval: float = 60.0,
+        resume: bool = False,
     ):
         """Process the input file and save the result in the given path
 
+        With ``checkpoint=True``, a checkpoint is saved next to the output file every
+        ``checkpoint_interval`` seconds and when the file is complete, see
+        :meth:`~.StreamFileProcessor.get_checkpoint_path`. It holds the byte offsets of
+        the processed input and of the saved output and the fingerprint of the steps,
+        see :func:`~.steps_fingerprint`. With ``resume=True``, the output file is
+        truncated to the saved offset and the input is processed from the saved offset,
+        the saved file is the same as a run that was not interrupted. The offsets are
+        counted in bytes of each line, so they are exact for encodings such as utf8
+        that have no byte order mark.
+
         Parameters
         ----------
         path : Union[str, :obj:`pathlib.Path`]
@@ -150,31 +229,454 @@ class StreamFileProcessor(StreamTextProcessor):
             Number of lines to process at a time, by default 100
         override : bool, optional
             True to override the file if exists, by default False
+        workers : int, optional
+            Number of worker processes, by default 1. The saved file is the same for
+            any number of workers, see :meth:`~.StreamTextProcessor.process`.
+        checkpoint : bool, optional
+            True to save checkpoints, by default False
+        checkpoint_interval : float, optional
+            Number of seconds between checkpoints, by default 60.0. Set to 0 to save a
+            checkpoint after each chunk of ``n_lines`` lines.
+        resume : bool, optional
+            True to resume from the checkpoint of the output file, by default False.
+            Checkpoints are saved while resuming. If there is no checkpoint, or the
+            output file was removed or is shorter than at the checkpoint, the file is
+            processed from the start, an existing output file is overridden only if
+            ``override`` is True.
 
         Raises
         ------
         FileExistsError
-            If the file exists
+            If the file exists and is not resumed from a checkpoint
+        ValueError
+            If no functions were selected, the steps cannot be sent to worker
+            processes, or the checkpoint was saved by different steps or a different
+            ``n_lines``.
         """
         if isinstance(path, str):
             path = pathlib.Path(path)
+        if workers > 1:
+            # Fail before the output file is opened
+            _check_picklable(self.plan)
+
+        if checkpoint or resume:
+            self._process_and_save_with_checkpoints(
+                path, n_lines, override, workers, checkpoint_interval, resume
+            )
+            return
 
         if not override and path.is_file():
             raise FileExistsError(f"{str(path)} exists.")
 
         with path.open("w", encoding=self.encoding) as file:
-            for lines in self.process(n_lines):
-                text = "\n".join(lines).strip("\n")
-                if not text:
-                    continue
-                file.write(text)
-                file.write("\n")
+            _write_chunks(file, self.process(n_lines, workers))
+
+    def get_line_index(self, save: bool = False) -> LineIndex:
+        """Returns the :class:`~.LineIndex` of the input file, for reading any line of
+        the file, counting its lines or splitting it for parallel workers.
+
+        Parameters
+        ----------
+        save : bool, optional
+            True to save the index next to the file if it was not saved, by default
+            False. See :meth:`~.LineIndex.of`.
+
+        Returns
+        -------
+        :class:`~.LineIndex`
+            Index of the input file
+        """
+        return LineIndex.of(self.file, self.encoding, save)
+
+    @staticmethod
+    def get_checkpoint_path(path: str | pathlib.Path) -> pathlib.Path:
+        """Returns the path of the checkpoint of an output file, the name of the output
+        file followed by ``.checkpoint``.
+
+        Parameters
+        ----------
+        path : Union[str, :obj:`pathlib.Path`]
+            Path of the output file
+
+        Returns
+        -------
+        :obj:`pathlib.Path`
+            Path of the checkpoint
+        """
+        path = pathlib.Path(path)
+        return path.with_name(path.name + ".checkpoint")
+
+    def _process_and_save_with_checkpoints(
+        self,
+        path: pathlib.Path,
+        n_lines: int,
+        override: bool,
+        workers: int,
+        checkpoint_interval: float,
+        resume: bool,
+    ):
+        if len(self.steps) == 0:
+            raise ValueError("No functions were selected")
+
+        checkpoint_path = self.get_checkpoint_path(path)
+        fingerprint = steps_fingerprint(self.steps)
+        state = None
+        if resume and checkpoint_path.is_file():
+            state = json.loads(checkpoint_path.read_text(encoding="utf8"))
+            if state["fingerprint"] != fingerprint or state["n_lines"] != n_lines:
+                raise ValueError(
+                    f"{str(checkpoint_path)} was saved by different steps or n_lines."
+                )
+            # The output saved before the checkpoint is lost, start over
+            if not path.is_file() or path.stat().st_size < state["output_offset"]:
+                state = None
+
+        if state is not None:
+            input_offset = state["input_offset"]
+            # Drop the output saved after the checkpoint
+            with path.open("r+b") as file:
+                file.truncate(state["output_offset"])
+            mode = "a"
+        else:
+            if not override and path.is_file():
+                raise FileExistsError(f"{str(path)} exists.")
+            input_offset = 0
+            mode = "w"
+
+        # Input offset after each chunk, in the order the chunks are read
+        offsets: deque[int] = deque()
+        chunks = self._get_lines_from(input_offset, n_lines, offsets)
+        with path.open(mode, encoding=self.encoding) as file:
+            last_checkpoint = time.monotonic()
+            for lines in self._process_chunks(chunks, workers):
+                _write_chunks(file, [lines])
+                input_offset = offsets.popleft()
+                if time.monotonic() - last_checkpoint >= checkpoint_interval:
+                    _save_checkpoint(
+                        checkpoint_path, file, input_offset, fingerprint, n_lines
+                    )
+                    last_checkpoint = time.monotonic()
+            _save_checkpoint(checkpoint_path, file, input_offset, fingerprint, n_lines)
+
+    def _get_lines_from(
+        self, offset: int, n_lines: int, offsets: deque[int]
+    ) -> Iterator[list[str]]:
+        # Same lines as get_lines from the byte offset of the input file, the offset
+        # after each chunk is appended to offsets. Line endings are not translated,
+        # so the encoded lines have the size of the read bytes. The byte order mark
+        # of encodings such as utf-8-sig is counted once, at the start of the file.
+        encoder = codecs.getincrementalencoder(self.encoding)()
+        encoder.setstate(0)
+        with self.file.open("rb") as binary, tqdm(
+            total=self.file.stat().st_size,
+            initial=offset,
+            desc="Processing",
+            unit="B",
+            unit_scale=True,
+            leave=True,
+        ) as pbar:
+            file = io.TextIOWrapper(binary, encoding=self.encoding, newline="")
+            if offset:
+                # Seeking the text file sets the decoder to the state after the
+                # byte order mark
+                file.seek(offset)
+            else:
+                bom = "".encode(self.encoding)
+                if bom and binary.read(len(bom)) == bom:
+                    offset = len(bom)
+                    pbar.update(offset)
+                binary.seek(0)
+            selected_lines = []
+            for line in file:
+                size = len(encoder.encode(line))
+                offset += size
+                pbar.update(size)
+                selected_lines.append(line.strip())
+                if len(selected_lines) == n_lines:
+                    offsets.append(offset)
+                    yield selected_lines
+                    selected_lines = []
+
+        if selected_lines:
+            offsets.append(offset)
+            yield selected_lines
 
     def __del__(self):
         if hasattr(self, "openfile"):
             self.openfile.close()
 
 
-class StreamFolderProcessor:
-    def __init__(self):
-        raise NotImplementedError()
+_WORKER_PLAN: ExecutionPlan | None = None
+
+
+def _init_worker(plan: ExecutionPlan):
+    global _WORKER_PLAN
+    _WORKER_PLAN = plan
+
+
+def _apply_plan(lines: list[str]) -> list[str]:
+    return _WORKER_PLAN(lines)  # type: ignore
+
+
+def _check_picklable(plan: ExecutionPlan):
+    # Workers started with spawn, the default on macOS and Windows, receive the plan
+    # pickled and fail to start if it cannot be pickled
+    try:
+        pickle.dumps(plan)
+    except (pickle.PicklingError, AttributeError, TypeError) as error:
+        raise ValueError(
+            "The steps cannot be sent to worker processes, functions given to apply "
+            "or filter should be defined at module level, or use one worker"
+        ) from error
+
+
+class StreamFolderProcessor(BaseProcessor):
+    """For processing the files of a folder, each file is processed as a stream and
+    saved to the same relative path in an output folder, see
+    :meth:`~.StreamFolderProcessor.process_and_save`.
+
+    Parameters
+    ----------
+    path : Union[str, :obj:`pathlib.Path`]
+        Path of the folder to process.
+    pattern : str
+        Glob pattern of the files to process, relative to ``path``, by default
+        ``"**/*.txt"``.
+    encoding : str
+        File encoding.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the folder doesn't exist.
+    """
+
+    MANIFEST_NAME = ".maha_manifest.jsonl"
+    """ Name of the manifest file in the output folder """
+
+    def __init__(
+        self,
+        path: str | pathlib.Path,
+        pattern: str = "**/*.txt",
+        encoding: str = "utf8",
+    ) -> None:
+
+        if isinstance(path, str):
+            path = pathlib.Path(path)
+
+        if not path.is_dir():
+            raise FileNotFoundError(f"{str(path)} doesn't exist.")
+
+        self.encoding = encoding
+        self.folder = path
+        self.files = sorted(p for p in path.glob(pattern) if p.is_file())
+        super().__init__()
+
+    def get_lines(self, n_lines: int = 100):
+        for path in self.files:
+            with path.open("r", encoding=self.encoding) as file:
+                yield from _read_chunks(file, n_lines)
+
+    def process_and_save(
+        self,
+        path: str | pathlib.Path,
+        n_lines: int = 100,
+        override: bool = False,
+        workers: int = 1,
+    ):
+        """Process each file and save the result to the same relative path in the
+        given folder. Files are processed by a pool of worker processes, each file is
+        saved the same as :meth:`~.StreamFileProcessor.process_and_save`.
+
+        Each saved file is written to a temporary file that is renamed when it is
+        complete and recorded in a manifest in the output folder, with the size and
+        modification time of the input file, the fingerprint of the steps, see
+        :func:`~.steps_fingerprint`, and ``n_lines``. Recorded files that did not
+        change since are skipped, so an interrupted run resumes from the remaining
+        files.
+
+        Parameters
+        ----------
+        path : Union[str, :obj:`pathlib.Path`]
+            Path of the output folder, it is created if it doesn't exist
+        n_lines : int, optional
+            Number of lines to process at a time, by default 100
+        override : bool, optional
+            True to override output files that are not recorded in the manifest, by
+            default False
+        workers : int, optional
+            Number of worker processes, by default 1
+
+        Raises
+        ------
+        ValueError
+            If no functions were selected, or the steps cannot be sent to worker
+            processes.
+        FileExistsError
+            If an output file exists and is not recorded in the manifest.
+        """
+        if len(self.steps) == 0:
+            raise ValueError("No functions were selected")
+
+        if isinstance(path, str):
+            path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        manifest_path = path / self.MANIFEST_NAME
+        manifest = _read_manifest(manifest_path)
+        fingerprint = steps_fingerprint(self.steps)
+
+        tasks = []
+        for source in self.files:
+            if _is_relative_to(source, path):
+                # Saved files of an output folder inside the input folder
+                continue
+            name = source.relative_to(self.folder).as_posix()
+            target = path / name
+            stat = source.stat()
+            entry = {
+                "path": name,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "fingerprint": fingerprint,
+                "n_lines": n_lines,
+            }
+            if target.is_file():
+                if manifest.get(name) == entry:
+                    continue
+                if name not in manifest and not override:
+                    raise FileExistsError(f"{str(target)} exists.")
+            tasks.append((entry, source, target))
+
+        with manifest_path.open("a", encoding="utf8") as manifest_file, tqdm(
+            total=len(tasks), desc="Processing", unit="file", leave=True
+        ) as pbar:
+            for entry in self._process_files(tasks, n_lines, workers):
+                manifest_file.write(json.dumps(entry) + "\n")
+                manifest_file.flush()
+                pbar.update()
+
+    def _process_files(
+        self,
+        tasks: list[tuple[dict[str, Any], pathlib.Path, pathlib.Path]],
+        n_lines: int,
+        workers: int,
+    ) -> Iterator[dict[str, Any]]:
+        # Yields the manifest entry of each saved file
+        if workers <= 1:
+            for entry, source, target in tasks:
+                _process_file(self.plan, source, target, self.encoding, n_lines)
+                yield entry
+            return
+
+        _check_picklable(self.plan)
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(self.plan,)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _process_file, None, source, target, self.encoding, n_lines
+                ): entry
+                for entry, source, target in tasks
+            }
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    yield futures[future]
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+def _process_file(
+    plan: ExecutionPlan | None,
+    source: pathlib.Path,
+    target: pathlib.Path,
+    encoding: str,
+    n_lines: int,
+):
+    # Workers use the plan they were started with
+    if plan is None:
+        plan = _WORKER_PLAN
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(target.name + ".part")
+    try:
+        with source.open("r", encoding=encoding) as file, temporary.open(
+            "w", encoding=encoding
+        ) as output:
+            _write_chunks(
+                output, map(plan, _read_chunks(file, n_lines))  # type: ignore
+            )
+    except BaseException:
+        # The file is processed again from the start by the next run
+        if temporary.exists():
+            temporary.unlink()
+        raise
+    os.replace(temporary, target)
+
+
+def _read_chunks(file: IO[str], n_lines: int) -> Iterator[list[str]]:
+    selected_lines = []
+    for line in file:
+        selected_lines.append(line.strip())
+        if len(selected_lines) == n_lines:
+            yield selected_lines
+            selected_lines = []
+    if selected_lines:
+        yield selected_lines
+
+
+def _write_chunks(file: IO[str], chunks: Iterable[list[str]]):
+    for lines in chunks:
+        text = "\n".join(lines).strip("\n")
+        if not text:
+            continue
+        file.write(text)
+        file.write("\n")
+
+
+def _save_checkpoint(
+    path: pathlib.Path,
+    output: IO[str],
+    input_offset: int,
+    fingerprint: str,
+    n_lines: int,
+):
+    # The output is saved before the checkpoint that points to its end, the
+    # checkpoint replaces the previous one at once.
+    output.flush()
+    os.fsync(output.fileno())
+    state = {
+        "input_offset": input_offset,
+        "output_offset": output.tell(),
+        "fingerprint": fingerprint,
+        "n_lines": n_lines,
+    }
+    temporary = path.with_name(path.name + ".tmp")
+    with temporary.open("w", encoding="utf8") as file:
+        json.dump(state, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def _read_manifest(path: pathlib.Path) -> dict[str, dict[str, Any]]:
+    # The last entry of each file wins, a line cut by an interruption is skipped
+    manifest = {}
+    if path.is_file():
+        with path.open("r", encoding="utf8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                manifest[entry["path"]] = entry
+    return manifest
+
+
+def _is_relative_to(path: pathlib.Path, other: pathlib.Path) -> bool:
+    try:
+        path.resolve().relative_to(other.resolve())
+    except ValueError:
+        return False
+    return True
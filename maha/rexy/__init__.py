@@ -1,2 +1,5 @@
+from .pattern_cache import *
+from .prefilter import *
+from .registry import *
 from .rexy import *
 from .templates import *
@@ -0,0 +1,71 @@
+"""
+Command line interface of rexy.
+
+Compile all pickled expressions into the pattern cache, e.g. when building an image::
+
+    python -m maha.rexy build-cache --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+from .build_cache import build_cache, find_pickled_expressions
+from .pattern_cache import PATTERN_CACHE, set_cache_dir
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m maha.rexy")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser(
+        "build-cache", help="compile all pickled expressions into the pattern cache"
+    )
+    build.add_argument("--workers", type=int, help="number of worker processes")
+    build.add_argument(
+        "--cache-dir", help="cache directory, by default $MAHA_CACHE_DIR or the package"
+    )
+    build.add_argument(
+        "--clear",
+        action="store_true",
+        help="remove patterns that are no longer used by any expression",
+    )
+    build.add_argument(
+        "--packages",
+        nargs="+",
+        default=["maha.parsers.rules"],
+        help="packages to search for pickled expressions",
+    )
+    args = parser.parse_args(argv)
+
+    if args.cache_dir:
+        set_cache_dir(args.cache_dir)
+
+    start = time.perf_counter()
+    expressions = find_pickled_expressions(args.packages)
+    results = build_cache(expressions, args.workers, clear=args.clear)
+    elapsed = time.perf_counter() - start
+
+    width = max(len(r.name) for r in results) + 2
+    print(f"{'expression':<{width}}{'compile (ms)':>14}{'size (KB)':>12}  verified")
+    for result in results:
+        print(
+            f"{result.name:<{width}}{result.compile_time * 1e3:>14.1f}"
+            f"{result.size / 1e3:>12.1f}  {'yes' if result.verified else 'NO'}"
+        )
+
+    failed = [r for r in results if not r.verified]
+    print(
+        f"\n{len(results)} patterns, {sum(r.compile_time for r in results):.1f} s "
+        f"compile time, {elapsed:.1f} s with {args.workers or os.cpu_count()} "
+        f"workers, {PATTERN_CACHE.path} "
+        f"({PATTERN_CACHE.path.stat().st_size / 1e6:.1f} MB)"
+    )
+    if failed:
+        print(f"{len(failed)} patterns failed to load from the cache", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+""" Ahead-of-time compilation of pickled expressions into the pattern cache """
+from __future__ import annotations
+
+__all__ = ["find_pickled_expressions", "build_cache", "BuildResult"]
+
+
+import importlib
+import pickle
+import pkgutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+from typing import Iterable, NamedTuple
+
+import regex as re
+
+from .pattern_cache import PATTERN_CACHE, PatternCache
+from .templates import Expression, ExpressionGroup
+
+
+class BuildResult(NamedTuple):
+    """Result of compiling one pattern with :func:`~.build_cache`"""
+
+    name: str
+    """Name of the expression, e.g. ``RULE_TIME``"""
+    pattern: str
+    """Pattern of the expression"""
+    compile_time: float
+    """Time to compile the pattern in seconds"""
+    size: int
+    """Size of the pickled compiled pattern in bytes"""
+    verified: bool
+    """Whether the pattern loads back from the cache bundle"""
+
+
+def find_pickled_expressions(
+    packages: Iterable[str] = ("maha.parsers.rules",)
+) -> dict[str, str]:
+    """Finds the pickled expressions defined in the input packages and all of their
+    modules, including expressions inside :class:`~.ExpressionGroup` objects.
+
+    Parameters
+    ----------
+    packages : Iterable[str], optional
+        Names of the packages to search, by default ``("maha.parsers.rules",)``
+
+    Returns
+    -------
+    Dict[str, str]
+        Maps each pattern to the name of the expression. ``RULE_*`` names are
+        preferred over other names of the same expression.
+    """
+    expressions: dict[str, str] = {}
+
+    def visit(value, name: str):
+        if isinstance(value, ExpressionGroup):
+            for expression in value.expressions:
+                visit(expression, name)
+        elif isinstance(value, Expression) and value.pickle:
+            current = expressions.get(value.pattern)
+            if current is None or (
+                name.startswith("RULE_") and not current.startswith("RULE_")
+            ):
+                expressions[value.pattern] = name
+
+    for package in packages:
+        for module in _walk_modules(importlib.import_module(package)):
+            prefix = module.__name__[len(package) :].strip(".")
+            for attribute, value in vars(module).items():
+                if attribute.startswith("RULE_"):
+                    visit(value, attribute)
+                elif not attribute.startswith("_"):
+                    visit(value, f"{prefix}.{attribute}".strip("."))
+
+    return expressions
+
+
+def build_cache(
+    expressions: dict[str, str] | None = None,
+    workers: int | None = None,
+    cache: PatternCache | None = None,
+    clear: bool = False,
+) -> list[BuildResult]:
+    """Compiles the input patterns in a process pool, saves them to the cache
+    bundle and verifies that each pattern loads back from the saved bundle.
+
+    Parameters
+    ----------
+    expressions : Dict[str, str], optional
+        Maps patterns to names, by default all pickled expressions found by
+        :func:`~.find_pickled_expressions`
+    workers : int, optional
+        Number of worker processes, by default the number of CPUs
+    cache : :class:`~.PatternCache`, optional
+        Cache to save the patterns to, by default :data:`~.PATTERN_CACHE`
+    clear : bool, optional
+        Remove all compiled patterns from the cache first, by default False
+
+    Returns
+    -------
+    List[:class:`~.BuildResult`]
+        Result of each pattern, sorted by compile time in descending order.
+
+    Raises
+    ------
+    OSError
+        If the cache bundle cannot be written.
+    """
+    if expressions is None:
+        expressions = find_pickled_expressions()
+    if cache is None:
+        cache = PATTERN_CACHE
+
+    patterns = list(expressions)
+    with ProcessPoolExecutor(workers) as executor:
+        # Large patterns first to balance the workers
+        order = sorted(range(len(patterns)), key=lambda i: -len(patterns[i]))
+        outputs = dict(zip(order, executor.map(_compile, [patterns[i] for i in order])))
+
+    compiled_patterns = [pickle.loads(outputs[i][0]) for i in range(len(patterns))]
+    if not cache.put_many(compiled_patterns, re.MULTILINE, replace=clear):
+        raise OSError(f"Cannot write the cache bundle {cache.path}")
+
+    # Load from a new instance to read the saved bundle from disk
+    saved_cache = PatternCache(cache.path)
+    results = []
+    for i, pattern in enumerate(patterns):
+        data, compile_time = outputs[i]
+        loaded = saved_cache.get(pattern, re.MULTILINE)
+        verified = (
+            loaded is not None
+            and loaded.pattern == pattern
+            and loaded.flags == compiled_patterns[i].flags
+        )
+        results.append(
+            BuildResult(
+                expressions[pattern], pattern, compile_time, len(data), verified
+            )
+        )
+
+    return sorted(results, key=lambda r: -r.compile_time)
+
+
+def _compile(pattern: str) -> tuple[bytes, float]:
+    start = time.perf_counter()
+    compiled = re.compile(pattern, re.MULTILINE)
+    compile_time = time.perf_counter() - start
+    return pickle.dumps(compiled), compile_time
+
+
+def _walk_modules(package: ModuleType) -> list[ModuleType]:
+    modules = [package]
+    if hasattr(package, "__path__"):
+        for info in pkgutil.walk_packages(package.__path__, package.__name__ + "."):
+            modules.append(importlib.import_module(info.name))
+    return modules
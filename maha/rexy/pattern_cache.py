@@ -0,0 +1,490 @@
+""" Single-file cache of compiled (pickled) regular expression patterns """
+from __future__ import annotations
+
+__all__ = [
+    "PatternCache",
+    "PATTERN_CACHE",
+    "pattern_key",
+    "get_cache_dir",
+    "set_cache_dir",
+    "CACHE_DIR_ENV",
+]
+
+
+import atexit
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import regex as re
+from regex import Pattern
+
+from maha import LIBRARY_PATH
+
+MAGIC = b"MAHACRP"
+""" First bytes of a cache bundle """
+FORMAT_VERSION = 1
+""" Version of the bundle layout, bundles of other versions are ignored """
+_HEADER = struct.Struct("<7sBQ")
+
+CACHE_DIR_ENV = "MAHA_CACHE_DIR"
+""" Environment variable that sets the directory of :data:`~.PATTERN_CACHE` """
+BUNDLE_NAME = "patterns.bundle"
+""" File name of the cache bundle """
+PACKAGE_CACHE_DIR = Path(LIBRARY_PATH) / "rexy" / "cache"
+""" Directory of the cache bundle shipped with the package """
+
+
+def pattern_key(pattern: str, flags: int = re.MULTILINE) -> str:
+    """Returns the cache key of a compiled pattern.
+
+    The key consists of the md5 hash of the pattern, the compile flags and the
+    version of the :mod:`regex` module, since compiled patterns of one version
+    cannot be loaded by another.
+
+    Parameters
+    ----------
+    pattern : str
+        Regular expression pattern.
+    flags : int, optional
+        Flags the pattern is compiled with, by default :data:`regex.MULTILINE`
+
+    Returns
+    -------
+    str
+        Cache key.
+    """
+    md5 = hashlib.md5(pattern.encode()).hexdigest()
+    return f"{md5}-{flags}-{re.__version__}"
+
+
+class PatternCache:
+    """Cache of compiled patterns stored in a single bundle file.
+
+    The bundle starts with a header and a JSON index that maps each cache key to the
+    position of its pickled pattern, followed by the pickled patterns. Opening the
+    cache reads only the header and the index, patterns are read through a memory
+    map when requested. The bundle also stores the source of named patterns, see
+    :meth:`~.PatternCache.get_source`.
+
+    The bundle is written to a temporary file that replaces the bundle, so readers
+    never see a partially written bundle. Writers hold a lock on a ``.lock`` file
+    next to the bundle, so processes that save at the same time keep the patterns of
+    each other. If the bundle cannot be written, e.g. the package is installed in a
+    read-only location, patterns are not cached and later saves are skipped.
+
+    Patterns added with :meth:`~.PatternCache.add` are kept in memory and saved
+    together by :meth:`~.PatternCache.flush`, which is called at exit for
+    :data:`~.PATTERN_CACHE`, so compiling many missing patterns writes the bundle
+    once.
+
+    Parameters
+    ----------
+    path : Union[str, :class:`~pathlib.Path`]
+        Path of the bundle file.
+    fallback : :class:`~.PatternCache`, optional
+        Read-only cache used for patterns that are not found in this cache, by
+        default None
+    """
+
+    def __init__(self, path: str | Path, fallback: PatternCache | None = None):
+        self.path = Path(path)
+        self.fallback = fallback
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._buffer: mmap.mmap | bytes = b""
+        self._offset = 0
+        self._entries: dict[str, tuple[int, int]] = {}
+        self._sources: dict[str, str] = {}
+        self._pending: dict[str, Pattern[str]] = {}
+        self._read_only = False
+
+    def get(self, pattern: str, flags: int = re.MULTILINE) -> Pattern[str] | None:
+        """Returns the cached compiled ``pattern``, None if it is not cached.
+
+        Parameters
+        ----------
+        pattern : str
+            Regular expression pattern.
+        flags : int, optional
+            Flags the pattern is compiled with, by default :data:`regex.MULTILINE`
+
+        Returns
+        -------
+        Optional[:class:`regex.Pattern`]
+            Compiled pattern.
+        """
+        key = pattern_key(pattern, flags)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+        data = self._get_data(key)
+        if data:
+            return pickle.loads(data)
+        if self.fallback is not None:
+            return self.fallback.get(pattern, flags)
+        return None
+
+    def put(self, compiled_pattern: Pattern[str], flags: int = re.MULTILINE) -> bool:
+        """Adds the compiled pattern to the cache and saves the bundle.
+
+        Parameters
+        ----------
+        compiled_pattern : :class:`regex.Pattern`
+            Compiled pattern.
+        flags : int, optional
+            Flags the pattern was compiled with, by default :data:`regex.MULTILINE`
+
+        Returns
+        -------
+        bool
+            True if the bundle was saved, False if it cannot be written.
+        """
+        return self.put_many([compiled_pattern], flags)
+
+    def add(self, compiled_pattern: Pattern[str], flags: int = re.MULTILINE):
+        """Adds the compiled pattern to the cache without saving the bundle, it is
+        saved by the next :meth:`~.PatternCache.flush` or save of the bundle.
+
+        Parameters
+        ----------
+        compiled_pattern : :class:`regex.Pattern`
+            Compiled pattern.
+        flags : int, optional
+            Flags the pattern was compiled with, by default :data:`regex.MULTILINE`
+        """
+        with self._lock:
+            self._pending[
+                pattern_key(compiled_pattern.pattern, flags)
+            ] = compiled_pattern
+
+    def flush(self) -> bool:
+        """Saves the patterns added with :meth:`~.PatternCache.add`.
+
+        Returns
+        -------
+        bool
+            True if the bundle was saved or there was nothing to save, False if it
+            cannot be written.
+        """
+        with self._lock:
+            if not self._pending:
+                return True
+            return self._save()
+
+    def put_many(
+        self,
+        compiled_patterns: Iterable[Pattern[str]],
+        flags: int = re.MULTILINE,
+        replace: bool = False,
+    ) -> bool:
+        """Adds the compiled patterns to the cache and saves the bundle once.
+
+        Parameters
+        ----------
+        compiled_patterns : Iterable[:class:`regex.Pattern`]
+            Compiled patterns.
+        flags : int, optional
+            Flags the patterns were compiled with, by default :data:`regex.MULTILINE`
+        replace : bool, optional
+            Remove the compiled patterns saved in the bundle, named pattern sources
+            are kept, by default False
+
+        Returns
+        -------
+        bool
+            True if the bundle was saved, False if it cannot be written.
+        """
+        blobs = {
+            pattern_key(compiled.pattern, flags): pickle.dumps(compiled)
+            for compiled in compiled_patterns
+        }
+        return self._save(new_blobs=blobs, keep_patterns=not replace)
+
+    def get_source(self, name: str) -> str | None:
+        """Returns the pattern stored under ``name``, None if there is none.
+
+        Named patterns are patterns that cannot be built from code, such as the
+        pattern of :data:`~.RULE_NAME`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the pattern.
+
+        Returns
+        -------
+        Optional[str]
+            Pattern.
+        """
+        with self._lock:
+            self._load()
+            source = self._sources.get(name)
+        if source is None and self.fallback is not None:
+            return self.fallback.get_source(name)
+        return source
+
+    def put_source(self, name: str, pattern: str) -> bool:
+        """Stores ``pattern`` under ``name`` and saves the bundle.
+
+        Parameters
+        ----------
+        name : str
+            Name of the pattern.
+        pattern : str
+            Pattern to store.
+
+        Returns
+        -------
+        bool
+            True if the bundle was saved, False if it cannot be written.
+        """
+        return self._save(new_sources={name: pattern})
+
+    def clear_patterns(self) -> bool:
+        """Removes all compiled patterns from the bundle, named pattern sources are
+        kept.
+
+        Returns
+        -------
+        bool
+            True if the bundle was saved, False if it cannot be written.
+        """
+        return self._save(keep_patterns=False)
+
+    def reload(self):
+        """Discards the loaded index, the bundle is read again on next access."""
+        with self._lock:
+            self._close()
+            self._loaded = False
+
+    def keys(self) -> list[str]:
+        """Returns the keys of the cached patterns, including the keys of the
+        fallback cache."""
+        with self._lock:
+            self._load()
+            keys = list(self._entries)
+            keys += [key for key in self._pending if key not in self._entries]
+        if self.fallback is not None:
+            keys += [key for key in self.fallback.keys() if key not in keys]
+        return keys
+
+    def _save(
+        self,
+        new_blobs: dict[str, bytes] | None = None,
+        new_sources: dict[str, str] | None = None,
+        keep_patterns: bool = True,
+    ) -> bool:
+        with self._lock:
+            if self._read_only:
+                return False
+            try:
+                with _file_lock(self.path.with_name(self.path.name + ".lock")):
+                    pending = self._merge_and_write(
+                        new_blobs, new_sources, keep_patterns
+                    )
+            except OSError:
+                self._read_only = True
+                return False
+            for key in pending:
+                self._pending.pop(key, None)
+            return True
+
+    def _merge_and_write(
+        self,
+        new_blobs: dict[str, bytes] | None,
+        new_sources: dict[str, str] | None,
+        keep_patterns: bool,
+    ) -> list[str]:
+        # Another process may have saved the bundle since it was loaded
+        self.reload()
+        self._load()
+
+        # Patterns compiled with another version of the regex module are dropped
+        suffix = f"-{re.__version__}"
+        blobs = {
+            key: self._get_data(key)
+            for key in self._entries
+            if keep_patterns and key.endswith(suffix)
+        }
+        pending = dict(self._pending)
+        blobs.update((key, pickle.dumps(p)) for key, p in pending.items())
+        blobs.update(new_blobs or {})
+        sources = dict(self._sources, **(new_sources or {}))
+
+        self.reload()
+        self._write(blobs, sources)
+        return list(pending)
+
+    def _write(self, blobs: dict[str, bytes], sources: dict[str, str]):
+        entries = {}
+        offset = 0
+        for key, data in blobs.items():
+            entries[key] = [offset, len(data)]
+            offset += len(data)
+        index = json.dumps(
+            {"entries": entries, "sources": sources}, ensure_ascii=False
+        ).encode()
+
+        mode = self.path.stat().st_mode & 0o777 if self.path.exists() else 0o644
+        fd, temp_path = tempfile.mkstemp(
+            prefix=self.path.name, suffix=".tmp", dir=self.path.parent
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(index)))
+                f.write(index)
+                for data in blobs.values():
+                    f.write(data)
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _get_data(self, key: str) -> bytes:
+        with self._lock:
+            self._load()
+            position = self._entries.get(key)
+            if position is None:
+                return b""
+            start = self._offset + position[0]
+            return self._buffer[start : start + position[1]]
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        self._entries, self._sources = {}, {}
+        try:
+            with self.path.open("rb") as f:
+                try:
+                    buffer: mmap.mmap | bytes = mmap.mmap(
+                        f.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+                except (ValueError, OSError):
+                    # Empty files cannot be mapped
+                    buffer = f.read()
+        except OSError:
+            return
+
+        self._buffer = buffer
+        if len(buffer) < _HEADER.size:
+            return
+        magic, version, index_size = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return
+
+        index = json.loads(bytes(buffer[_HEADER.size : _HEADER.size + index_size]))
+        self._offset = _HEADER.size + index_size
+        self._entries = {key: tuple(pos) for key, pos in index["entries"].items()}
+        self._sources = index["sources"]
+
+    def _close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = b""
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._load()
+            if key in self._entries or key in self._pending:
+                return True
+        return self.fallback is not None and key in self.fallback
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Holds an exclusive lock on ``path`` between processes, creating it if
+    missing."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _package_cache() -> PatternCache:
+    return PatternCache(PACKAGE_CACHE_DIR / BUNDLE_NAME)
+
+
+def get_cache_dir() -> Path:
+    """Returns the directory of :data:`~.PATTERN_CACHE`.
+
+    Returns
+    -------
+    :class:`~pathlib.Path`
+        Cache directory.
+    """
+    return PATTERN_CACHE.path.parent
+
+
+def set_cache_dir(path: str | Path | None):
+    """Sets the directory of :data:`~.PATTERN_CACHE`, the directory can also be set
+    with the environment variable ``MAHA_CACHE_DIR``.
+
+    Compiled patterns are written to the bundle in the given directory. The bundle
+    shipped with the package is still used for patterns that are not found there.
+
+    Parameters
+    ----------
+    path : Union[str, :class:`~pathlib.Path`, None]
+        Cache directory, None to use the directory of the package.
+
+    Example
+    -------
+
+    .. code:: pycon
+
+        >>> from maha.rexy import get_cache_dir, set_cache_dir
+        >>> set_cache_dir("/tmp/maha")
+        >>> get_cache_dir().name
+        'maha'
+        >>> set_cache_dir(None)
+    """
+    with PATTERN_CACHE._lock:
+        # Patterns that cannot be saved in the previous directory are dropped
+        PATTERN_CACHE.flush()
+        PATTERN_CACHE._pending.clear()
+        PATTERN_CACHE._read_only = False
+        PATTERN_CACHE.reload()
+        if path is None:
+            PATTERN_CACHE.path = PACKAGE_CACHE_DIR / BUNDLE_NAME
+            PATTERN_CACHE.fallback = None
+        else:
+            PATTERN_CACHE.path = Path(path) / BUNDLE_NAME
+            PATTERN_CACHE.fallback = _package_cache()
+
+
+PATTERN_CACHE = _package_cache()
+""" Cache used by :meth:`~.Expression.compile` for pickled expressions """
+atexit.register(PATTERN_CACHE.flush)
+if os.environ.get(CACHE_DIR_ENV):
+    set_cache_dir(os.environ[CACHE_DIR_ENV])
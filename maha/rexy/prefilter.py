@@ -0,0 +1,362 @@
+""" Prefilters that tell when a pattern cannot match a text without running it """
+from __future__ import annotations
+
+__all__ = ["derive_prefilter", "passes_prefilter", "Prefilter", "derive_anchors"]
+
+
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+import regex as re
+
+try:
+    from re import _constants as sre_constants  # type: ignore
+    from re import _parser as sre_parse  # type: ignore
+except ImportError:  # Python < 3.11
+    import sre_constants  # type: ignore
+    import sre_parse  # type: ignore
+
+Prefilter = Tuple[Tuple[str, ...], ...]
+""" Strings required by a pattern. The text must contain at least one string of
+each tuple, e.g. ``(("@",), (".",))`` requires both ``@`` and ``.`` """
+
+MAX_PATTERN_LENGTH = 50000
+""" Longer patterns are not analysed, parsing them costs more than the prefilter
+saves """
+MAX_CHARACTERS = 12
+""" Maximum number of alternative characters of a requirement """
+MAX_REQUIREMENTS = 8
+""" Maximum number of requirements to check """
+
+_GLOBAL_FLAGS = re.compile(r"\s*(\(\?[a-zA-Z]+\))")
+_NAMED_GROUP = re.compile(r"(?<!\\)\(\?P?<(?![=!])\w+>")
+# Patterns that the standard library parses differently than the regex module or
+# may parse without error in some versions: backreferences, conditionals, POSIX
+# classes, fuzzy constraints and braces that are not repeats, property, name and
+# grapheme escapes, word boundaries, branch resets, atomic groups, recursion and
+# possessive repeats.
+_UNSUPPORTED = re.compile(
+    r"\(\?P=|\\g<|\\[1-9]|\(\?\(|\[:"
+    r"|(?<!\\)(?:\\\\)*\{(?!\d*,?\d*\})"
+    r"|\\[pPNXmMLKG]"
+    r"|\(\?[|>&R0-9+]"
+    r"|[*+?}]\+"
+)
+_REPEATS = tuple(
+    getattr(sre_constants, name)
+    for name in ["MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"]
+    if hasattr(sre_constants, name)
+)
+_ATOMIC_GROUP = getattr(sre_constants, "ATOMIC_GROUP", None)
+_IGNORECASE = sre_constants.SRE_FLAG_IGNORECASE
+_DIGIT = r"\d"
+# Limits of the anchor analysis, larger sets of strings are not tracked exactly
+_MAX_STRINGS = 64
+_MAX_SET_CHARACTERS = 32
+
+
+@lru_cache(maxsize=1024)
+def derive_prefilter(pattern: str) -> Prefilter:
+    """Returns the characters that any match of ``pattern`` must contain.
+
+    Only literal characters and small character sets that every match consumes are
+    considered, e.g. ``#`` for :data:`~.EXPRESSION_HASHTAGS` and ``@`` and ``.`` for
+    :data:`~.EXPRESSION_EMAILS`. Lookarounds are ignored and cased characters are
+    ignored when the pattern is case-insensitive. Patterns that cannot be analysed
+    have no prefilter.
+
+    Parameters
+    ----------
+    pattern : str
+        Regular expression pattern.
+
+    Returns
+    -------
+    :data:`~.Prefilter`
+        Required characters, empty if there are none.
+
+    Example
+    -------
+
+    .. code:: pycon
+
+        >>> from maha.rexy import derive_prefilter
+        >>> derive_prefilter(r"\\w+@\\w+\\.com")
+        (('.',), ('@',), ('c',), ('m',), ('o',))
+        >>> derive_prefilter(r"\\d+")
+        ()
+    """
+    if len(pattern) > MAX_PATTERN_LENGTH or _UNSUPPORTED.search(pattern):
+        return ()
+
+    # The regex module applies global flags anywhere in the pattern and allows
+    # duplicate group names, the standard library does not.
+    match = _GLOBAL_FLAGS.match(pattern)
+    if match:
+        pattern = match.group(1) + pattern[: match.start(1)] + pattern[match.end() :]
+    pattern = _NAMED_GROUP.sub("(?:", pattern)
+
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return ()
+
+    ignorecase = bool(parsed.state.flags & _IGNORECASE)
+    requirements = set(_get_requirements(list(parsed), ignorecase))
+    # Requirements implied by smaller ones are redundant
+    requirements = {r for r in requirements if not any(o < r for o in requirements)}
+    ordered = sorted(requirements, key=lambda r: (len(r), min(r)))
+    return tuple(tuple(sorted(r)) for r in ordered[:MAX_REQUIREMENTS])
+
+
+def passes_prefilter(text: str, prefilter: Prefilter) -> bool:
+    """Returns False if ``text`` lacks every string of any tuple of ``prefilter``,
+    in which case the pattern of the prefilter cannot match the text.
+
+    Parameters
+    ----------
+    text : str
+        Text to check.
+    prefilter : :data:`~.Prefilter`
+        Required strings.
+
+    Returns
+    -------
+    bool
+        True if the pattern may match the text.
+    """
+    for strings in prefilter:
+        for string in strings:
+            if string in text:
+                break
+        else:
+            return False
+    return True
+
+
+def _get_requirements(items: list, ignorecase: bool) -> list[frozenset[str]]:
+    output = []
+    for op, av in items:
+        output.extend(_get_node_requirements(op, av, ignorecase))
+    return output
+
+
+def _get_node_requirements(op, av, ignorecase: bool) -> list[frozenset[str]]:
+    if op is sre_constants.LITERAL:
+        char = _get_char(av, ignorecase)
+        return [frozenset(char)] if char else []
+
+    if op is sre_constants.IN:
+        chars = set()
+        for item_op, item_av in av:
+            if item_op is sre_constants.LITERAL:
+                codes = [item_av]
+            elif item_op is sre_constants.RANGE and item_av[1] - item_av[0] < 16:
+                codes = list(range(item_av[0], item_av[1] + 1))
+            else:
+                return []
+            for code in codes:
+                char = _get_char(code, ignorecase)
+                if not char:
+                    return []
+                chars.add(char)
+        return [frozenset(chars)] if 0 < len(chars) <= MAX_CHARACTERS else []
+
+    if op in _REPEATS:
+        minimum, _, sub_pattern = av
+        return _get_requirements(sub_pattern, ignorecase) if minimum >= 1 else []
+
+    if op is sre_constants.SUBPATTERN:
+        _, add_flags, del_flags, sub_pattern = av
+        ignorecase = (ignorecase or bool(add_flags & _IGNORECASE)) and not (
+            del_flags & _IGNORECASE
+        )
+        return _get_requirements(sub_pattern, ignorecase)
+
+    if op is _ATOMIC_GROUP:
+        return _get_requirements(av, ignorecase)
+
+    if op is sre_constants.BRANCH:
+        branches = [_get_requirements(branch, ignorecase) for branch in av[1]]
+        if not all(branches):
+            return []
+        # Requirements of all branches, and one requirement of each branch
+        output = list(set(branches[0]).intersection(*branches[1:]))
+        any_chars = frozenset().union(*(min(b, key=len) for b in branches))
+        if len(any_chars) <= MAX_CHARACTERS and any_chars not in output:
+            output.append(any_chars)
+        return output
+
+    # Lookarounds, anchors, categories and any character
+    return []
+
+
+def _get_char(code: int, ignorecase: bool) -> str:
+    char = chr(code)
+    if ignorecase and (char.lower() != char or char.upper() != char):
+        return ""
+    return char
+
+
+@lru_cache(maxsize=64)
+def derive_anchors(pattern: str) -> tuple[str, ...]:
+    """Returns anchors of ``pattern``, patterns of which at least one matches inside
+    any match of ``pattern``.
+
+    Unlike :func:`~.derive_prefilter`, anchors are whole strings such as unit words,
+    month names and numerals, so a text that contains none of them is skipped by a
+    single search of the anchors. Anchors are escaped strings or ``\\d``. Analysing
+    large patterns is slow, so the anchors of large rules should be cached.
+
+    Parameters
+    ----------
+    pattern : str
+        Regular expression pattern.
+
+    Returns
+    -------
+    Tuple[str, ...]
+        Sorted anchors, empty if ``pattern`` may match without any of them, e.g. it
+        matches the empty string, or cannot be analysed.
+
+    Example
+    -------
+
+    .. code:: pycon
+
+        >>> from maha.rexy import derive_anchors
+        >>> derive_anchors(r"(?:\\d+|ثلاث)(?:ساعات|دقائق)")
+        ('دقائق', 'ساعات')
+        >>> derive_anchors(r"\\d+ ?(?:km|m)?")
+        ('\\\\d',)
+    """
+    if _UNSUPPORTED.search(pattern):
+        return ()
+
+    match = _GLOBAL_FLAGS.match(pattern)
+    if match:
+        pattern = match.group(1) + pattern[: match.start(1)] + pattern[match.end() :]
+    pattern = _NAMED_GROUP.sub("(?:", pattern)
+
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return ()
+    if parsed.state.flags & _IGNORECASE:
+        return ()
+
+    anchors = _get_sequence_anchors(list(parsed)).any_of()
+    return tuple(sorted(anchors)) if anchors else ()
+
+
+class _Anchors(NamedTuple):
+    """Strings that a part of a pattern matches exactly, or anchors of which it
+    matches at least one, None if unknown."""
+
+    exact: frozenset[str] | None = None
+    anchors: frozenset[str] | None = None
+
+    def any_of(self) -> frozenset[str] | None:
+        if self.exact is not None:
+            if "" in self.exact:
+                return None
+            # Strings that contain another string are redundant
+            return frozenset(
+                re.escape(string)
+                for string in self.exact
+                if not any(other != string and other in string for other in self.exact)
+            )
+        return self.anchors
+
+
+def _get_sequence_anchors(items: list) -> _Anchors:
+    # Consecutive exact parts are concatenated while there are few strings, every
+    # run of them and every other part gives candidate anchors, the most selective
+    # candidate wins.
+    nodes = []
+    strings = {""}
+    exact = True
+    for op, av in items:
+        node = _get_node_anchors(op, av)
+        if node.exact is not None and len(strings) * len(node.exact) <= _MAX_STRINGS:
+            strings = {a + b for a in strings for b in node.exact}
+            continue
+        exact = False
+        nodes.extend([_Anchors(frozenset(strings)), node])
+        strings = set(node.exact) if node.exact is not None else {""}
+
+    if exact:
+        return _Anchors(exact=frozenset(strings))
+    nodes.append(_Anchors(frozenset(strings)))
+    candidates = [c for c in map(_Anchors.any_of, nodes) if c]
+    if not candidates:
+        return _Anchors()
+    best = max(candidates, key=lambda c: (min(map(len, c)), -len(c)))
+    return _Anchors(anchors=best)
+
+
+def _get_node_anchors(op, av) -> _Anchors:
+    if op is sre_constants.LITERAL:
+        return _Anchors(exact=frozenset(chr(av)))
+
+    if op is sre_constants.IN:
+        chars: set[str] = set()
+        digits = False
+        for item_op, item_av in av:
+            if item_op is sre_constants.LITERAL:
+                chars.add(chr(item_av))
+            elif (
+                item_op is sre_constants.RANGE
+                and item_av[1] - item_av[0] < _MAX_SET_CHARACTERS
+            ):
+                chars.update(map(chr, range(item_av[0], item_av[1] + 1)))
+            elif (
+                item_op is sre_constants.CATEGORY
+                and item_av is sre_constants.CATEGORY_DIGIT
+            ):
+                digits = True
+            else:
+                return _Anchors()
+        if len(chars) > _MAX_SET_CHARACTERS:
+            return _Anchors()
+        if digits:
+            return _Anchors(anchors=frozenset(map(re.escape, chars)) | {_DIGIT})
+        return _Anchors(exact=frozenset(chars))
+
+    if op in _REPEATS:
+        minimum, maximum, sub_pattern = av
+        node = _get_sequence_anchors(sub_pattern)
+        if minimum == maximum == 1:
+            return node
+        if minimum == 0:
+            if maximum == 1 and node.exact is not None:
+                return _Anchors(exact=node.exact | {""})
+            return _Anchors()
+        return _Anchors(anchors=node.any_of())
+
+    if op is sre_constants.SUBPATTERN:
+        _, add_flags, _, sub_pattern = av
+        if add_flags & _IGNORECASE:
+            return _Anchors()
+        return _get_sequence_anchors(sub_pattern)
+
+    if op is _ATOMIC_GROUP:
+        return _get_sequence_anchors(av)
+
+    if op is sre_constants.BRANCH:
+        branches = [_get_sequence_anchors(branch) for branch in av[1]]
+        if all(b.exact is not None for b in branches):
+            strings = frozenset().union(*(b.exact for b in branches))  # type: ignore
+            if len(strings) <= _MAX_STRINGS:
+                return _Anchors(exact=strings)
+        anchors = [b.any_of() for b in branches]
+        if not all(anchors):
+            return _Anchors()
+        return _Anchors(anchors=frozenset().union(*anchors))  # type: ignore
+
+    # Lookarounds and anchors match the empty string
+    if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return _Anchors(exact=frozenset([""]))
+
+    # Categories and any character
+    return _Anchors()
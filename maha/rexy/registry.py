@@ -0,0 +1,137 @@
+""" Process-wide registry of compiled regular expression patterns """
+from __future__ import annotations
+
+__all__ = ["PatternRegistry", "RegistryInfo", "PATTERN_REGISTRY"]
+
+
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import regex as re
+from regex import Pattern
+
+
+class RegistryInfo(NamedTuple):
+    """Statistics of a :class:`~.PatternRegistry`"""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class PatternRegistry:
+    """Bounded, thread-safe LRU registry of compiled patterns keyed by
+    ``(pattern, flags)``.
+
+    Cleaners create a new :class:`~.Expression` from a string on every call, the
+    registry makes sure the same string is compiled only once per process.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of compiled patterns to keep, by default 1024
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._check_maxsize(maxsize)
+        self._maxsize = maxsize
+        self._patterns: OrderedDict[tuple[str, int], Pattern[str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum number of compiled patterns to keep"""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int):
+        self._check_maxsize(value)
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def get(self, pattern: str, flags: int = re.MULTILINE) -> Pattern[str]:
+        """Returns the compiled ``pattern``, compiles it if it is not registered.
+
+        Parameters
+        ----------
+        pattern : str
+            Regular expression pattern.
+        flags : int, optional
+            Flags to compile the pattern with, by default :data:`regex.MULTILINE`
+
+        Returns
+        -------
+        :class:`regex.Pattern`
+            Compiled pattern.
+        """
+        key = (pattern, flags)
+        with self._lock:
+            compiled = self._patterns.get(key)
+            if compiled is not None:
+                self._patterns.move_to_end(key)
+                self._hits += 1
+                return compiled
+            self._misses += 1
+
+        # Compile outside the lock, large patterns can take a long time to compile.
+        compiled = re.compile(pattern, flags)
+
+        with self._lock:
+            self._patterns[key] = compiled
+            self._patterns.move_to_end(key)
+            self._evict()
+        return compiled
+
+    def info(self) -> RegistryInfo:
+        """Returns hits, misses, evictions, maximum size and current size of the
+        registry.
+
+        Returns
+        -------
+        :class:`~.RegistryInfo`
+            Registry statistics.
+        """
+        with self._lock:
+            return RegistryInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._maxsize,
+                len(self._patterns),
+            )
+
+    def clear(self):
+        """Removes all compiled patterns and resets the statistics."""
+        with self._lock:
+            self._patterns.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def _evict(self):
+        while len(self._patterns) > self._maxsize:
+            self._patterns.popitem(last=False)
+            self._evictions += 1
+
+    @staticmethod
+    def _check_maxsize(value: int):
+        if not isinstance(value, int) or value < 0:
+            raise ValueError("'maxsize' should be a non-negative integer")
+
+    def __contains__(self, key: tuple[str, int]) -> bool:
+        with self._lock:
+            return key in self._patterns
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+
+PATTERN_REGISTRY = PatternRegistry()
+""" Registry used by :meth:`~.Expression.compile` for non-pickled expressions """
@@ -1,3 +1,4 @@
 from .expression import Expression
 from .expression_group import ExpressionGroup
 from .expression_result import ExpressionResult
+from .string_set import StringSet, trie_pattern
@@ -4,20 +4,17 @@ __all__ = ["Expression"]
 
 
 import hashlib
-import pickle
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Iterator
 
 import regex as re
 from regex import Match, Pattern
 
-from maha import LIBRARY_PATH
-
+from ..pattern_cache import PATTERN_CACHE
+from ..prefilter import Prefilter, derive_prefilter, passes_prefilter
+from ..registry import PATTERN_REGISTRY
 from .expression_result import ExpressionResult
 
-CACHE_PATH = Path(LIBRARY_PATH) / "rexy" / "cache"
-
 
 @dataclass
 class Expression:
@@ -30,9 +27,15 @@ class Expression:
     pickle : bool
         If ``True``, the compiled pattern will be pickled. This is useful to save
         compilation time for large patterns.
+    prefilter : Union[Iterable[str], bool]
+        Strings of which at least one must be in the text for the pattern to match.
+        :meth:`search`, :meth:`finditer`, :meth:`sub` and :meth:`parse` skip the
+        pattern for texts that contain none of them. If ``True``, the required
+        characters are derived from the pattern, see :func:`~.derive_prefilter`. If
+        ``False``, there is no prefilter. By default True
     """
 
-    __slots__ = ["pattern", "_compiled_pattern", "pickle"]
+    __slots__ = ["pattern", "_compiled_pattern", "pickle", "_prefilter"]
 
     pattern: str
     """Regular expersion(s) to match"""
@@ -41,75 +44,101 @@ class Expression:
         self,
         pattern: str,
         pickle: bool = False,
+        prefilter: Iterable[str] | bool = True,
     ):
         self.pattern = str(pattern)
         self.pickle = pickle
         self._compiled_pattern: Pattern[str] = None  # type: ignore
+        self._prefilter: Prefilter | None = None
+        if prefilter is False:
+            self._prefilter = ()
+        elif prefilter is not True:
+            self._prefilter = (tuple(prefilter),)  # type: ignore
+
+    @property
+    def prefilter(self) -> Prefilter:
+        """Strings required by the pattern, see :data:`~.Prefilter`."""
+        if self._prefilter is None:
+            self._prefilter = derive_prefilter(self.pattern)
+        return self._prefilter
 
     def compile(self):
-        """Compile the regular expersion."""
+        """Compile the regular expersion.
+
+        Non-pickled patterns are compiled once per process and shared through
+        :data:`~.PATTERN_REGISTRY`. Pickled patterns are loaded from
+        :data:`~.PATTERN_CACHE`, and compiled and added to it if missing, see
+        :meth:`~.PatternCache.add`.
+        """
         if self._compiled_pattern is None:
             if self.pickle:
                 self._load_compiled_pattern()
             else:
-                self._compiled_pattern = re.compile(self.pattern, re.MULTILINE)
+                self._compiled_pattern = PATTERN_REGISTRY.get(
+                    self.pattern, re.MULTILINE
+                )
 
     def _load_compiled_pattern(self):
-        # crp: compiled regex pattern
-        path = CACHE_PATH / f"{hash(self)}.crp"
-        if path.exists():
-            with path.open("rb") as f:
-                self._compiled_pattern = pickle.load(f)
-        else:
-            self._compiled_pattern = re.compile(self.pattern, re.MULTILINE)
-            with path.open("wb") as f:
-                pickle.dump(self._compiled_pattern, f)
+        compiled_pattern = PATTERN_CACHE.get(self.pattern, re.MULTILINE)
+        if compiled_pattern is None:
+            compiled_pattern = re.compile(self.pattern, re.MULTILINE)
+            PATTERN_CACHE.add(compiled_pattern, re.MULTILINE)
+        self._compiled_pattern = compiled_pattern
 
     @classmethod
     def from_cache(cls, cache: str) -> Expression:
-        """Load an expression from cache.
+        """Load a named expression from the cache, see
+        :meth:`~.PatternCache.get_source`.
 
         Parameters
         ----------
         cache : str
-            Name of the cache file.
+            Name of the cached pattern.
 
         Returns
         -------
         :class:`~.Expression`
-            Expression.
+            Pickled expression.
+
+        Raises
+        ------
+        ValueError
+            If there is no pattern with the given name.
         """
-        try:
-            expression = cls("names")
-            with open(CACHE_PATH / f"{cache}.crp", "rb") as f:
-                expression._compiled_pattern = pickle.load(f)
-            return expression
-        except FileNotFoundError:
-            raise ValueError(f"Cache file {cache} not found")
-
-    def search(self, text: str):
+        pattern = PATTERN_CACHE.get_source(cache)
+        if pattern is None:
+            raise ValueError(f"Cache {cache} not found")
+        return cls(pattern, pickle=True)
+
+    def search(self, text: str, pos: int = 0):
         """Search for the pattern in the input ``text``.
 
         Parameters
         ----------
         text : str
             Text to search in.
+        pos : int, optional
+            Index in ``text`` where the search starts, by default 0
 
         Returns
         -------
         :class:`regex.Match`
             Matched object.
         """
+        if not passes_prefilter(text, self.prefilter):
+            return None
         self.compile()
-        return self._compiled_pattern.search(text)
+        return self._compiled_pattern.search(text, pos)
 
-    def match(self, text: str) -> Match[str] | None:
+    def match(self, text: str, pos: int = 0) -> Match[str] | None:
         """Match the pattern in the input ``text``.
 
         Parameters
         ----------
         text : str
             Text to match in.
+        pos : int, optional
+            Index in ``text`` where the match starts, by default 0
 
         Returns
         -------
@@ -117,7 +146,7 @@ class Expression:
             Matched object.
         """
         self.compile()
-        return self._compiled_pattern.match(text)
+        return self._compiled_pattern.match(text, pos)
 
     def fullmatch(self, text: str) -> Match[str] | None:
         """Match the pattern in the input ``text``.
@@ -135,6 +164,27 @@ class Expression:
         self.compile()
         return self._compiled_pattern.fullmatch(text)
 
+    def finditer(self, text: str, pos: int = 0) -> Iterator[Match[str]]:
+        """Find all non-overlapping matches of the pattern in the input ``text``.
+
+        Parameters
+        ----------
+        text : str
+            Text to search in.
+        pos : int, optional
+            Index in ``text`` where the search starts, by default 0. Unlike slicing
+            the text, lookbehinds and anchors still see the text before ``pos``.
+
+        Yields
+        -------
+        :class:`Match[str]`
+            Matched object.
+        """
+        if not passes_prefilter(text, self.prefilter):
+            return iter(())
+        self.compile()
+        return self._compiled_pattern.finditer(text, pos)
+
     def sub(self, repl: Callable[..., str] | str, text: str) -> str:
         """Replace all occurrences of the pattern in the input ``text``.
 
@@ -150,6 +200,8 @@ class Expression:
         str
             Text with replaced occurrences.
         """
+        if not passes_prefilter(text, self.prefilter):
+            return text
         self.compile()
         return self._compiled_pattern.sub(repl, text)
 
@@ -183,9 +235,11 @@ class Expression:
         :class:`~.ExpressionResult`
             Extracted value.
         """
+        if not passes_prefilter(text, self.prefilter):
+            return
         self.compile()
 
-        for m in re.finditer(self._compiled_pattern, text):
+        for m in self._compiled_pattern.finditer(text):
             yield self._parse(m, text)
 
     def _parse(self, match: Match[str], _: str) -> ExpressionResult:
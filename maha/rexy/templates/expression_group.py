@@ -3,8 +3,11 @@ from __future__ import annotations
 __all__ = ["ExpressionGroup"]
 
 
+from bisect import bisect_left, bisect_right
 from typing import Iterable, overload
 
+import regex as re
+
 import maha.rexy as rx
 
 
@@ -18,19 +21,25 @@ class ExpressionGroup:
         List of expressions to match. High-priority expressions should be passed first.
     smart : bool, optional
         Whether to parse the text in a smart way. See :meth:`~.smart_parse`.
+    combined : bool, optional
+        Whether to parse the text in a single scan of all expressions. See
+        :meth:`~.combined_parse`. Takes precedence over ``smart``.
     """
 
-    __slots__ = ["expressions", "smart", "_parsed_ranges"]
+    __slots__ = ["expressions", "smart", "combined", "_index", "_alternation"]
 
     def __init__(
         self,
         *expressions: rx.Expression | ExpressionGroup,
         smart: bool = False,
+        combined: bool = False,
     ):
 
         self.expressions = self._merge_expressions(expressions)
-        self._parsed_ranges: set[tuple[int, int]] = set()
+        self._index: _MatchIndex | None = None
+        self._alternation: tuple[int, _Alternation | None] | None = None
         self.smart = smart
+        self.combined = combined
 
     def compile_expressions(self):
         for expression in self.expressions:
@@ -56,6 +65,8 @@ class ExpressionGroup:
             Expressions to add.
         """
         self.expressions.extend(expression)
+        self._index = None
+        self._alternation = None
 
     def join(self) -> str:
         """Returns non capturing group of the expressions.
@@ -68,7 +79,11 @@ class ExpressionGroup:
         return rx.non_capturing_group(*list(map(str, self.expressions)))
 
     def get_matched_expression(self, text: str) -> rx.Expression | None:
-        """Returns the expression that fully matches the text.
+        """Returns the first expression that fully matches the text.
+
+        The expressions are indexed on first use, literal patterns are looked up in
+        a dictionary and the other patterns are combined into one pattern, so the
+        text is matched once instead of once per expression.
 
         Parameters
         ----------
@@ -80,10 +95,10 @@ class ExpressionGroup:
         :class:`~.Expression`
             Expression that fully matches the text.
         """
-        for expression in self.expressions:
-            if expression.fullmatch(text):
-                return expression
-        return None
+        index = self._index
+        if index is None or index.size != len(self.expressions):
+            index = self._index = _MatchIndex(self.expressions)
+        return index.get(text)
 
     def parse(self, text: str) -> Iterable[rx.ExpressionResult]:
         """
@@ -101,13 +116,13 @@ class ExpressionGroup:
         """
         # TODO: Maybe provide a way to clean the text before parsing?
         # (e.g. remove harakat)
-        if self.smart:
+        if self.combined:
+            yield from self.combined_parse(text)
+        elif self.smart:
             yield from self.smart_parse(text)
         else:
             yield from self.normal_parse(text)
 
-        self._clear_parsed()
-
     def normal_parse(self, text: str) -> Iterable[rx.ExpressionResult]:
         """Parse the input ``text`` and return the extracted values.
 
@@ -130,6 +145,10 @@ class ExpressionGroup:
         expression parses the value, no value is matched more than once. This means
         high-priority expressions should be added to the group first.
 
+        The parsed values are tracked per call, so the group can be used by several
+        threads or generators at the same time. Checking whether a value is already
+        parsed takes logarithmic time in the number of parsed values.
+
         Parameters
         ----------
         text : str
@@ -141,24 +160,65 @@ class ExpressionGroup:
             Extracted value.
         """
 
-        for result in self.normal_parse(text):
-            if self._is_parsed(result):
-                continue
-            self._parsed_ranges.add((result.start, result.end))
-            yield result
+        parsed_ranges = _RangeSet()
+        for expression in self.expressions:
+            # Values of one expression are mostly in order, so adding them to a
+            # separate set and merging it afterwards avoids inserting in the middle
+            new_ranges = _RangeSet()
+            for result in expression.parse(text):
+                if parsed_ranges.covers(result.start, result.end) or new_ranges.covers(
+                    result.start, result.end
+                ):
+                    continue
+                new_ranges.add(result.start, result.end)
+                yield result
+            parsed_ranges.update(new_ranges)
+
+    def combined_parse(self, text: str) -> Iterable[rx.ExpressionResult]:
+        """
+        Parses the text in a single scan. The expressions are combined into one
+        pattern, each match is parsed by the expression that matched it. Matched
+        values do not overlap; at each position, the first expression that matches
+        wins, so high-priority expressions should be added to the group first.
 
-    def _is_parsed(self, result: rx.ExpressionResult):
-        for start, end in self._parsed_ranges:
-            if start <= result.start <= end and start <= result.end <= end:
-                return True
+        Unlike :meth:`~.smart_parse`, a value that partially overlaps an earlier
+        value is not matched. If an expression cannot be combined with others, e.g.
+        it refers to a group by number, :meth:`~.smart_parse` is used instead.
 
-        return False
+        Parameters
+        ----------
+        text : str
+            Text to parse.
 
-    def _clear_parsed(self):
-        self._parsed_ranges = set()
+        Yields
+        -------
+        :class:`~.ExpressionResult`
+            Extracted value.
+        """
+        alternation = self._get_alternation()
+        if alternation is None:
+            yield from self.smart_parse(text)
+            return
+
+        for match in alternation.expression.finditer(text):
+            expression = self.expressions[alternation.branch(match)]
+            # Match again with the expression itself to get its own groups
+            own_match = expression.match(text, match.start()) or match
+            yield expression._parse(own_match, text)
+
+    def _get_alternation(self) -> _Alternation | None:
+        cached = self._alternation
+        if cached is None or cached[0] != len(self.expressions):
+            alternation = None
+            if not any(_NOT_COMBINABLE.search(e.pattern) for e in self.expressions):
+                alternation = _Alternation(self.expressions, range(len(self)))
+            cached = self._alternation = (len(self.expressions), alternation)
+        return cached[1]
 
     def __add__(self, other: ExpressionGroup) -> ExpressionGroup:
         self.expressions.extend(other.expressions)
+        self._index = None
+        self._alternation = None
         return self
 
     def __iter__(self):
@@ -180,3 +240,141 @@ class ExpressionGroup:
 
     def __len__(self) -> int:
         return len(self.expressions)
+
+
+class _RangeSet:
+    """Set of ``(start, end)`` ranges that answers whether a range is contained in
+    any range of the set.
+
+    Only ranges that are not contained in another range are kept. Sorted by start,
+    their ends are strictly increasing, so the range with the largest start that is
+    not after a given start also has the largest end among all such ranges.
+    """
+
+    __slots__ = ["starts", "ends"]
+
+    def __init__(self):
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+
+    def covers(self, start: int, end: int) -> bool:
+        index = bisect_right(self.starts, start) - 1
+        return index >= 0 and end <= self.ends[index]
+
+    def add(self, start: int, end: int):
+        if self.covers(start, end):
+            return
+        # Ranges after the insertion point that the new range contains are removed
+        first = last = bisect_left(self.starts, start)
+        while last < len(self.ends) and self.ends[last] <= end:
+            last += 1
+        self.starts[first:last] = [start]
+        self.ends[first:last] = [end]
+
+    def update(self, other: _RangeSet):
+        ranges = sorted(
+            zip(self.starts + other.starts, self.ends + other.ends),
+            key=lambda r: (r[0], -r[1]),
+        )
+        self.starts, self.ends = [], []
+        for start, end in ranges:
+            if not self.ends or end > self.ends[-1]:
+                self.starts.append(start)
+                self.ends.append(end)
+
+
+_LITERAL = re.compile(r"[^\\.^$*+?{}\[\]|()]*")
+_LITERAL_ALTERNATION = re.compile(r"\(\?:([^\\.^$*+?{}\[\]()]*)\)")
+_MARKER = "__index_"
+# Group references and global flags change meaning when the pattern is combined
+_NOT_COMBINABLE = re.compile(r"\\(?:[1-9]|g<)|\(\?(?:P[=>]|[(&|R0-9+-]|[a-zA-Z]+\))")
+
+
+class _Alternation:
+    """Alternation of the patterns of some expressions. Each branch ends with an
+    empty group that marks the expression of the branch."""
+
+    __slots__ = ["expression", "markers"]
+
+    def __init__(self, expressions: list[rx.Expression], indexes: Iterable[int]):
+        self.expression = rx.Expression(
+            "|".join(f"(?:{expressions[i].pattern}(?P<{_MARKER}{i}>))" for i in indexes)
+        )
+        # Maps the group number of each marker to the index of its expression
+        self.markers: dict[int, int] = {}
+
+    def branch(self, match) -> int:
+        """Returns the index of the expression that matched."""
+        if not self.markers:
+            self.markers = {
+                group: int(name[len(_MARKER) :])
+                for name, group in match.re.groupindex.items()
+                if name.startswith(_MARKER)
+            }
+        # Only the marker of the matched branch is set, it is usually the last group.
+        # lastgroup is not reliable when the branches reuse group names.
+        i = self.markers.get(match.lastindex)
+        if i is not None:
+            return i
+        for group, i in self.markers.items():
+            if match.start(group) >= 0:
+                return i
+        raise AssertionError("No branch matched")  # pragma: no cover
+
+
+class _MatchIndex:
+    """Index of the expressions of a group that finds the first expression that
+    fully matches a text."""
+
+    __slots__ = [
+        "size",
+        "expressions",
+        "literals",
+        "others",
+        "combined",
+        "first_branch",
+    ]
+
+    def __init__(self, expressions: list[rx.Expression]):
+        self.size = len(expressions)
+        self.expressions = list(expressions)
+        self.literals: dict[str, int] = {}
+        self.others: list[int] = []
+
+        branches = []
+        for i, expression in enumerate(expressions):
+            strings = self._literal_strings(expression.pattern)
+            if strings is not None:
+                for string in strings:
+                    self.literals.setdefault(string, i)
+            elif _NOT_COMBINABLE.search(expression.pattern):
+                self.others.append(i)
+            else:
+                branches.append(i)
+
+        self.combined = _Alternation(expressions, branches) if branches else None
+        self.first_branch = branches[0] if branches else self.size
+
+    def get(self, text: str) -> rx.Expression | None:
+        best = self.literals.get(text)
+        if self.combined is not None and (best is None or self.first_branch < best):
+            match = self.combined.expression.fullmatch(text)
+            if match:
+                i = self.combined.branch(match)
+                best = i if best is None else min(best, i)
+        for i in self.others:
+            if best is not None and i > best:
+                break
+            if self.expressions[i].fullmatch(text):
+                best = i
+                break
+        return None if best is None else self.expressions[best]
+
+    @staticmethod
+    def _literal_strings(pattern: str) -> list[str] | None:
+        if _LITERAL.fullmatch(pattern):
+            return [pattern]
+        match = _LITERAL_ALTERNATION.fullmatch(pattern)
+        if match:
+            return match.group(1).split("|")
+        return None
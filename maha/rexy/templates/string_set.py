@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+__all__ = ["StringSet", "trie_pattern"]
+
+
+from typing import Iterable, Iterator
+
+import regex as re
+from regex import Match
+
+from .expression import Expression
+from .expression_result import ExpressionResult
+
+_END = ""
+
+
+class StringSet(Expression):
+    """Expression that matches any string of a (possibly large) set of strings.
+
+    The strings are compiled once into a prefix-factored (trie) pattern, so the cost
+    of matching depends on the length of the matched string rather than the number of
+    strings. At each position, the longest string of the set is matched.
+
+    A :class:`~.StringSet` can be passed wherever cleaning functions accept
+    ``custom_strings`` or ``strings``.
+
+    Parameters
+    ----------
+    strings : Iterable[str]
+        Strings to match, empty strings are ignored.
+    pickle : bool
+        If ``True``, the compiled pattern will be pickled. This is useful to save
+        compilation time for large sets.
+
+    Example
+    -------
+
+    .. code:: pycon
+
+        >>> from maha.rexy import StringSet
+        >>> stopwords = StringSet(["في", "من", "منذ"])
+        >>> stopwords.pattern
+        '(?:في|منذ?)'
+        >>> "منذ" in stopwords
+        True
+    """
+
+    __slots__ = ["strings"]
+
+    strings: frozenset[str]
+    """Strings of the set"""
+
+    def __init__(self, strings: Iterable[str], pickle: bool = False):
+        if isinstance(strings, str):
+            strings = [strings]
+        self.strings = frozenset(s for s in strings if s)
+        if not self.strings:
+            raise ValueError("'strings' cannot be empty.")
+        super().__init__(trie_pattern(self.strings), pickle)
+
+    def _parse(self, match: Match[str], _: str) -> ExpressionResult:
+        return ExpressionResult(match.start(), match.end(), match.group(), self)
+
+    def __contains__(self, string: object) -> bool:
+        return string in self.strings
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.strings)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+def trie_pattern(strings: Iterable[str]) -> str:
+    """Returns a prefix-factored pattern that matches any of the input ``strings``.
+    Strings that share a prefix share a branch, and single characters at the leaves
+    are merged into character classes. The longest string is preferred.
+
+    Parameters
+    ----------
+    strings : Iterable[str]
+        Literal strings to match.
+
+    Returns
+    -------
+    str
+        Pattern that matches any of the input strings.
+    """
+    trie: dict = {}
+    for string in strings:
+        node = trie
+        for char in string:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+
+    return _node_pattern(trie) or ""
+
+
+def _node_pattern(node: dict) -> str | None:
+    """Returns the pattern of a trie node, None if the node has no children."""
+    alternatives = []
+    leaves = []
+    for char in sorted(key for key in node if key != _END):
+        child = _node_pattern(node[char])
+        if child is None:
+            leaves.append(re.escape(char))
+        else:
+            alternatives.append(re.escape(char) + child)
+
+    only_leaves = not alternatives
+    if len(leaves) == 1:
+        alternatives.append(leaves[0])
+    elif leaves:
+        alternatives.append("[{}]".format("".join(leaves)))
+
+    if not alternatives:
+        return None
+
+    if len(alternatives) == 1:
+        pattern = alternatives[0]
+    else:
+        pattern = "(?:{})".format("|".join(alternatives))
+
+    if _END in node:
+        # A single character (class) is already one token
+        if len(alternatives) == 1 and not only_leaves:
+            pattern = f"(?:{pattern})"
+        # Greedy, so the longer string is tried first
+        pattern += "?"
+
+    return pattern
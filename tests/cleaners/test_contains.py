@@ -9,7 +9,7 @@ from maha.cleaners.functions import (
 )
 from maha.constants import EMPTY
 from maha.expressions import EXPRESSION_EMAILS
-from maha.rexy import Expression, ExpressionGroup
+from maha.rexy import Expression, ExpressionGroup, StringSet
 from tests.utils import is_false, is_true
 
 
@@ -314,3 +314,9 @@ def test_contain_strings(simple_text_input: str):
 def test_contain_strings_raises_value_error(simple_text_input: str):
     with pytest.raises(ValueError):
         contain_strings(simple_text_input, EMPTY)
+
+
+def test_contain_strings_with_string_set(simple_text_input: str):
+    assert is_true(contain_strings(simple_text_input, StringSet(["Most", "J"])))
+    assert is_false(contain_strings(simple_text_input, StringSet(["most", "J"])))
+    assert is_true(contains(simple_text_input, custom_strings=StringSet(["Allah"])))
@@ -9,6 +9,7 @@ from maha.cleaners.functions import (
     keep_strings,
 )
 from maha.constants import ARABIC_LETTERS, ARABIC_NUMBERS, BEH, DOT, SPACE
+from maha.rexy import StringSet
 
 
 def test_keep_with_arabic(simple_text_input: str):
@@ -101,6 +102,15 @@ def test_keep_with_custom_strings(simple_text_input: str):
     assert keep(text=simple_text_input, custom_strings="Allah") == "Allah"
 
 
+def test_keep_with_custom_string_set(simple_text_input: str):
+    string_set = StringSet(["Allah", "Most"])
+    assert keep(text=simple_text_input, custom_strings=string_set) == "Allah Most Most"
+    assert (
+        keep(text=simple_text_input, custom_strings=string_set, arabic_letters=True)
+        == "بسم الله الرحمن الرحيم Allah Most Most"
+    )
+
+
 def test_keep_should_raise_valueerror(simple_text_input: str):
     with pytest.raises(ValueError):
         keep(simple_text_input)
@@ -70,6 +70,7 @@ from maha.constants import (
     ZAH,
     ZAIN,
 )
+from maha.rexy import StringSet
 from tests.utils import list_not_in_string
 
 
@@ -269,6 +270,16 @@ def test_remove_with_custom_characters_not_found(simple_text_input: str, strings
     assert processed_text == simple_text_input.strip()
 
 
+def test_remove_with_custom_string_set(simple_text_input: str):
+    processed_text = remove(
+        text=simple_text_input,
+        custom_strings=StringSet(["Most", "Mo", "Allah"]),
+        punctuations=True,
+    )
+    assert processed_text.endswith("In the name of Gracious Merciful")
+    assert list_not_in_string(["Mo", "st", "Allah"], processed_text)
+
+
 @pytest.mark.parametrize("pattern", ["[A-Za-z]"])
 def test_remove_with_custom_patterns(simple_text_input: str, pattern):
     processed_text = remove(text=simple_text_input, custom_expressions=pattern)
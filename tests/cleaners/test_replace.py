@@ -18,6 +18,7 @@ from maha.constants import (
     ENGLISH_NUMBERS,
     ENGLISH_SMALL_LETTERS,
 )
+from maha.rexy import StringSet
 from tests.utils import list_not_in_string, list_only_in_string
 
 
@@ -99,6 +100,17 @@ def test_replace_with_list(simple_text_input: str):
     assert "REPLACE" in processedtext
 
 
+def test_replace_with_string_set(simple_text_input: str):
+    processedtext = replace(simple_text_input, StringSet(["Mo", "Most"]), "REPLACE")
+    assert "REPLACEst" not in processedtext
+    assert processedtext.count("REPLACE") == 2
+
+
+def test_replace_except_with_string_set(simple_text_input: str):
+    processedtext = replace_except(simple_text_input, StringSet(["Most"]), EMPTY)
+    assert processedtext == "MostMost"
+
+
 def test_replace_except(simple_text_input: str):
     processedtext = replace_except(simple_text_input, "Mma", EMPTY)
     assert list_only_in_string(list("Mma"), processedtext)
@@ -0,0 +1,94 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import maha.parsers
+import maha.parsers.rules as rules
+
+IMPORT_SCRIPT = """
+import json, sys, tracemalloc
+
+tracemalloc.start()
+import maha.parsers
+if {load_rules}:
+    for name in ["RULE_DISTANCE", "RULE_DURATION", "RULE_NAME", "RULE_NUMERAL",
+                 "RULE_ORDINAL", "RULE_TIME"]:
+        getattr(maha.parsers.rules, name)
+memory = tracemalloc.get_traced_memory()[0]
+modules = [m for m in sys.modules if m.startswith("maha.parsers.rules.")]
+print(json.dumps({{"memory": memory, "modules": modules}}))
+"""
+
+
+def import_parsers(load_rules: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT.format(load_rules=load_rules)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(output.stdout)
+
+
+def test_import_parsers_does_not_load_rules():
+    lazy = import_parsers(load_rules=False)
+    eager = import_parsers(load_rules=True)
+
+    assert lazy["modules"] == ["maha.parsers.rules.common"]
+    assert "maha.parsers.rules.names" in eager["modules"]
+    # Loading all rules takes about 4x the memory
+    assert lazy["memory"] < eager["memory"]
+
+
+def test_import_time_excludes_rules():
+    # -X importtime lists every module imported by the statement
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import maha.parsers"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    imported = [
+        line.rsplit("|", 1)[-1].strip()
+        for line in output.stderr.splitlines()
+        if line.startswith("import time:")
+    ]
+
+    assert "maha.parsers" in imported
+    assert [m for m in imported if m.startswith("maha.parsers.rules.")] == [
+        "maha.parsers.rules.common"
+    ]
+
+
+def test_rules_are_loaded_on_access():
+    assert rules.RULE_NUMERAL is rules.numeral.RULE_NUMERAL
+    assert maha.parsers.RULE_TIME_YEARS is rules.time.RULE_TIME_YEARS
+    assert rules.parse_ordinal is rules.ordinal.parse_ordinal
+
+
+def test_star_import_loads_rules():
+    namespace: dict = {}
+    exec("from maha.parsers.rules import *", namespace)
+    assert namespace["RULE_TIME_YEARS"] is rules.time.RULE_TIME_YEARS
+    assert namespace["RULE_NAME"] is rules.names.RULE_NAME
+    assert namespace["parse_duration"] is rules.duration.parse_duration
+    assert namespace["wrap_pattern"] is rules.common.wrap_pattern
+    assert "compile_rules" in namespace
+    assert "_LAZY_MODULES" not in namespace
+
+    namespace = {}
+    exec("from maha.parsers import *", namespace)
+    assert namespace["RULE_NUMERAL"] is rules.numeral.RULE_NUMERAL
+
+
+def test_dir_lists_lazy_rules():
+    assert {"RULE_TIME", "parse_ordinal", "compile_rules"} <= set(dir(rules))
+
+
+def test_unknown_rule_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        rules.RULE_UNKNOWN
+    with pytest.raises(AttributeError):
+        maha.parsers.RULE_NUMERAL_UNKNOWN
@@ -61,3 +61,8 @@ def test_names_of_girls():
     output = parse_dimension(" ".join(GIRLS), names=True)
     assert len(output) == 25
     assert output[-1].value == "جوليا"
+
+
+def test_multi_word_names_are_matched_whole():
+    output = parse_dimension("أم الخير من أبو ظبي", names=True)
+    assert [o.value for o in output] == ["أم الخير", "أبو ظبي"]
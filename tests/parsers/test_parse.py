@@ -10,6 +10,7 @@ from maha.constants import (
     KASRA,
 )
 from maha.parsers.functions import parse
+from maha.parsers.functions.parse_fn import _get_parse_plan
 from maha.parsers.templates import Dimension, DimensionType
 from maha.rexy import Expression, ExpressionGroup
 from tests.utils import list_only_in_string
@@ -229,3 +230,25 @@ def test_dimesion_output():
         "Dimension(body=test, value=1, start=10, end=17, "
         "dimension_type=DimensionType.GENERAL)"
     )
+
+
+def test_parse_with_many_arguments_keeps_order(multiple_tweets):
+    arguments = ["numbers", "emails", "hashtags", "links", "mentions", "emojis"]
+    result = parse(multiple_tweets, **{arg: True for arg in arguments})
+
+    expected = []
+    for arg in arguments:
+        expected.extend(parse(multiple_tweets, **{arg: True}))
+    assert [(d.start, d.end, d.dimension_type) for d in result] == [
+        (d.start, d.end, d.dimension_type) for d in expected
+    ]
+
+
+def test_parse_plan_is_cached(simple_text_input):
+    _get_parse_plan.cache_clear()
+    parse(simple_text_input, arabic=True, numbers=True)
+    parse(simple_text_input, numbers=True, arabic=True)
+    parse(simple_text_input, arabic=True, numbers=True, include_space=True)
+
+    info = _get_parse_plan.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
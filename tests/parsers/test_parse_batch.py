@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import maha.parsers.functions.parse_batch as parse_batch
+from maha.parsers.functions import (
+    parse_dimension,
+    parse_dimension_batch,
+    parse_dimension_parallel,
+    shutdown_batch_pool,
+)
+from maha.parsers.templates import DimensionType
+
+TEXTS = [
+    "بعد ثلاث ساعات",
+    "الساعة العاشرة وخمس دقائق",
+    "يوم الجمعة القادم",
+    "١٥ شهر ٦ ٢٠٢١",
+    "عشرين كيلو متر",
+    "الحادي عشر",
+    "hello world",
+    "",
+]
+
+
+@pytest.fixture()
+def texts():
+    lines = Path("sample_data/tweets.txt").read_text(encoding="utf8").splitlines()
+    return (TEXTS + lines) * 3
+
+
+@pytest.fixture(autouse=True)
+def shutdown_pool():
+    yield
+    shutdown_batch_pool()
+
+
+def expected_dimensions(texts, **dimensions):
+    return [parse_dimension(text, **dimensions) for text in texts]
+
+
+def test_parse_dimension_batch_in_process(texts):
+    dimensions = dict(time=True, numeral=True, duration=True)
+    output = parse_dimension_batch(texts, workers=1, **dimensions)
+    assert output == expected_dimensions(texts, **dimensions)
+    assert not parse_batch._POOLS
+
+
+def test_parse_dimension_batch_single_chunk_in_process(texts):
+    output = parse_dimension_batch(texts, workers=2, chunksize=len(texts), time=True)
+    assert output == expected_dimensions(texts, time=True)
+    assert not parse_batch._POOLS
+
+
+def test_parse_dimension_batch_parallel(texts):
+    dimensions = dict(time=True, numeral=True, ordinal=True, distance=True)
+    output = parse_dimension_batch(texts, workers=2, chunksize=5, **dimensions)
+    assert output == expected_dimensions(texts, **dimensions)
+    assert all(
+        d.body == text[d.start : d.end]
+        for text, text_dimensions in zip(texts, output)
+        for d in text_dimensions
+    )
+
+
+def test_parse_dimension_batch_reuses_pool(texts):
+    parse_dimension_batch(texts, workers=2, chunksize=5, numeral=True)
+    pools = list(parse_batch._POOLS.values())
+    parse_dimension_batch(TEXTS, workers=2, chunksize=2, numeral=True)
+    assert list(parse_batch._POOLS.values()) == pools
+    parse_dimension_batch(TEXTS, workers=2, chunksize=2, ordinal=True)
+    assert len(parse_batch._POOLS) == 2
+    assert list(parse_batch._POOLS.values())[0] is pools[0]
+
+
+def test_parse_dimension_batch_stops_least_recently_used_pool(monkeypatch):
+    monkeypatch.setattr(parse_batch, "_MAX_POOLS", 2)
+    for dimensions in [dict(numeral=True), dict(ordinal=True), dict(numeral=True)]:
+        parse_dimension_batch(TEXTS, workers=2, chunksize=2, **dimensions)
+    parse_dimension_batch(TEXTS, workers=2, chunksize=2, distance=True)
+    assert [types for _, types in parse_batch._POOLS] == [
+        (DimensionType.NUMERAL,),
+        (DimensionType.DISTANCE,),
+    ]
+
+
+def test_parse_dimension_batch_threads_with_other_workers():
+    # Each pair of arguments has its own pool
+    def parse(workers):
+        return parse_dimension_batch(TEXTS, workers=workers, chunksize=2, numeral=True)
+
+    with ThreadPoolExecutor(2) as executor:
+        outputs = list(executor.map(parse, [2, 3, 2, 3, 2, 3]))
+    assert outputs == [expected_dimensions(TEXTS, numeral=True)] * 6
+    assert sorted(workers for workers, _ in parse_batch._POOLS) == [2, 3]
+    assert not parse_batch._POOL_USERS
+
+
+def test_parse_dimension_batch_accepts_iterables():
+    output = parse_dimension_batch(iter(TEXTS), workers=2, chunksize=3, numeral=True)
+    assert output == expected_dimensions(TEXTS, numeral=True)
+
+
+def test_parse_dimension_batch_empty():
+    assert parse_dimension_batch([], numeral=True) == []
+
+
+def test_parse_dimension_batch_invalid_arguments():
+    with pytest.raises(ValueError):
+        parse_dimension_batch(TEXTS)
+    with pytest.raises(ValueError):
+        parse_dimension_batch(TEXTS, numeral=True, chunksize=0)
+    with pytest.raises(NotImplementedError):
+        parse_dimension_batch(TEXTS, volume=True)
+
+
+DIMENSIONS = dict(duration=True, distance=True, numeral=True, ordinal=True, time=True)
+
+
+def test_parse_dimension_parallel_matches_serial_parse():
+    texts = [p.read_text(encoding="utf8") for p in Path("sample_data").glob("*.txt")]
+    text = "\n".join(texts + TEXTS * 5)
+    output = parse_dimension_parallel(
+        text, workers=2, piece_size=500, overlap=200, **DIMENSIONS
+    )
+    assert output == parse_dimension(text, **DIMENSIONS)
+
+
+def test_parse_dimension_parallel_values_across_pieces():
+    # Without boundaries the pieces split values, which are parsed again
+    text = " و".join(["بعد ثلاث ساعات وعشرين دقيقة", "الحادي عشر", "٥ كيلو"] * 40)
+    for piece_size in [7, 50, 333]:
+        output = parse_dimension_parallel(
+            text, workers=2, piece_size=piece_size, overlap=100, **DIMENSIONS
+        )
+        assert output == parse_dimension(text, **DIMENSIONS)
+
+
+def test_parse_dimension_parallel_short_text_in_process():
+    output = parse_dimension_parallel(TEXTS[0], workers=2, time=True)
+    assert output == parse_dimension(TEXTS[0], time=True)
+    assert not parse_batch._POOLS
+
+
+def test_split_text():
+    text = "abc.\ndefgh ijk؟lm"
+    boundaries = parse_batch._split_text(text, 3)
+    assert boundaries[0] == 0 and boundaries[-1] == len(text)
+    assert boundaries == sorted(set(boundaries))
+    assert parse_batch._split_text("ab.cd", 2) == [0, 3, 5]
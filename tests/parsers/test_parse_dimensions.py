@@ -1,8 +1,13 @@
 import itertools as it
+from pathlib import Path
 from pprint import pprint
 
-from maha.parsers.functions import parse_dimension
+import maha.parsers.rules as rules
+from maha.parsers.functions import parse_dimension, parse_dimensions
+from maha.parsers.functions.parse_dimensions import _get_dimensions, _get_gate
+from maha.parsers.templates import DimensionType
 from maha.parsers.templates.enums import DurationUnit
+from maha.rexy import PATTERN_CACHE, Expression
 
 
 def test_parse_numeral_wiki_arlang(wiki_arlang):
@@ -32,3 +37,47 @@ def test_parse_duration_wiki_arnumbers(wiki_arnumbers):
         assert len(d.value) == 1
         assert d.value[0].unit == DurationUnit.HOURS
         assert d.value[0].value == e
+
+
+def test_gated_parse_matches_ungated_parse():
+    texts = [p.read_text(encoding="utf8") for p in Path("sample_data").glob("*.txt")]
+    lines = [line for text in texts for line in text.splitlines()] + [
+        "بعد ٣ ساعات",
+        "الساعة العاشرة وخمس دقائق",
+        "يوم الجمعة القادم",
+        "١٥ شهر ٦ ٢٠٢١",
+        "عشرين كيلو متر",
+        "الحادي عشر",
+        "مليون و ٣٠٠ ألف",
+        "hello world",
+        "",
+    ]
+    dimensions = {
+        "duration": (rules.RULE_DURATION, DimensionType.DURATION),
+        "distance": (rules.RULE_DISTANCE, DimensionType.DISTANCE),
+        "numeral": (rules.RULE_NUMERAL, DimensionType.NUMERAL),
+        "ordinal": (rules.RULE_ORDINAL, DimensionType.ORDINAL),
+        "time": (rules.RULE_TIME, DimensionType.TIME),
+    }
+    skipped = 0
+    for name, (rule, dimension_type) in dimensions.items():
+        for line in lines:
+            gated = parse_dimension(line, **{name: True})
+            ungated = _get_dimensions(rule, line, dimension_type, gated=False)
+            assert gated == ungated
+            skipped += not _get_gate(rule, dimension_type).search(line)
+    assert skipped > 0
+
+
+def test_gate_of_new_rule_is_not_saved(monkeypatch):
+    monkeypatch.setattr(PATTERN_CACHE, "_save", _fail)
+    monkeypatch.setattr(parse_dimensions, "_GATES", {})
+    rule = Expression(r"(?:\d+|ثلاث) ?(?:ساعات|دقائق)", pickle=False)
+    gate = _get_gate(rule, DimensionType.DURATION)
+    assert gate.search("بعد ٣ ساعات")
+    assert not gate.search("hello world")
+    assert _get_gate(rule, DimensionType.DURATION) is gate
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("the pattern cache should not be written")
@@ -0,0 +1,83 @@
+import io
+import itertools as it
+from pathlib import Path
+
+import pytest
+
+from maha.parsers.functions import parse_dimension, parse_dimension_stream
+from maha.parsers.templates import DimensionType
+from maha.processors import StreamFileProcessor, StreamTextProcessor
+
+DIMENSIONS = dict(duration=True, distance=True, numeral=True, ordinal=True, time=True)
+ORDER = [
+    DimensionType.DURATION,
+    DimensionType.DISTANCE,
+    DimensionType.NUMERAL,
+    DimensionType.ORDINAL,
+    DimensionType.TIME,
+]
+
+
+@pytest.fixture()
+def text():
+    files = ["tweets.txt", "wiki_arnumbers.txt"]
+    return "\n".join(Path("sample_data", f).read_text(encoding="utf8") for f in files)
+
+
+def parse_stream(stream, **kwargs):
+    output = list(parse_dimension_stream(stream, **DIMENSIONS, **kwargs))
+    dimensions = [d for _, d in output]
+    return sorted(dimensions, key=lambda d: (ORDER.index(d.dimension_type), d.start))
+
+
+def assert_line_numbers(text, stream, **kwargs):
+    for line, d in parse_dimension_stream(stream, **DIMENSIONS, **kwargs):
+        assert line == text.count("\n", 0, d.start) + 1
+        assert d.body == text[d.start : d.end]
+
+
+@pytest.mark.parametrize("chunk_size", [100, 1000, 1 << 20])
+def test_parse_dimension_stream_matches_parse_dimension(text, chunk_size):
+    output = parse_stream(io.StringIO(text), chunk_size=chunk_size, overlap=100)
+    assert output == parse_dimension(text, **DIMENSIONS)
+    assert_line_numbers(text, io.StringIO(text), chunk_size=chunk_size, overlap=100)
+
+
+def test_parse_dimension_stream_values_across_chunks():
+    text = " و".join(["بعد ثلاث ساعات وعشرين دقيقة", "الحادي عشر", "٥ كيلو"] * 20)
+    for chunk_size in [1, 50]:
+        output = parse_stream(io.StringIO(text), chunk_size=chunk_size, overlap=100)
+        assert output == parse_dimension(text, **DIMENSIONS)
+
+
+def test_parse_dimension_stream_of_lines(text):
+    lines = text.splitlines(keepends=True)
+    assert parse_stream(lines, chunk_size=100) == parse_dimension(text, **DIMENSIONS)
+    processor = StreamTextProcessor(lines)
+    assert parse_stream(processor, chunk_size=100) == parse_dimension(
+        text, **DIMENSIONS
+    )
+
+
+def test_parse_dimension_stream_of_file_processor(tmp_path, text):
+    path = tmp_path / "input.txt"
+    path.write_text(text, encoding="utf8")
+    processor = StreamFileProcessor(path)
+    processor.openfile.read(100)
+    output = parse_stream(processor, chunk_size=1000)
+    assert output == parse_dimension(path.read_text(encoding="utf8"), **DIMENSIONS)
+
+
+def test_parse_dimension_stream_is_lazy():
+    lines = it.repeat("اشتريت ٣ كتب\n")
+    stream = parse_dimension_stream(lines, numeral=True, chunk_size=100, overlap=50)
+    output = list(it.islice(stream, 100))
+    assert [line for line, _ in output] == list(range(1, 101))
+    assert output[-1][1].start == 99 * len("اشتريت ٣ كتب\n") + len("اشتريت ")
+
+
+def test_parse_dimension_stream_invalid_arguments():
+    with pytest.raises(ValueError):
+        parse_dimension_stream(io.StringIO("text"))
+    with pytest.raises(ValueError):
+        parse_dimension_stream(io.StringIO("text"), time=True, chunk_size=0)
@@ -0,0 +1,114 @@
+import pytest
+
+from maha.parsers.functions import (
+    RESULT_CACHE,
+    ResultCache,
+    parse,
+    parse_dimension,
+    rules_fingerprint,
+)
+from maha.parsers.templates import Dimension, DimensionType, FunctionValue
+from maha.rexy import Expression, ExpressionGroup
+
+TEXT = "بعد ثلاث ساعات و ٥ دقائق"
+
+
+@pytest.fixture()
+def result_cache():
+    RESULT_CACHE.clear()
+    RESULT_CACHE.resize(100)
+    yield RESULT_CACHE
+    RESULT_CACHE.resize(0)
+    RESULT_CACHE.clear()
+
+
+def dimension(start):
+    return Dimension(Expression("a"), "a", 1, start, start + 1, DimensionType.GENERAL)
+
+
+def test_result_cache_is_disabled_by_default():
+    assert not RESULT_CACHE.enabled
+    parse_dimension(TEXT, duration=True)
+    assert RESULT_CACHE.info() == (0, 0, 0, 0)
+
+
+def test_parse_dimension_uses_result_cache(result_cache):
+    expected = parse_dimension(TEXT, duration=True, numeral=True)
+    output = parse_dimension(TEXT, duration=True, numeral=True)
+    assert output == expected
+    assert output is not expected
+    assert all(a is not b for a, b in zip(output, expected))
+
+    info = result_cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    assert info.hit_rate == 0.5
+
+    parse_dimension(TEXT, numeral=True)
+    assert result_cache.info().misses == 2
+
+
+def test_cached_results_are_not_modified_by_callers(result_cache):
+    output = parse_dimension(TEXT, numeral=True)
+    expected = [(d.body, d.start, d.end) for d in output]
+    output[0].start = -1
+    output.clear()
+    output = parse_dimension(TEXT, numeral=True)
+    assert [(d.body, d.start, d.end) for d in output] == expected
+
+
+def test_parse_uses_result_cache(result_cache):
+    text = "email a@b.com #tag"
+    expected = parse(text, emails=True, hashtags=True)
+    assert parse(text, emails=True, hashtags=True) == expected
+    assert parse(text, emails=True) != expected
+    assert result_cache.info()[:2] == (1, 2)
+
+
+def test_parse_custom_expressions_are_not_stale(result_cache):
+    group = ExpressionGroup(Expression(r"(\d+)"))
+    assert [d.value for d in parse("1 a", custom_expressions=group)] == ["1"]
+    group.add(Expression(r"([a-z])"))
+    assert [d.value for d in parse("1 a", custom_expressions=group)] == ["1", "a"]
+    group.smart = True
+    assert [d.value for d in parse("1 a", custom_expressions=group)] == ["1", "a"]
+    assert result_cache.info().hits == 0
+
+
+def test_rules_fingerprint_changes_with_rules():
+    function = FunctionValue(lambda m: 1, r"\d+", pickle=False)
+    same_pattern = FunctionValue(lambda m: 2, r"\d+", pickle=False)
+    fingerprint = rules_fingerprint([function])
+    assert rules_fingerprint([function]) == fingerprint
+    assert rules_fingerprint([same_pattern]) != fingerprint
+    assert rules_fingerprint([Expression(r"\d+")]) == rules_fingerprint(
+        [Expression(r"\d+")]
+    )
+    assert rules_fingerprint([Expression(r"\d+")]) != rules_fingerprint(
+        [Expression(r"\w+")]
+    )
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(2)
+    cache.put("a", [dimension(0)])
+    cache.put("b", [dimension(1)])
+    assert cache.get("a")[0].start == 0
+    cache.put("c", [])
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") == []
+    cache.resize(1)
+    assert len(cache) == 1 and cache.get("c") == []
+
+
+def test_result_cache_clear_and_resize():
+    cache = ResultCache()
+    cache.put("a", [dimension(0)])
+    assert len(cache) == 0
+    cache.resize(1)
+    cache.put("a", [dimension(0)])
+    cache.get("a")
+    cache.clear()
+    assert cache.info() == (0, 0, 1, 0)
+    with pytest.raises(ValueError):
+        cache.resize(-1)
@@ -230,3 +230,16 @@ class TestBaseProcessor:
     def test_filter_lines_contain_raises_value_error(self, processor: BaseProcessor):
         with pytest.raises(ValueError):
             processor.filter_lines_contain(arabic_ligatures=True, operator=None)  # type: ignore
+
+    def test_invalid_arguments_raise_when_added(self, processor: BaseProcessor):
+        with pytest.raises(ValueError):
+            processor.remove()
+        with pytest.raises(ValueError):
+            processor.keep(use_space=False)
+        with pytest.raises(ValueError):
+            processor.replace_pairs(["a"], [])
+        with pytest.raises(TypeError):
+            processor.remove(custom_strings=5)  # type: ignore
+        with pytest.raises(ValueError):
+            processor.add_steps([{"operation": "normalize"}])
+        assert processor.steps == []
@@ -0,0 +1,133 @@
+import os
+import pathlib
+
+import pytest
+
+from maha.processors import FileProcessor, LineIndex, StreamFileProcessor
+
+
+@pytest.fixture()
+def text_file(tmp_path: pathlib.Path, multiple_tweets: str, wiki_arlang: str):
+    path = tmp_path / "text.txt"
+    text = multiple_tweets + "\n\n" + wiki_arlang.replace("\n", "\r\n") + "\nأخير"
+    path.write_bytes(text.encode("utf8"))
+    return path
+
+
+def read_lines(path: pathlib.Path) -> list[str]:
+    with path.open("r", encoding="utf8", newline="") as file:
+        return [line.rstrip("\r\n") for line in file]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("", []),
+        ("a", ["a"]),
+        ("a\n", ["a"]),
+        ("a\nب\n", ["a", "ب"]),
+        ("\n\n", ["", ""]),
+        ("a\r\nب", ["a", "ب"]),
+    ],
+)
+def test_build(tmp_path: pathlib.Path, text: str, expected: list):
+    path = tmp_path / "text.txt"
+    path.write_bytes(text.encode("utf8"))
+    index = LineIndex.build(path)
+    assert index.offsets.typecode == "Q"
+    assert len(index) == len(expected)
+    assert [index[i] for i in range(len(index))] == expected
+
+
+def test_random_access(text_file: pathlib.Path):
+    index = LineIndex.build(text_file)
+    lines = read_lines(text_file)
+    assert len(index) == len(lines)
+    for i in [5, 0, len(lines) - 1, 3, -1, -len(lines)]:
+        assert index[i] == lines[i]
+    with pytest.raises(IndexError):
+        index[len(lines)]
+
+
+def test_span_and_line_number(text_file: pathlib.Path):
+    index = LineIndex.build(text_file)
+    data = text_file.read_bytes()
+    for i in range(len(index)):
+        start, end = index.span(i)
+        assert data[start:end].decode("utf8").rstrip("\r\n") == index[i]
+        assert index.line_number(start) == index.line_number(end - 1) == i
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 7, 1000])
+def test_split(text_file: pathlib.Path, parts: int):
+    index = LineIndex.build(text_file)
+    ranges = index.split(parts)
+    assert len(ranges) == min(parts, len(index))
+    assert ranges[0][0] == 0 and ranges[-1][1] == text_file.stat().st_size
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    assert all(start in index.offsets for start, _ in ranges)
+
+    data = text_file.read_bytes()
+    lines = []
+    for start, end in ranges:
+        lines += data[start:end].decode("utf8").splitlines()
+    assert lines == read_lines(text_file)
+
+
+def test_split_is_balanced(tmp_path: pathlib.Path):
+    path = tmp_path / "text.txt"
+    path.write_text("line\n" * 1000, encoding="utf8")
+    ranges = LineIndex.build(path).split(4)
+    assert [end - start for start, end in ranges] == [1250] * 4
+
+
+def test_split_raises_value_error(text_file: pathlib.Path):
+    with pytest.raises(ValueError):
+        LineIndex.build(text_file).split(0)
+
+
+def test_save_and_load(text_file: pathlib.Path):
+    assert LineIndex.load(text_file) is None
+    index = LineIndex.of(text_file, save=True)
+    assert LineIndex.get_index_path(text_file).is_file()
+
+    loaded = LineIndex.load(text_file)
+    assert loaded is not None
+    assert loaded.offsets == index.offsets
+    assert loaded[-1] == "أخير"
+
+
+def test_load_ignores_changed_file(text_file: pathlib.Path):
+    LineIndex.build(text_file).save()
+    with text_file.open("ab") as file:
+        file.write(b"\nnew line")
+    assert LineIndex.load(text_file) is None
+    assert LineIndex.of(text_file)[-1] == "new line"
+
+
+def test_load_ignores_invalid_index(text_file: pathlib.Path):
+    index_path = LineIndex.get_index_path(text_file)
+    index_path.write_bytes(b"invalid")
+    assert LineIndex.load(text_file) is None
+
+    LineIndex.build(text_file).save()
+    data = index_path.read_bytes()
+    index_path.write_bytes(data[:-8])
+    os.utime(index_path)
+    assert LineIndex.load(text_file) is None
+
+
+def test_processors_line_index(text_file: pathlib.Path):
+    lines = read_lines(text_file)
+    assert len(StreamFileProcessor(text_file).get_line_index()) == len(lines)
+    assert FileProcessor(text_file).get_line_index(save=True)[2] == lines[2]
+    assert LineIndex.get_index_path(text_file).is_file()
+
+
+@pytest.mark.parametrize("processor", [FileProcessor, StreamFileProcessor])
+def test_processors_line_index_encoding(tmp_path: pathlib.Path, processor):
+    path = tmp_path / "text.txt"
+    lines = ["سطر", "ثاني", "أخير"]
+    path.write_bytes("\n".join(lines).encode("cp1256"))
+    index = processor(path, encoding="cp1256").get_line_index()
+    assert [index[i] for i in range(len(index))] == lines
@@ -0,0 +1,127 @@
+from functools import partial
+
+import pytest
+
+from maha.cleaners.functions import (
+    contains,
+    keep,
+    normalize,
+    remove,
+    replace,
+    replace_pairs,
+)
+from maha.constants import ARABIC_NUMBERS, ENGLISH_NUMBERS, FATHA, TATWEEL
+from maha.processors import StreamTextProcessor, TextProcessor
+from maha.processors.plan import APPLY, FILTER, CharacterStep, ExecutionPlan
+
+
+def apply_step_by_step(steps, lines):
+    output = list(lines)
+    for kind, fn in steps:
+        if kind == APPLY:
+            output = list(map(fn, output))
+        else:
+            output = list(filter(fn, output))
+    return output
+
+
+@pytest.fixture()
+def lines(multiple_tweets, wiki_arlang):
+    extra = [
+        "",
+        "   ",
+        "ﷺ  الـــلـــه ﻷ",
+        f"ب{FATHA}{TATWEEL}     ٣٤٥  1.",
+        " أإآ ؤ ى ة ",
+    ]
+    return multiple_tweets.split("\n") + wiki_arlang.split("\n") + extra
+
+
+CHAINS = [
+    [
+        (APPLY, partial(remove, harakat=True, tatweel=True)),
+        (APPLY, partial(normalize, alef=True, yeh=True)),
+    ],
+    [
+        (APPLY, partial(normalize, all=True)),
+        (APPLY, partial(remove, all_harakat=True, punctuations=True)),
+        (APPLY, partial(replace_pairs, keys=ARABIC_NUMBERS, values=ENGLISH_NUMBERS)),
+    ],
+    [
+        (APPLY, partial(normalize, ligatures=True, spaces=True, teh_marbuta=True)),
+        (APPLY, partial(replace, strings=["ه", "ا"], with_value="-")),
+        (FILTER, lambda line: bool(line)),
+        (APPLY, partial(remove, harakat=True, use_space=False)),
+    ],
+    [
+        (APPLY, partial(normalize, lam_alef=True, waw=True)),
+        (APPLY, partial(remove, hashtags=True, english=True)),
+        (APPLY, partial(keep, arabic=True)),
+        (FILTER, lambda line: not contains(line, english=True)),
+        (APPLY, partial(normalize, all=True, spaces=False)),
+        (APPLY, partial(remove, custom_strings=["!", "؟"], numbers=True)),
+    ],
+    [
+        (APPLY, partial(replace, strings="ا", with_value=r"\g<0>\g<0>")),
+        (APPLY, partial(replace, strings=["ال"], with_value="")),
+        (APPLY, partial(replace_pairs, keys=["ب", "ب"], values=["1", "2"])),
+    ],
+]
+
+
+@pytest.mark.parametrize("steps", CHAINS)
+def test_plan_matches_step_by_step(steps, lines):
+    assert ExecutionPlan(steps)(lines) == apply_step_by_step(steps, lines)
+
+
+def test_plan_fuses_character_steps():
+    plan = ExecutionPlan(CHAINS[1])
+    assert len(plan) == 2
+    assert isinstance(plan.steps[0][1], CharacterStep)
+
+
+def test_plan_does_not_fuse_after_strip():
+    steps = [
+        (APPLY, partial(remove, harakat=True)),
+        (APPLY, partial(normalize, alef=True)),
+    ]
+    assert len(ExecutionPlan(steps)) == 2
+
+
+def test_plan_keeps_unknown_steps():
+    steps = [(APPLY, str.upper), (FILTER, str.isupper)]
+    plan = ExecutionPlan(steps)
+    assert plan.steps == steps
+    assert plan(["a", "1"]) == ["A"]
+
+
+def test_plan_keeps_invalid_steps_to_raise():
+    plan = ExecutionPlan([(APPLY, partial(normalize))])
+    with pytest.raises(ValueError):
+        plan(["text"])
+
+
+@pytest.mark.parametrize("processor_class", [TextProcessor, StreamTextProcessor])
+def test_processor_plan(processor_class, lines):
+    processor = processor_class(lines)
+    processor.normalize(all=True).remove(harakat=True).drop_empty_lines()
+    assert len(processor.plan) == 2
+    assert processor.plan is processor.plan
+
+    processor.keep(arabic=True)
+    assert len(processor.plan) == 3
+
+
+def test_text_processor_applies_steps_lazily(lines):
+    processor = TextProcessor(lines)
+    processor.normalize(alef=True)
+    assert len(processor.steps) == 1
+    assert processor.lines == [normalize(line, alef=True) for line in lines]
+    assert not processor.steps
+
+
+def test_text_processor_set_lines_discards_steps():
+    processor = TextProcessor("أ")
+    processor.normalize(alef=True)
+    processor.set_lines("إ")
+    assert processor.text == "إ"
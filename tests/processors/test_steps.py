@@ -0,0 +1,109 @@
+import json
+import pickle
+
+import pytest
+
+from maha.cleaners.functions import remove_extra_spaces
+from maha.processors import OPERATIONS, StepSpec, TextProcessor
+from maha.processors.plan import APPLY, FILTER
+from maha.rexy import Expression, StringSet
+
+
+@pytest.fixture()
+def lines(multiple_tweets, wiki_arlang):
+    return multiple_tweets.split("\n") + wiki_arlang.split("\n") + ["", "ﷺ  ب ﻷ"]
+
+
+def add_steps(processor):
+    processor.normalize(all=True).remove(harakat=True, hashtags=True)
+    processor.connect_single_letter_word(waw=True)
+    processor.replace(strings=StringSet(["ال", "في"]), with_value="-")
+    processor.replace_expression(Expression(r"\d+"), "0")
+    processor.replace_pairs(["ا", "ب"], ["1", "2"]).reduce_repeated_substring()
+    processor.keep(arabic=True, numbers=True)
+    processor.drop_lines_contain(english=True).drop_lines_below_len(2, True)
+    processor.drop_lines_above_len(200).drop_lines_contain_repeated_substring(4)
+    processor.drop_lines_contain_single_letter_word(arabic_letters=True)
+    processor.filter_lines_contain(arabic=True)
+    processor.apply(remove_extra_spaces)
+
+
+def test_processor_steps_are_specs(lines):
+    processor = TextProcessor(lines)
+    add_steps(processor)
+    assert [s.operation for s in processor.steps[-3:]] == [
+        "drop_lines_contain_single_letter_word",
+        "filter_lines_contain",
+        APPLY,
+    ]
+    assert set(OPERATIONS) <= {s.operation for s in processor.steps}
+
+
+def test_steps_round_trip_json(lines):
+    expected = TextProcessor(lines)
+    add_steps(expected)
+    saved = json.dumps([step.to_dict() for step in expected.steps])
+
+    processor = TextProcessor(lines).add_steps(json.loads(saved))
+    assert processor.steps == expected.steps
+    assert processor.lines == expected.lines
+
+
+def test_steps_round_trip_pickle(lines):
+    expected = TextProcessor(lines)
+    add_steps(expected)
+
+    processor = TextProcessor(lines).add_steps(
+        pickle.loads(pickle.dumps(expected.steps))
+    )
+    plan = pickle.loads(pickle.dumps(expected.plan))
+    assert plan(lines) == processor.lines == expected.lines
+
+
+def test_step_spec_kind():
+    assert StepSpec("normalize").kind == APPLY
+    assert StepSpec("drop_lines_contain").kind == FILTER
+    assert StepSpec(FILTER, {"fn": bool}).kind == FILTER
+    assert StepSpec(FILTER, {"fn": bool}).build() is bool
+
+
+def test_step_spec_raises_unknown_operation():
+    with pytest.raises(ValueError):
+        StepSpec("unknown")
+    with pytest.raises(ValueError):
+        StepSpec.from_dict({"operation": "unknown"})
+
+
+def test_step_spec_to_dict_raises_local_function():
+    with pytest.raises(TypeError):
+        StepSpec(APPLY, {"fn": lambda line: line}).to_dict()
+
+
+def test_step_spec_from_dict_raises_unknown_value():
+    with pytest.raises(ValueError):
+        StepSpec.from_dict({"operation": "replace", "arguments": {"strings": {}}})
+
+
+def test_step_spec_saves_function_path():
+    step = StepSpec(APPLY, {"fn": remove_extra_spaces})
+    data = step.to_dict()
+    module = remove_extra_spaces.__module__
+    assert data["arguments"] == {"fn": {"function": f"{module}:remove_extra_spaces"}}
+    assert StepSpec.from_dict(data) == step
+
+
+@pytest.mark.parametrize(
+    "function", ["os:system", "builtins:eval", "maha.processors.steps:importlib"]
+)
+def test_step_spec_from_dict_raises_unknown_function(function):
+    data = {"operation": APPLY, "arguments": {"fn": {"function": function}}}
+    with pytest.raises(ValueError, match="Unknown function"):
+        StepSpec.from_dict(data)
+    with pytest.raises(ValueError):
+        TextProcessor(["a"]).add_steps([data])
+
+
+def test_step_spec_from_dict_loads_operation_functions():
+    _, function = OPERATIONS["drop_lines_below_len"]
+    data = StepSpec(FILTER, {"fn": function}).to_dict()
+    assert StepSpec.from_dict(data).build() is function
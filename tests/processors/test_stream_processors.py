@@ -1,12 +1,23 @@
+import json
 import pathlib
 
 import pytest
 
 from maha.constants import EMPTY
-from maha.processors import StreamFileProcessor, StreamTextProcessor
+from maha.processors import (
+    StreamFileProcessor,
+    StreamFolderProcessor,
+    StreamTextProcessor,
+    steps_fingerprint,
+)
 from tests.processors.test_base_processor import TestBaseProcessor
 
 
+def fail(lines):
+    # Defined at module level to be pickled for worker processes started with spawn
+    raise RuntimeError("failed")
+
+
 class TestStreamTextProcessor(TestBaseProcessor):
     __test__ = True
 
@@ -42,6 +53,17 @@ class TestStreamTextProcessor(TestBaseProcessor):
         )
         assert len(self.get_processed_lines(processor)) == 3
 
+    def test_functions_is_deprecated(self, processor):
+        processor.filter_lines_contain(arabic=True).remove(harakat=True)
+        lines = list(processor.get_lines())[0]
+        with pytest.deprecated_call():
+            functions = processor.functions
+        assert len(functions) == 2
+        output = lines
+        for function in functions:
+            output = list(function(output))
+        assert output == self.get_processed_lines(processor)
+
 
 class TestStreamFileProcessor(TestStreamTextProcessor):
 
@@ -98,3 +120,335 @@ class TestStreamFileProcessor(TestStreamTextProcessor):
         processor.process_and_save(str(tmpfile))
 
         assert tmpfile.read_text() == EMPTY
+
+    @pytest.mark.parametrize("n_lines", [1, 2, 5])
+    def test_process_and_save_with_workers(
+        self,
+        surah_al_ala_file: pathlib.Path,
+        surah_al_ala_processed_file: pathlib.Path,
+        tmp_path: pathlib.Path,
+        n_lines: int,
+    ):
+        processor = StreamFileProcessor(surah_al_ala_file)
+        tmpfile = tmp_path / "tmp.txt"
+        processor.normalize(all=True, yeh=False, waw=False).keep(
+            arabic_letters=True
+        ).drop_empty_lines()
+        processor.process_and_save(tmpfile, n_lines=n_lines, workers=2)
+
+        assert tmpfile.read_bytes() == surah_al_ala_processed_file.read_bytes()
+
+    def test_process_with_workers_keeps_order(self, multiple_tweets_file):
+        processor = StreamFileProcessor(multiple_tweets_file)
+        processor.drop_lines_below_len(1)
+        expected = list(processor.process(n_lines=1))
+        assert list(processor.process(n_lines=1, workers=3)) == expected
+
+    def test_process_with_workers_raises_worker_error(self, processor):
+        processor.apply(fail)
+        with pytest.raises(RuntimeError, match="failed"):
+            list(processor.process(n_lines=2, workers=2))
+
+    def test_process_with_workers_raises_unpicklable_steps(
+        self, processor, tmp_path: pathlib.Path
+    ):
+        processor.apply(lambda lines: lines)
+        with pytest.raises(ValueError, match="worker processes"):
+            list(processor.process(n_lines=2, workers=2))
+
+        output = tmp_path / "output.txt"
+        with pytest.raises(ValueError, match="worker processes"):
+            processor.process_and_save(output, workers=2)
+        assert not output.exists()
+
+    def add_checkpoint_steps(self, processor):
+        return (
+            processor.normalize(all=True).keep(arabic_letters=True).drop_empty_lines()
+        )
+
+    @pytest.fixture()
+    def long_file(self, tmp_path: pathlib.Path, multiple_tweets, surah_al_ala_file):
+        # Empty lines and windows line endings, so chunk edges and offsets matter
+        text = multiple_tweets + "\n\n" + surah_al_ala_file.read_text("utf8")
+        path = tmp_path / "long.txt"
+        path.write_bytes((text * 5).replace("\n", "\r\n").encode("utf8"))
+        return path
+
+    def expected_bytes(self, source: pathlib.Path, tmp_path: pathlib.Path) -> bytes:
+        path = tmp_path / "expected.txt"
+        processor = self.add_checkpoint_steps(StreamFileProcessor(source))
+        processor.process_and_save(path, n_lines=3)
+        return path.read_bytes()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_process_and_save_with_checkpoint(
+        self, long_file: pathlib.Path, tmp_path: pathlib.Path, workers: int
+    ):
+        output = tmp_path / "output.txt"
+        processor = self.add_checkpoint_steps(StreamFileProcessor(long_file))
+        processor.process_and_save(
+            output, n_lines=3, workers=workers, checkpoint=True, checkpoint_interval=0
+        )
+
+        assert output.read_bytes() == self.expected_bytes(long_file, tmp_path)
+        checkpoint = json.loads(
+            StreamFileProcessor.get_checkpoint_path(output).read_text()
+        )
+        assert checkpoint == {
+            "input_offset": long_file.stat().st_size,
+            "output_offset": output.stat().st_size,
+            "fingerprint": steps_fingerprint(processor.steps),
+            "n_lines": 3,
+        }
+
+    @pytest.mark.parametrize("failed_chunk", [1, 4, 9])
+    def test_process_and_save_resumes(
+        self, long_file: pathlib.Path, tmp_path: pathlib.Path, failed_chunk: int
+    ):
+        output = tmp_path / "output.txt"
+        processor = self.add_checkpoint_steps(StreamFileProcessor(long_file))
+        calls = []
+
+        def fail(lines):
+            calls.append(lines)
+            if len(calls) == failed_chunk:
+                raise RuntimeError("failed")
+            return lines
+
+        processor.apply_functions = lambda lines: fail(processor.plan(lines))
+        with pytest.raises(RuntimeError):
+            processor.process_and_save(
+                output, n_lines=3, checkpoint=True, checkpoint_interval=0
+            )
+        checkpoint_path = StreamFileProcessor.get_checkpoint_path(output)
+        assert checkpoint_path.is_file() == (failed_chunk > 1)
+        # Output saved after the last checkpoint is dropped
+        with output.open("a", encoding="utf8") as file:
+            file.write("partial")
+
+        del processor.apply_functions
+        processor.process_and_save(output, n_lines=3, override=True, resume=True)
+        assert output.read_bytes() == self.expected_bytes(long_file, tmp_path)
+
+    @pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-16"])
+    def test_process_and_save_resumes_encoding_with_bom(
+        self, long_file: pathlib.Path, tmp_path: pathlib.Path, encoding: str
+    ):
+        source = tmp_path / f"{encoding}.txt"
+        source.write_bytes(long_file.read_bytes().decode("utf8").encode(encoding))
+        expected = tmp_path / "expected.txt"
+        processor = self.add_checkpoint_steps(StreamFileProcessor(source, encoding))
+        processor.process_and_save(expected, n_lines=3)
+
+        output = tmp_path / "output.txt"
+        calls = []
+
+        def fail_third_chunk(lines):
+            calls.append(lines)
+            if len(calls) == 3:
+                raise RuntimeError("failed")
+            return processor.plan(lines)
+
+        processor.apply_functions = fail_third_chunk
+        with pytest.raises(RuntimeError):
+            processor.process_and_save(
+                output, n_lines=3, checkpoint=True, checkpoint_interval=0
+            )
+        # Offset of the end of the sixth line, counting the byte order mark once
+        state = json.loads(StreamFileProcessor.get_checkpoint_path(output).read_text())
+        text = source.read_bytes().decode(encoding)
+        head = "".join(line + "\n" for line in text.split("\n")[:6])
+        assert state["input_offset"] == len(head.encode(encoding))
+
+        del processor.apply_functions
+        processor.process_and_save(output, n_lines=3, resume=True)
+        assert output.read_bytes() == expected.read_bytes()
+
+    def test_process_and_save_resumes_complete_file(
+        self, long_file: pathlib.Path, tmp_path: pathlib.Path
+    ):
+        output = tmp_path / "output.txt"
+        processor = self.add_checkpoint_steps(StreamFileProcessor(long_file))
+        processor.process_and_save(output, checkpoint=True)
+        saved = output.read_bytes()
+        processor.process_and_save(output, resume=True)
+        assert output.read_bytes() == saved
+
+    def test_process_and_save_resume_without_checkpoint(
+        self, long_file: pathlib.Path, tmp_path: pathlib.Path
+    ):
+        output = tmp_path / "output.txt"
+        output.write_text("other", encoding="utf8")
+        processor = self.add_checkpoint_steps(StreamFileProcessor(long_file))
+        with pytest.raises(FileExistsError):
+            processor.process_and_save(output, n_lines=3, resume=True)
+        assert output.read_text(encoding="utf8") == "other"
+
+        processor.process_and_save(output, n_lines=3, override=True, resume=True)
+        assert output.read_bytes() == self.expected_bytes(long_file, tmp_path)
+        assert StreamFileProcessor.get_checkpoint_path(output).is_file()
+
+    @pytest.mark.parametrize("output_bytes", [None, b"", b"cut"])
+    def test_process_and_save_resume_without_output(
+        self, long_file: pathlib.Path, tmp_path: pathlib.Path, output_bytes
+    ):
+        output = tmp_path / "output.txt"
+        processor = self.add_checkpoint_steps(StreamFileProcessor(long_file))
+        processor.process_and_save(output, n_lines=3, checkpoint=True)
+        if output_bytes is None:
+            output.unlink()
+        else:
+            output.write_bytes(output_bytes)
+            with pytest.raises(FileExistsError):
+                processor.process_and_save(output, n_lines=3, resume=True)
+        processor.process_and_save(output, n_lines=3, override=True, resume=True)
+        assert output.read_bytes() == self.expected_bytes(long_file, tmp_path)
+
+    def test_process_and_save_resume_raises_changed_steps(
+        self, long_file: pathlib.Path, tmp_path: pathlib.Path
+    ):
+        output = tmp_path / "output.txt"
+        processor = self.add_checkpoint_steps(StreamFileProcessor(long_file))
+        processor.process_and_save(output, checkpoint=True)
+        with pytest.raises(ValueError):
+            processor.process_and_save(output, n_lines=3, resume=True)
+        processor.drop_lines_below_len(3)
+        with pytest.raises(ValueError):
+            processor.process_and_save(output, resume=True)
+
+    def test_process_and_save_with_checkpoint_raises_file_exists_error(
+        self, processor, surah_al_ala_processed_file
+    ):
+        processor.drop_empty_lines()
+        with pytest.raises(FileExistsError):
+            processor.process_and_save(surah_al_ala_processed_file, checkpoint=True)
+
+
+class TestStreamFolderProcessor:
+    @pytest.fixture()
+    def folder(self, tmp_path: pathlib.Path, multiple_tweets: str, surah_al_ala_file):
+        folder = tmp_path / "input"
+        (folder / "a" / "b").mkdir(parents=True)
+        (folder / "tweets.txt").write_text(multiple_tweets, encoding="utf8")
+        (folder / "a" / "surah.txt").write_bytes(surah_al_ala_file.read_bytes())
+        (folder / "a" / "b" / "empty.txt").write_text("", encoding="utf8")
+        (folder / "a" / "ignored.csv").write_text("ignored", encoding="utf8")
+        return folder
+
+    def add_steps(self, processor):
+        return (
+            processor.normalize(all=True).keep(arabic_letters=True).drop_empty_lines()
+        )
+
+    def expected(self, source: pathlib.Path, tmp_path: pathlib.Path) -> bytes:
+        processor = self.add_steps(StreamFileProcessor(source))
+        path = tmp_path / "expected.txt"
+        processor.process_and_save(path, override=True)
+        return path.read_bytes()
+
+    def saved_files(self, output: pathlib.Path):
+        return sorted(
+            p.relative_to(output).as_posix()
+            for p in output.rglob("*")
+            if p.is_file() and p.name != StreamFolderProcessor.MANIFEST_NAME
+        )
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_process_and_save(self, folder, tmp_path: pathlib.Path, workers: int):
+        processor = self.add_steps(StreamFolderProcessor(folder))
+        output = tmp_path / "output"
+        processor.process_and_save(output, n_lines=3, workers=workers)
+
+        assert self.saved_files(output) == [
+            "a/b/empty.txt",
+            "a/surah.txt",
+            "tweets.txt",
+        ]
+        for name in self.saved_files(output):
+            expected = self.expected(folder / name, tmp_path)
+            assert (output / name).read_bytes() == expected
+
+    def test_get_lines(self, folder, multiple_tweets):
+        processor = StreamFolderProcessor(folder, pattern="*.txt")
+        assert sum(list(processor.get_lines(4)), []) == multiple_tweets.split("\n")
+
+    def test_process_and_save_resumes(self, folder, tmp_path: pathlib.Path):
+        processor = self.add_steps(StreamFolderProcessor(folder))
+        output = tmp_path / "output"
+        processor.process_and_save(output)
+        (output / "tweets.txt").write_text("saved", encoding="utf8")
+        (output / "a" / "surah.txt").write_text("saved", encoding="utf8")
+
+        # Changed and missing files are processed again
+        (folder / "tweets.txt").write_text("تغريدة", encoding="utf8")
+        (output / "a" / "b" / "empty.txt").unlink()
+        processor.process_and_save(output)
+        assert (output / "tweets.txt").read_text("utf8") == "تغريده\n"
+        assert (output / "a" / "surah.txt").read_text("utf8") == "saved"
+        assert (output / "a" / "b" / "empty.txt").is_file()
+
+        # Files are processed again by new steps
+        processor.drop_lines_below_len(100)
+        processor.process_and_save(output)
+        assert (output / "a" / "surah.txt").read_text("utf8") == ""
+
+        # and with a different n_lines
+        (output / "a" / "surah.txt").write_text("saved", encoding="utf8")
+        processor.process_and_save(output, n_lines=3)
+        assert (output / "a" / "surah.txt").read_text("utf8") == ""
+
+    def test_process_and_save_skips_interrupted_manifest_line(
+        self, folder, tmp_path: pathlib.Path
+    ):
+        processor = self.add_steps(StreamFolderProcessor(folder))
+        output = tmp_path / "output"
+        processor.process_and_save(output)
+        with (output / StreamFolderProcessor.MANIFEST_NAME).open("a") as file:
+            file.write('{"path": "tweets.t')
+        (output / "tweets.txt").write_text("saved", encoding="utf8")
+        processor.process_and_save(output)
+        assert (output / "tweets.txt").read_text("utf8") == "saved"
+
+    def test_process_and_save_raises_file_exists_error(
+        self, folder, tmp_path: pathlib.Path
+    ):
+        processor = self.add_steps(StreamFolderProcessor(folder))
+        output = tmp_path / "output"
+        output.mkdir()
+        (output / "tweets.txt").write_text("other", encoding="utf8")
+        with pytest.raises(FileExistsError):
+            processor.process_and_save(output)
+
+        processor.process_and_save(output, override=True)
+        assert (output / "tweets.txt").read_text("utf8") != "other"
+
+    def test_process_and_save_skips_output_in_input(self, folder):
+        processor = self.add_steps(StreamFolderProcessor(folder))
+        processor.process_and_save(folder / "output")
+        processor = self.add_steps(StreamFolderProcessor(folder))
+        processor.drop_lines_below_len(2)
+        processor.process_and_save(folder / "output")
+        assert not (folder / "output" / "output").exists()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_process_and_save_raises_worker_error(self, folder, tmp_path, workers):
+        processor = StreamFolderProcessor(folder)
+        processor.apply(fail)
+        output = tmp_path / "output"
+        with pytest.raises(RuntimeError, match="failed"):
+            processor.process_and_save(output, workers=workers)
+        assert not list(output.rglob("*.part"))
+
+    def test_process_and_save_raises_unpicklable_steps(self, folder, tmp_path):
+        processor = StreamFolderProcessor(folder)
+        processor.apply(lambda line: line)
+        with pytest.raises(ValueError, match="worker processes"):
+            processor.process_and_save(tmp_path / "output", workers=2)
+
+    def test_process_without_functions(self, folder, tmp_path):
+        with pytest.raises(ValueError):
+            StreamFolderProcessor(folder).process_and_save(tmp_path)
+
+    def test_init_raises_file_not_found(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            StreamFolderProcessor(tmp_path / "invalid")
@@ -0,0 +1,71 @@
+import pytest
+import regex as re
+
+from maha.rexy import PatternCache, pattern_key, set_cache_dir
+from maha.rexy.__main__ import main
+from maha.rexy.build_cache import build_cache, find_pickled_expressions
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return PatternCache(tmp_path / "patterns.bundle")
+
+
+def test_find_pickled_expressions():
+    expressions = find_pickled_expressions()
+    names = set(expressions.values())
+    for name in ["RULE_NAME", "RULE_TIME", "RULE_DISTANCE", "RULE_NUMERAL_ONES"]:
+        assert name in names
+    assert "time.rule.ORDINAL_AND_MONTH" in names
+    assert all(pattern for pattern in expressions)
+
+
+def test_build_cache(cache: PatternCache):
+    cache.put(re.compile("old", re.MULTILINE))
+    results = build_cache({"a+": "A", r"\d+": "DIGITS"}, workers=2, cache=cache)
+
+    assert {r.name for r in results} == {"A", "DIGITS"}
+    assert all(r.verified and r.size > 0 and r.compile_time >= 0 for r in results)
+    assert pattern_key("old") in cache
+    assert cache.get(r"\d+").findall("a 12 b 3") == ["12", "3"]
+
+
+def test_build_cache_empty_cache(cache: PatternCache):
+    build_cache({"a+": "A"}, workers=1, cache=cache)
+    assert cache.keys() == [pattern_key("a+")]
+
+
+def test_build_cache_clear(cache: PatternCache, monkeypatch):
+    cache.put(re.compile("old", re.MULTILINE))
+    cache.put_source("names", "old|names")
+    writes = []
+    write = cache._write
+    monkeypatch.setattr(cache, "_write", lambda *args: writes.append(write(*args)))
+
+    build_cache({"a+": "A"}, workers=1, cache=cache, clear=True)
+    assert len(writes) == 1
+    assert cache.keys() == [pattern_key("a+")]
+    assert cache.get_source("names") == "old|names"
+
+
+def test_build_cache_command(tmp_path, capsys):
+    try:
+        exit_code = main(
+            [
+                "build-cache",
+                "--cache-dir",
+                str(tmp_path),
+                "--packages",
+                "maha.parsers.rules.names",
+                "--workers",
+                "1",
+            ]
+        )
+    finally:
+        set_cache_dir(None)
+
+    output = capsys.readouterr().out
+    assert exit_code == 0
+    assert "RULE_NAME" in output
+    assert "1 patterns" in output
+    assert len(PatternCache(tmp_path / "patterns.bundle")) == 1
@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from random import Random
+
+import pytest
+
+import maha.parsers.rules as rules
+from maha.parsers.functions import parse_dimension
+from maha.parsers.templates import FunctionValue, Value
+from maha.rexy import Expression, ExpressionGroup
+from maha.rexy.templates.expression_group import _RangeSet
+
+TIME_TEXTS = [
+    "الساعة العاشرة وخمس دقائق",
+    "بعد ثلاث سنوات",
+    "يوم الجمعة القادم الساعة ٣ العصر",
+    "من الساعة ٢ الى الساعة ٥ مساء",
+    "اول امس الساعة ٨ الصبح",
+    "١٥ شهر ٦ ٢٠٢١",
+    "الشهر الماضي",
+    "قبل ثلاث ساعات وعشرين دقيقة",
+]
+
+
+def smart_group():
+    return ExpressionGroup(
+        Expression(r"\d+ \w+"), Expression(r"\d+"), Expression(r"\w+"), smart=True
+    )
+
+
+def matched_text(text, results):
+    return [text[r.start : r.end] for r in results]
+
+
+def test_smart_parse_skips_parsed_values():
+    result = smart_group().parse("10 days ago")
+    assert matched_text("10 days ago", result) == ["10 days", "ago"]
+
+
+def test_interleaved_smart_parse():
+    group = smart_group()
+    first = group.parse("10 days ago")
+    second = group.parse("10 days later")
+
+    values = [next(first), next(second)]
+    assert matched_text("10 days", values) == ["10 days", "10 days"]
+    assert matched_text("10 days ago", first) == ["ago"]
+    assert matched_text("10 days later", second) == ["later"]
+
+
+def test_smart_parse_after_partial_consumption():
+    group = smart_group()
+    assert next(group.parse("10 days")).end == 7
+    assert matched_text("10 days", group.parse("10 days")) == ["10 days"]
+
+
+def _parse_time(text):
+    return [(d.start, d.end, d.value) for d in parse_dimension(text, time=True)]
+
+
+def test_parse_dimension_from_threads():
+    texts = TIME_TEXTS * 25
+    expected = [_parse_time(text) for text in texts]
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(_parse_time, texts)) == expected
+
+
+def test_smart_parse_from_threads():
+    group = smart_group()
+    texts = [f"{i} days ago {i + 1} hours later {i + 2}" for i in range(500)]
+
+    def parse(text):
+        return matched_text(text, group.parse(text))
+
+    expected = [parse(text) for text in texts]
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(parse, texts)) == expected
+
+
+def test_range_set_matches_linear_scan():
+    random = Random(0)
+    for _ in range(500):
+        range_set, new_range_set, ranges = _RangeSet(), _RangeSet(), []
+        for i in range(30):
+            start = random.randint(0, 50)
+            end = start + random.randint(0, 10)
+            covered = any(s <= start and end <= e for s, e in ranges)
+            assert (
+                range_set.covers(start, end) or new_range_set.covers(start, end)
+            ) == covered
+            if not covered:
+                new_range_set.add(start, end)
+                ranges.append((start, end))
+            if i % 10 == 9:
+                range_set.update(new_range_set)
+                new_range_set = _RangeSet()
+
+
+def linear_matched_expression(group, text):
+    for expression in group:
+        if expression.fullmatch(text):
+            return expression
+    return None
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("abc", 0), ("ab", 1), ("b", 2), ("xx", 3), ("a", 4), ("xy", 5), ("q", None)],
+)
+def test_get_matched_expression_keeps_priority(text, expected):
+    expressions = [
+        Expression("abc"),
+        Expression(r"a\w"),
+        Expression("(?:ab|b)"),
+        Expression(r"(\w)\1"),
+        Expression("a"),
+        Expression(r"(?P<x>x)\w"),
+    ]
+    group = ExpressionGroup(*expressions)
+    matched = group.get_matched_expression(text)
+    assert matched is (None if expected is None else expressions[expected])
+    assert matched is linear_matched_expression(group, text)
+
+
+def test_get_matched_expression_after_add():
+    group = ExpressionGroup(Expression("a"))
+    assert group.get_matched_expression("b") is None
+    group.add(Expression("b"))
+    assert group.get_matched_expression("b") is group[1]
+    group.expressions.append(Expression(r"\d"))
+    assert group.get_matched_expression("1") is group[2]
+
+
+def test_get_matched_expression_matches_linear_scan():
+    groups = [
+        value
+        for value in vars(rules.time.rule).values()
+        if isinstance(value, ExpressionGroup)
+    ] + [rules.numeral.rule.ones, rules.numeral.rule.MULTIPLIERS]
+    words = Path("sample_data/wiki_arnumbers.txt").read_text(encoding="utf8").split()
+    texts = words[:300] + [" ".join(words[i : i + 2]) for i in range(300)]
+    texts += TIME_TEXTS + ["ثلاثة", "مليار", "الاحد", "بعد يومين", "الساعة ٣"]
+    for group in groups:
+        for text in texts:
+            expected = linear_matched_expression(group, text)
+            assert group.get_matched_expression(text) is expected
+
+
+def test_combined_parse_dispatches_to_expressions():
+    expressions = [
+        Value(1, "one"),
+        FunctionValue(
+            lambda match: int(match.group("n")), r"(?P<n>\d+) days", pickle=False
+        ),
+        Expression(r"(\d+)"),
+        Expression(r"(\w+)"),
+    ]
+    group = ExpressionGroup(*expressions, combined=True)
+    results = list(group.parse("one 10 days and 5"))
+
+    assert [(r.start, r.end, r.value) for r in results] == [
+        (0, 3, 1),
+        (4, 11, 10),
+        (12, 15, "and"),
+        (16, 17, "5"),
+    ]
+    assert [r.expression for r in results] == [expressions[i] for i in [0, 1, 3, 2]]
+
+
+def test_combined_parse_matches_sorted_normal_parse():
+    group = ExpressionGroup(
+        Expression(r"\d+/\d+/\d+"), Expression(r"[a-z]+"), Expression(r"[A-Z]+")
+    )
+    text = "on 1/2/2021 we posted NEWS and 3/4/2022 MORE"
+
+    expected = sorted(group.normal_parse(text), key=lambda r: r.start)
+    assert list(group.combined_parse(text)) == expected
+
+
+def test_combined_parse_falls_back_to_smart_parse():
+    group = ExpressionGroup(Expression(r"(\w)\1"), Expression(r"\w+"), combined=True)
+    text = "aa bbc"
+    assert list(group.parse(text)) == list(group.smart_parse(text))
@@ -0,0 +1,222 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import regex as re
+
+from maha.rexy import (
+    PATTERN_CACHE,
+    Expression,
+    PatternCache,
+    get_cache_dir,
+    pattern_key,
+    set_cache_dir,
+)
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return PatternCache(tmp_path / "patterns.bundle")
+
+
+def test_pattern_key_includes_flags_and_regex_version():
+    key = pattern_key("a+", re.MULTILINE)
+    assert key.endswith(f"-{int(re.MULTILINE)}-{re.__version__}")
+    assert key != pattern_key("a+", re.IGNORECASE)
+    assert key != pattern_key("b+", re.MULTILINE)
+
+
+def test_put_and_get(cache: PatternCache):
+    assert cache.get("a+") is None
+    cache.put(re.compile("a+", re.MULTILINE))
+
+    assert cache.get("a+").findall("aa b a") == ["aa", "a"]
+    assert cache.get("a+", re.IGNORECASE) is None
+    assert len(cache) == 1
+
+
+def test_bundle_is_shared_between_instances(cache: PatternCache):
+    cache.put(re.compile("a+", re.MULTILINE))
+    cache.put(re.compile("b+", re.MULTILINE))
+    cache.put_source("letters", "[ab]+")
+
+    other = PatternCache(cache.path)
+    assert set(other.keys()) == {pattern_key("a+"), pattern_key("b+")}
+    assert other.get("b+").pattern == "b+"
+    assert other.get_source("letters") == "[ab]+"
+    assert other.get_source("numbers") is None
+
+
+def test_patterns_of_other_regex_versions_are_dropped(cache: PatternCache, monkeypatch):
+    monkeypatch.setattr(re, "__version__", "0.0.0")
+    cache.put(re.compile("a+", re.MULTILINE))
+    assert cache.keys() == [pattern_key("a+")]
+
+    monkeypatch.undo()
+    assert cache.get("a+") is None
+    cache.put(re.compile("b+", re.MULTILINE))
+    assert cache.keys() == [pattern_key("b+")]
+
+
+def test_clear_patterns_keeps_sources(cache: PatternCache):
+    cache.put(re.compile("a+", re.MULTILINE))
+    cache.put_source("letters", "[ab]+")
+    cache.clear_patterns()
+    assert len(cache) == 0
+    assert cache.get_source("letters") == "[ab]+"
+
+
+def test_invalid_bundle_is_ignored(cache: PatternCache):
+    cache.path.write_bytes(b"not a bundle")
+    assert cache.get("a+") is None
+    cache.put(re.compile("a+", re.MULTILINE))
+    assert PatternCache(cache.path).get("a+") is not None
+
+
+def test_empty_bundle_is_ignored(cache: PatternCache):
+    cache.path.write_bytes(b"")
+    assert cache.get("a+") is None
+
+
+def test_expression_from_cache():
+    expression = Expression.from_cache("names")
+    assert expression.pattern == PATTERN_CACHE.get_source("names")
+    assert pattern_key(expression.pattern) in PATTERN_CACHE
+    with pytest.raises(ValueError):
+        Expression.from_cache("unknown")
+
+
+@pytest.fixture()
+def cache_dir(tmp_path):
+    set_cache_dir(tmp_path)
+    yield tmp_path
+    set_cache_dir(None)
+
+
+def test_unwritable_cache_falls_back_to_compiling(tmp_path):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    cache = PatternCache(not_a_directory / "patterns.bundle")
+
+    assert not cache.put(re.compile("a+", re.MULTILINE))
+    assert cache.get("a+") is None
+
+    set_cache_dir(not_a_directory)
+    try:
+        expression = Expression("unwritable a+", pickle=True)
+        assert expression.search("unwritable aa")
+    finally:
+        set_cache_dir(None)
+
+
+def test_unwritable_cache_skips_later_saves(cache: PatternCache, monkeypatch):
+    writes = []
+
+    def write(blobs, sources):
+        writes.append(blobs)
+        raise OSError
+
+    monkeypatch.setattr(cache, "_write", write)
+    assert not cache.put(re.compile("a+", re.MULTILINE))
+    assert not cache.put(re.compile("b+", re.MULTILINE))
+    cache.add(re.compile("c+", re.MULTILINE))
+    assert not cache.flush()
+    assert len(writes) == 1
+    assert cache.get("c+").pattern == "c+"
+
+
+def test_fallback_cache(tmp_path, cache: PatternCache):
+    cache.put(re.compile("a+", re.MULTILINE))
+    cache.put_source("letters", "[ab]+")
+    layered = PatternCache(tmp_path / "user" / "patterns.bundle", fallback=cache)
+
+    assert layered.get("a+") is not None
+    assert layered.get_source("letters") == "[ab]+"
+    assert pattern_key("a+") in layered
+
+    layered.put(re.compile("b+", re.MULTILINE))
+    assert pattern_key("b+") not in cache
+    assert set(layered.keys()) == {pattern_key("a+"), pattern_key("b+")}
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="file modes are not supported")
+def test_save_is_atomic(cache: PatternCache):
+    cache.put(re.compile("a+", re.MULTILINE))
+    cache.path.chmod(0o640)
+    cache.put(re.compile("b+", re.MULTILINE))
+
+    assert sorted(p.name for p in cache.path.parent.iterdir()) == [
+        "patterns.bundle",
+        "patterns.bundle.lock",
+    ]
+    assert cache.path.stat().st_mode & 0o777 == 0o640
+
+
+def test_add_saves_on_flush(cache: PatternCache):
+    compiled = re.compile("a+", re.MULTILINE)
+    cache.add(compiled)
+    cache.add(re.compile("b+", re.MULTILINE))
+    assert cache.get("a+") is compiled
+    assert pattern_key("b+") in cache
+    assert not cache.path.exists()
+
+    assert cache.flush()
+    assert sorted(PatternCache(cache.path).keys()) == sorted(
+        [pattern_key("a+"), pattern_key("b+")]
+    )
+
+
+def test_flush_writes_bundle_once(cache: PatternCache, monkeypatch):
+    writes = []
+    write = cache._write
+    monkeypatch.setattr(cache, "_write", lambda *args: writes.append(write(*args)))
+    for i in range(10):
+        cache.add(re.compile(f"a{i}", re.MULTILINE))
+    assert cache.flush()
+    assert cache.flush()
+    assert len(writes) == 1
+    assert len(PatternCache(cache.path)) == 10
+
+
+def test_set_cache_dir(cache_dir):
+    assert get_cache_dir() == cache_dir
+    assert PATTERN_CACHE.get_source("names") is not None
+
+    expression = Expression("cache dir a+", pickle=True)
+    expression.compile()
+    assert pattern_key(expression.pattern) in PATTERN_CACHE
+    assert PATTERN_CACHE.flush()
+    assert pattern_key(expression.pattern) in PatternCache(
+        cache_dir / "patterns.bundle"
+    )
+    assert pattern_key(expression.pattern) not in PATTERN_CACHE.fallback
+
+
+def test_cache_dir_from_environment(tmp_path):
+    output = subprocess.run(
+        [sys.executable, "-c", "from maha.rexy import *; print(get_cache_dir())"],
+        env=dict(os.environ, MAHA_CACHE_DIR=str(tmp_path)),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert output.stdout.strip() == str(tmp_path)
+
+
+def _put_patterns(args):
+    path, worker = args
+    cache = PatternCache(path)
+    for i in range(10):
+        cache.put(re.compile(f"{worker}-{i}", re.MULTILINE))
+
+
+def test_concurrent_writers_keep_bundle_valid(cache: PatternCache):
+    with ProcessPoolExecutor(4) as executor:
+        list(executor.map(_put_patterns, [(cache.path, w) for w in range(4)]))
+
+    assert len(cache) == 40
+    for worker in range(4):
+        for i in range(10):
+            assert cache.get(f"{worker}-{i}").pattern == f"{worker}-{i}"
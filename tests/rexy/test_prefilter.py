@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import pytest
+import regex as re
+
+import maha.expressions as expressions
+from maha.rexy import Expression, derive_anchors, derive_prefilter, passes_prefilter
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("EXPRESSION_HASHTAGS", (("#",),)),
+        ("EXPRESSION_MENTIONS", (("@",),)),
+        ("EXPRESSION_EMAILS", ((".",), ("@",))),
+        ("EXPRESSION_LINKS", ((".", ":"),)),
+        ("EXPRESSION_EMOJIS", ()),
+    ],
+)
+def test_derive_prefilter_of_expressions(name, expected):
+    assert derive_prefilter(getattr(expressions, name).pattern) == expected
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        (r"(?:a|b)c?", (("a", "b"),)),
+        (r"x[ةه]", (("x",), ("ة", "ه"))),
+        (r"a*b{0,2}(?=c)", ()),
+        (r"(?i)ab@", (("@",),)),
+        (r"a(?i:b)", (("a",),)),
+        (r" (?x) a # comment", (("a",),)),
+        (r"(?P<n>a)|(?P<n>b)", (("a", "b"),)),
+        (r"(a)\1", ()),
+        (r"[^a]b", (("b",),)),
+        (r"[[:alpha:]]", ()),
+        (r"\p{Arabic}+", ()),
+        (r"(?:hello){e<=1}", ()),
+        (r"(?:ab){1i+1d<2}c", ()),
+        (r"a{2}b{1,}c{,3}", (("a",), ("b",))),
+        (r"\\{e}", ()),
+        (r"\{e\}x", (("e",), ("x",), ("{",), ("}",))),
+        (r"\N{ARABIC LETTER ALEF}", ()),
+        (r"(?|(a)|(b))", ()),
+        (r"(?>ab)c", ()),
+        (r"a++b", ()),
+        (r"\mab\M", ()),
+        (r"\X", ()),
+    ],
+)
+def test_derive_prefilter(pattern, expected):
+    assert derive_prefilter(pattern) == expected
+
+
+def test_passes_prefilter():
+    assert passes_prefilter("a@b.c", ((".",), ("@",)))
+    assert not passes_prefilter("a@b", ((".",), ("@",)))
+    assert passes_prefilter("abc", ())
+    assert passes_prefilter("say hi", (("hello", "hi"),))
+
+
+def test_expression_prefilter():
+    assert Expression("#a").prefilter == (("#",), ("a",))
+    assert Expression("#a", prefilter=False).prefilter == ()
+    expression = Expression(r"\d+", prefilter=["x"])
+    assert expression.prefilter == (("x",),)
+    assert expression.search("12") is None
+    assert expression.sub("", "12") == "12"
+    assert list(expression.parse("12")) == []
+    assert expression.search("x12")
+
+
+@pytest.mark.parametrize(
+    "pattern, text",
+    [(r"(?:hello){e<=1}", "hallo"), (r"(?:ab){s<=1}c", "xbc"), (r"\p{Arabic}", "ب")],
+)
+def test_prefilter_keeps_regex_only_syntax(pattern, text):
+    expression = Expression(pattern)
+    assert expression.prefilter == ()
+    assert expression.search(text) is not None
+    assert [m.span() for m in expression.finditer(text)] == [
+        m.span() for m in re.finditer(pattern, text)
+    ]
+    assert derive_anchors(pattern) == ()
+
+
+def test_prefilter_does_not_change_results():
+    text = " ".join(p.read_text(encoding="utf8") for p in Path("sample_data").glob("*"))
+    lines = text.splitlines() + ["mail me at a@b.co", "see https://x.com", "#tag @user"]
+    for name in dir(expressions):
+        if not name.startswith("EXPRESSION_"):
+            continue
+        pattern = getattr(expressions, name).pattern
+        expression = Expression(pattern)
+        unfiltered = Expression(pattern, prefilter=False)
+        for line in lines:
+            assert [m.span() for m in expression.finditer(line)] == [
+                m.span() for m in unfiltered.finditer(line)
+            ]
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("abc", ("abc",)),
+        (r"\d+ (?:km|m)", (r"\ km", r"\ m")),
+        (r"(?:\d+|ten) ?days?", ("day",)),
+        (r"(?<=x)ab(?!c)", ("ab",)),
+        (r"[0-9]", tuple("0123456789")),
+        (r"[\dx]+", (r"\d", "x")),
+        (r"(?:a|\w)b", ("b",)),
+        (r"a*", ()),
+        (r"\w+", ()),
+        (r"(?i)abc", ()),
+        (r"(\w)\1", ()),
+    ],
+)
+def test_derive_anchors(pattern, expected):
+    assert derive_anchors(pattern) == expected
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import regex as re
+
+from maha.rexy import PATTERN_REGISTRY, Expression, PatternRegistry
+
+
+def test_registry_returns_same_compiled_pattern():
+    registry = PatternRegistry()
+    assert registry.get("a+") is registry.get("a+")
+    info = registry.info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+
+def test_registry_key_includes_flags():
+    registry = PatternRegistry()
+    assert registry.get("a+", re.MULTILINE) is not registry.get("a+", re.IGNORECASE)
+    assert len(registry) == 2
+
+
+def test_registry_evicts_least_recently_used():
+    registry = PatternRegistry(maxsize=2)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+    assert ("a", re.MULTILINE) in registry
+    assert ("b", re.MULTILINE) not in registry
+    assert registry.info().evictions == 1
+
+
+def test_registry_resize_evicts():
+    registry = PatternRegistry(maxsize=3)
+    for pattern in "abc":
+        registry.get(pattern)
+    registry.maxsize = 1
+    assert len(registry) == 1
+    assert registry.info().evictions == 2
+
+
+def test_registry_zero_size_disables_caching():
+    registry = PatternRegistry(maxsize=0)
+    registry.get("a")
+    registry.get("a")
+    assert registry.info().misses == 2
+    assert len(registry) == 0
+
+
+@pytest.mark.parametrize("maxsize", [-1, 1.5])
+def test_registry_invalid_maxsize(maxsize):
+    with pytest.raises(ValueError):
+        PatternRegistry(maxsize=maxsize)
+
+
+def test_registry_clear():
+    registry = PatternRegistry()
+    registry.get("a")
+    registry.get("a")
+    registry.clear()
+    assert registry.info() == (0, 0, 0, registry.maxsize, 0)
+
+
+def test_registry_is_thread_safe():
+    registry = PatternRegistry(maxsize=8)
+    patterns = [str(i) for i in range(32)] * 50
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda p: registry.get(p).pattern, patterns))
+    assert results == patterns
+    info = registry.info()
+    assert info.hits + info.misses == len(patterns)
+    assert len(registry) <= 8
+
+
+def test_expression_compile_uses_registry():
+    pattern = "maha-registry-test"
+    Expression(pattern).compile()
+    assert (pattern, re.MULTILINE) in PATTERN_REGISTRY
+    hits = PATTERN_REGISTRY.info().hits
+    Expression(pattern).compile()
+    assert PATTERN_REGISTRY.info().hits == hits + 1
@@ -0,0 +1,53 @@
+import pytest
+
+from maha.rexy import StringSet, trie_pattern
+
+
+@pytest.mark.parametrize(
+    "strings, expected",
+    [
+        (["a"], "a"),
+        (["a", "b", "c"], "[abc]"),
+        (["ab", "ac"], "a[bc]"),
+        (["a", "ab"], "ab?"),
+        (["a", "ab", "ac"], "a[bc]?"),
+        (["a", "abc"], "a(?:bc)?"),
+        (["في", "من", "منذ"], "(?:في|منذ?)"),
+        (["a.", "a*"], r"a[\*\.]"),
+    ],
+)
+def test_trie_pattern(strings, expected):
+    assert trie_pattern(strings) == expected
+
+
+def test_string_set_matches_longest_string():
+    string_set = StringSet(["من", "منذ", "منذر"])
+    assert [r.value for r in string_set.parse("منذ منذر من")] == ["منذ", "منذر", "من"]
+
+
+def test_string_set_matches_exactly_the_input_strings():
+    strings = ["abc", "abd", "ab", "b", "bcd", "cd", "x", "xyz", "a.b"]
+    string_set = StringSet(strings)
+    for s in strings:
+        assert string_set.fullmatch(s)
+    for s in ["a", "abcd", "bc", "c", "xy", "axb", ""]:
+        assert not string_set.fullmatch(s)
+
+
+def test_string_set_container():
+    string_set = StringSet(["من", "", "في"])
+    assert len(string_set) == 2
+    assert "في" in string_set
+    assert "" not in string_set
+    assert set(string_set) == {"من", "في"}
+
+
+def test_string_set_from_str():
+    assert StringSet("من").pattern == "من"
+
+
+def test_string_set_raises_on_empty():
+    with pytest.raises(ValueError):
+        StringSet([])
+    with pytest.raises(ValueError):
+        StringSet([""])
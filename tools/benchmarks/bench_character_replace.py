@@ -0,0 +1,127 @@
+"""
+Benchmark the character replacement fast path of the cleaning functions.
+
+Compares removing/normalizing characters using the regex alternation (the path
+used before the fast path) with the public cleaning functions on
+``sample_data/wiki_arlang.txt`` scaled up.
+
+Should be run from the root of the repository::
+
+    python -m tools.benchmarks.bench_character_replace --scale 200
+"""
+import argparse
+import re
+import timeit
+from pathlib import Path
+
+from maha.cleaners.functions import (
+    arabic_numbers_to_english,
+    normalize,
+    remove,
+    replace_expression,
+)
+from maha.constants import (
+    ALEF,
+    ALEF_VARIATIONS,
+    ALL_HARAKAT,
+    ARABIC_NUMBERS,
+    EMPTY,
+    ENGLISH_NUMBERS,
+    HARAKAT,
+    HEH,
+    SPACE,
+    TATWEEL,
+    TEH_MARBUTA,
+    WAW,
+    WAW_VARIATIONS,
+    YEH,
+    YEH_VARIATIONS,
+)
+
+
+def regex_replace(text, strings, with_value):
+    pattern = "|".join(re.escape(c) for c in strings)
+    return replace_expression(text, f"({pattern})", with_value)
+
+
+def regex_replace_pairs(text, keys, values):
+    pattern = "|".join(re.escape(c) for c in keys)
+    return replace_expression(text, pattern, lambda m: values[keys.index(m.group())])
+
+
+def regex_remove_harakat(text):
+    output = regex_replace(text, HARAKAT, EMPTY).strip()
+    output = regex_replace(output, HARAKAT, SPACE)
+    return replace_expression(output, " +", SPACE).strip()
+
+
+def regex_remove_tatweel(text):
+    output = regex_replace(text, [TATWEEL], EMPTY).strip()
+    output = regex_replace(output, [TATWEEL], SPACE)
+    return replace_expression(output, " +", SPACE).strip()
+
+
+def regex_normalize(text):
+    output = regex_replace(text, ALEF_VARIATIONS, ALEF)
+    output = regex_replace(output, WAW_VARIATIONS, WAW)
+    output = regex_replace(output, YEH_VARIATIONS, YEH)
+    return regex_replace(output, [TEH_MARBUTA], HEH)
+
+
+CASES = [
+    (
+        "remove(harakat=True)",
+        regex_remove_harakat,
+        lambda text: remove(text, harakat=True),
+    ),
+    (
+        "remove(tatweel=True)",
+        regex_remove_tatweel,
+        lambda text: remove(text, tatweel=True),
+    ),
+    (
+        "remove all harakat (keys only)",
+        lambda text: regex_replace(text, ALL_HARAKAT, EMPTY),
+        lambda text: remove(text, all_harakat=True, use_space=False),
+    ),
+    (
+        "normalize(alef, waw, yeh, teh_marbuta)",
+        regex_normalize,
+        lambda text: normalize(text, alef=True, waw=True, yeh=True, teh_marbuta=True),
+    ),
+    (
+        "arabic_numbers_to_english",
+        lambda text: regex_replace_pairs(text, ARABIC_NUMBERS, ENGLISH_NUMBERS),
+        arabic_numbers_to_english,
+    ),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=100, help="times to repeat text")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions")
+    args = parser.parse_args()
+
+    text = Path("sample_data/wiki_arlang.txt").read_text(encoding="utf8")
+    lines = text.split("\n") * args.scale
+    print(f"{len(lines)} lines, {sum(map(len, lines)) / 1e6:.2f}M characters\n")
+    print(f"{'case':<40}{'regex (s)':>12}{'fast (s)':>12}{'speedup':>10}")
+
+    for name, regex_fn, fast_fn in CASES:
+        assert [regex_fn(line) for line in lines] == [fast_fn(line) for line in lines]
+        slow = min(
+            timeit.repeat(
+                lambda: [regex_fn(l) for l in lines], number=1, repeat=args.repeat
+            )
+        )
+        fast = min(
+            timeit.repeat(
+                lambda: [fast_fn(l) for l in lines], number=1, repeat=args.repeat
+            )
+        )
+        print(f"{name:<40}{slow:>12.3f}{fast:>12.3f}{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark the overhead of checkpoints in :meth:`~.StreamFileProcessor.process_and_save`.
+
+Builds a synthetic file by repeating the lines of the sample data, then cleans it
+without checkpoints and with checkpoints at each interval. Verifies that all runs save
+the same bytes, and that a run resumed from a checkpoint in the middle of the file
+saves the same bytes.
+
+Should be run from the root of the repository::
+
+    python -m tools.benchmarks.bench_checkpoint --lines 200000 --intervals 0 1 10
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from maha.processors import StreamFileProcessor
+
+
+def make_processor(path: Path) -> StreamFileProcessor:
+    processor = StreamFileProcessor(path)
+    processor.normalize(all=True).remove(
+        harakat=True, english=True, emails=True, links=True, mentions=True
+    ).drop_lines_below_len(5)
+    return processor
+
+
+def measure(source: Path, output: Path, n_lines: int, **kwargs) -> float:
+    processor = make_processor(source)
+    start = time.perf_counter()
+    processor.process_and_save(output, n_lines=n_lines, override=True, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--files", default="sample_data/*.txt", help="glob of files, one text per line"
+    )
+    parser.add_argument("--lines", type=int, default=200000, help="number of lines")
+    parser.add_argument("--n-lines", type=int, default=100, help="lines per chunk")
+    parser.add_argument(
+        "--intervals",
+        type=float,
+        nargs="+",
+        default=[0, 1, 10],
+        help="seconds between checkpoints",
+    )
+    args = parser.parse_args()
+
+    lines = [
+        line
+        for path in sorted(Path().glob(args.files))
+        for line in path.read_text(encoding="utf8").splitlines()
+    ]
+    lines = (lines * (args.lines // len(lines) + 1))[: args.lines]
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "source.txt"
+        source.write_text("\n".join(lines), encoding="utf8")
+        size = source.stat().st_size / 2**20
+        print(f"{args.lines} lines, {size:.1f} MB")
+
+        expected_path = Path(directory) / "expected.txt"
+        baseline = measure(source, expected_path, args.n_lines)
+        expected = expected_path.read_bytes()
+        print(f"{'interval (s)':>13}{'time (s)':>10}{'MB/s':>8}{'overhead':>10}")
+        print(f"{'none':>13}{baseline:>10.2f}{size / baseline:>8.1f}{0:>10.1%}")
+
+        output = Path(directory) / "output.txt"
+        for interval in args.intervals:
+            elapsed = measure(
+                source,
+                output,
+                args.n_lines,
+                checkpoint=True,
+                checkpoint_interval=interval,
+            )
+            assert output.read_bytes() == expected
+            print(
+                f"{interval:>13g}{elapsed:>10.2f}{size / elapsed:>8.1f}"
+                f"{elapsed / baseline - 1:>10.1%}"
+            )
+
+        # Resume from a checkpoint in the middle of the file
+        checkpoint_path = StreamFileProcessor.get_checkpoint_path(output)
+        state = json.loads(checkpoint_path.read_text())
+        chunk = len(lines) // args.n_lines // 2 * args.n_lines
+        state["input_offset"] = len("\n".join(lines[:chunk]).encode("utf8")) + 1
+        processor = make_processor(source)
+        with source.open("r", encoding="utf8") as file:
+            head = [line.strip() for _, line in zip(range(chunk), file)]
+        saved = "".join(text + "\n" for text in processor.plan(head) if text)
+        state["output_offset"] = len(saved.encode("utf8"))
+        checkpoint_path.write_text(json.dumps(state))
+        output.write_bytes(expected[: state["output_offset"]] + b"partial")
+        processor.process_and_save(output, n_lines=args.n_lines, resume=True)
+        assert output.read_bytes() == expected
+        print("resumed output is identical")
+
+
+if __name__ == "__main__":
+    main()
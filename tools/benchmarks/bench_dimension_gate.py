@@ -0,0 +1,69 @@
+"""
+Benchmark the anchor gate of :func:`~.parse_dimension`.
+
+Parses each line of the sample data, one text per call, with the anchor gate and
+without it (every rule runs on every text), and verifies that both produce the same
+dimensions. Reports the share of texts each gate skips.
+
+Should be run from the root of the repository::
+
+    python -m tools.benchmarks.bench_dimension_gate --repeat 3
+"""
+import argparse
+import time
+from pathlib import Path
+
+import maha.parsers.rules as rules
+from maha.parsers.functions.parse_dimensions import _get_dimensions, _get_gate
+from maha.parsers.templates import DimensionType
+
+DIMENSIONS = {
+    "duration": (rules.RULE_DURATION, DimensionType.DURATION),
+    "distance": (rules.RULE_DISTANCE, DimensionType.DISTANCE),
+    "numeral": (rules.RULE_NUMERAL, DimensionType.NUMERAL),
+    "ordinal": (rules.RULE_ORDINAL, DimensionType.ORDINAL),
+    "time": (rules.RULE_TIME, DimensionType.TIME),
+}
+
+
+def measure(rule, dimension_type, texts, gated: bool, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        output = [_get_dimensions(rule, t, dimension_type, gated) for t in texts]
+    return output, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--files", default="sample_data/*.txt", help="glob of files, one text per line"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs")
+    args = parser.parse_args()
+
+    texts = [
+        line
+        for path in sorted(Path().glob(args.files))
+        for line in path.read_text(encoding="utf8").splitlines()
+        if line.strip()
+    ]
+    print(
+        f"{'dimension':>10}{'texts':>8}{'skipped':>9}{'ungated (s)':>13}"
+        f"{'gated (s)':>11}{'speedup':>9}"
+    )
+    for name, (rule, dimension_type) in DIMENSIONS.items():
+        gate = _get_gate(rule, dimension_type)
+        # Warm up the rule and its caches
+        measure(rule, dimension_type, texts, False, 1)
+        skipped = sum(1 for t in texts if gate is not None and not gate.search(t))
+        expected, ungated = measure(rule, dimension_type, texts, False, args.repeat)
+        output, gated = measure(rule, dimension_type, texts, True, args.repeat)
+        assert output == expected
+        print(
+            f"{name:>10}{len(texts):>8}{skipped / len(texts):>9.0%}{ungated:>13.3f}"
+            f"{gated:>11.3f}{ungated / gated:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
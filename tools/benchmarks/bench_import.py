@@ -0,0 +1,63 @@
+"""
+Benchmark the import time and memory of :mod:`maha.parsers`.
+
+Imports the package in a fresh process, once as is (the rules are loaded lazily) and
+once loading the rules of every dimension. Reports the median time spent importing
+(and loading) and the maximum resident set size of the process.
+
+Should be run from the root of the repository::
+
+    python -m tools.benchmarks.bench_import --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+SCRIPT = """
+import json, resource, sys, time
+
+start = time.perf_counter()
+import maha.parsers
+if {load_rules}:
+    for name in ["RULE_DISTANCE", "RULE_DURATION", "RULE_NAME", "RULE_NUMERAL",
+                 "RULE_ORDINAL", "RULE_TIME"]:
+        getattr(maha.parsers.rules, name)
+elapsed = time.perf_counter() - start
+# Kilobytes on Linux, bytes on macOS
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss //= 1024
+print(json.dumps({{"time": elapsed, "rss": rss}}))
+"""
+
+
+def measure(load_rules: bool, repeat: int):
+    times, rss = [], []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(load_rules=load_rules)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        result = json.loads(output.stdout)
+        times.append(result["time"])
+        rss.append(result["rss"])
+    return statistics.median(times), statistics.median(rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs")
+    args = parser.parse_args()
+
+    print(f"{'rules':>8}{'time (ms)':>11}{'max RSS (MB)':>14}")
+    for name, load_rules in (("lazy", False), ("all", True)):
+        elapsed, rss = measure(load_rules, args.repeat)
+        print(f"{name:>8}{elapsed * 1000:>11.1f}{rss / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark :class:`~.LineIndex` against reading the lines of a file.
+
+Builds a synthetic file by repeating the lines of the sample data. Compares counting
+the lines by decoding the file with building the index and loading the saved index,
+then reading random lines through the index with reading the whole file with
+:class:`~.FileProcessor`. Verifies that all methods agree.
+
+Should be run from the root of the repository::
+
+    python -m tools.benchmarks.bench_line_index --lines 1000000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from maha.processors import FileProcessor, LineIndex
+
+
+def measure(fn):
+    start = time.perf_counter()
+    output = fn()
+    return output, time.perf_counter() - start
+
+
+def count_lines(path: Path) -> int:
+    with path.open("r", encoding="utf8") as file:
+        return sum(1 for _ in file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--files", default="sample_data/*.txt", help="glob of files, one text per line"
+    )
+    parser.add_argument("--lines", type=int, default=1000000, help="number of lines")
+    parser.add_argument("--reads", type=int, default=1000, help="random line reads")
+    args = parser.parse_args()
+
+    lines = [
+        line
+        for path in sorted(Path().glob(args.files))
+        for line in path.read_text(encoding="utf8").splitlines()
+    ]
+    lines = (lines * (args.lines // len(lines) + 1))[: args.lines]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "source.txt"
+        path.write_text("\n".join(lines), encoding="utf8")
+        print(f"{args.lines} lines, {path.stat().st_size / 2**20:.1f} MB")
+
+        count, decode = measure(lambda: count_lines(path))
+        index, build = measure(lambda: LineIndex.build(path))
+        index.save()
+        loaded, load = measure(lambda: LineIndex.load(path))
+        assert count == len(index) == len(loaded) == len(lines)
+        print(f"{'line count':>24}{'time (s)':>10}")
+        print(f"{'decode file':>24}{decode:>10.3f}")
+        print(f"{'build index':>24}{build:>10.3f}")
+        print(f"{'load saved index':>24}{load:>10.4f}")
+
+        numbers = random.Random(0).sample(range(len(lines)), min(args.reads, count))
+        read, index_reads = measure(lambda: [index[i] for i in numbers])
+        processor, file_reads = measure(lambda: FileProcessor(path))
+        assert read == [processor.lines[i] for i in numbers]
+        print(f"{f'{len(numbers)} random lines':>24}{'time (s)':>10}")
+        print(f"{'FileProcessor':>24}{file_reads:>10.3f}")
+        print(f"{'index':>24}{index_reads:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark the scaling of :func:`~.parse_dimension_batch` with the number of workers.
+
+Builds synthetic short messages from time, duration and numeral phrases mixed with
+plain words, then parses them with one call of :func:`~.parse_dimension` per text and
+with :func:`~.parse_dimension_batch` for each number of workers. Verifies that all
+runs produce the same dimensions. The worker pool is started and warmed up before it
+is timed.
+
+Should be run from the root of the repository::
+
+    python -m tools.benchmarks.bench_parse_batch --texts 2000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import time
+
+from maha.parsers.functions import (
+    parse_dimension,
+    parse_dimension_batch,
+    shutdown_batch_pool,
+)
+
+PHRASES = [
+    "بعد ثلاث ساعات",
+    "الساعة العاشرة وخمس دقائق",
+    "يوم الجمعة القادم",
+    "١٥ شهر ٦ ٢٠٢١",
+    "قبل ٢٠ دقيقة",
+    "اشتريت ٣ كتب",
+    "مليون و ٣٠٠ ألف",
+    "الشهر الماضي",
+]
+WORDS = ["شكرا", "على", "المتابعة", "في", "من", "الى", "رائع", "جدا", "اليوم", "كتاب"]
+
+
+def make_texts(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(3, 12))
+        if rng.random() < 0.5:
+            words.insert(rng.randint(0, len(words)), rng.choice(PHRASES))
+        texts.append(" ".join(words))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=2000, help="number of texts")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="worker counts"
+    )
+    parser.add_argument("--chunksize", type=int, default=256, help="texts per task")
+    args = parser.parse_args()
+
+    dimensions = dict(time=True, duration=True, numeral=True)
+    texts = make_texts(args.texts)
+    print(f"{args.texts} texts, {os.cpu_count()} CPUs")
+
+    parse_dimension(texts[0], **dimensions)
+    start = time.perf_counter()
+    expected = [parse_dimension(text, **dimensions) for text in texts]
+    serial = time.perf_counter() - start
+    print(f"{'workers':>8}{'time (s)':>10}{'texts/s':>10}{'speedup':>9}")
+    print(f"{'serial':>8}{serial:>10.2f}{len(texts) / serial:>10.0f}{1:>9.1f}")
+
+    for workers in args.workers:
+        # Start the pool and load the rules in every worker
+        parse_dimension_batch(
+            texts[: args.chunksize * workers * 2],
+            workers=workers,
+            chunksize=args.chunksize,
+            **dimensions,
+        )
+        start = time.perf_counter()
+        output = parse_dimension_batch(
+            texts, workers=workers, chunksize=args.chunksize, **dimensions
+        )
+        elapsed = time.perf_counter() - start
+        assert output == expected
+        print(
+            f"{workers:>8}{elapsed:>10.2f}{len(texts) / elapsed:>10.0f}"
+            f"{serial / elapsed:>9.1f}"
+        )
+        shutdown_batch_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark the overlap check of :meth:`~.ExpressionGroup.smart_parse`.
+
+Builds a synthetic document of numerals, dates and words, then parses it with a smart
+group whose expressions match overlapping spans. Compares the current implementation
+with plain matching (:meth:`~.ExpressionGroup.normal_parse`) and with a linear scan
+over the previously parsed ranges (how the check used to work), and verifies that both
+produce the same results. Also reports the single scan of
+:meth:`~.ExpressionGroup.combined_parse`, which matches non-overlapping values only.
+
+Should be run from the root of the repository::
+
+    python -m tools.benchmarks.bench_smart_parse --size 1
+"""
+import argparse
+import random
+import time
+
+from maha.rexy import Expression, ExpressionGroup
+
+WORDS = ["الساعة", "يوم", "سنة", "كتاب", "في", "من", "الى", "عدد", "صفحة", "مساء"]
+
+
+def make_document(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    tokens = []
+    length = 0
+    while length < size:
+        kind = rng.random()
+        if kind < 0.3:
+            token = str(rng.randint(1, 100000))
+        elif kind < 0.4:
+            token = (
+                f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/{rng.randint(1990, 2030)}"
+            )
+        else:
+            token = rng.choice(WORDS)
+        tokens.append(token)
+        length += len(token) + 1
+    return " ".join(tokens)
+
+
+def make_group() -> ExpressionGroup:
+    return ExpressionGroup(
+        Expression(r"\d+/\d+/\d+"),
+        Expression(r"\d+ \w+"),
+        Expression(r"\d+"),
+        Expression(r"\w+"),
+        smart=True,
+    )
+
+
+def linear_smart_parse(group: ExpressionGroup, text: str):
+    parsed_ranges = set()
+    for result in group.normal_parse(text):
+        if any(
+            start <= result.start <= end and start <= result.end <= end
+            for start, end in parsed_ranges
+        ):
+            continue
+        parsed_ranges.add((result.start, result.end))
+        yield result
+
+
+def measure(parse, text: str):
+    start = time.perf_counter()
+    spans = [(r.start, r.end) for r in parse(text)]
+    return spans, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--size", type=float, default=1, help="document size in MB of characters"
+    )
+    parser.add_argument(
+        "--linear-size",
+        type=float,
+        default=0.05,
+        help="document size for the linear scan, which is quadratic",
+    )
+    args = parser.parse_args()
+
+    group = make_group()
+    group.compile_expressions()
+    print(
+        f"{'size (MB)':>10}{'matches':>10}{'normal (s)':>12}{'smart (s)':>12}"
+        f"{'linear (s)':>12}{'combined (s)':>14}{'matches':>10}"
+    )
+    for size in sorted({args.linear_size, args.size}):
+        text = make_document(int(size * 1e6))
+        _, normal_elapsed = measure(group.normal_parse, text)
+        spans, elapsed = measure(group.smart_parse, text)
+        combined_spans, combined_elapsed = measure(group.combined_parse, text)
+        linear = "-"
+        if size <= args.linear_size:
+            linear_spans, linear_elapsed = measure(
+                lambda t: linear_smart_parse(group, t), text
+            )
+            assert spans == linear_spans
+            linear = f"{linear_elapsed:.2f}"
+        print(
+            f"{size:>10}{len(spans):>10}{normal_elapsed:>12.2f}{elapsed:>12.2f}"
+            f"{linear:>12}{combined_elapsed:>14.2f}{len(combined_spans):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark the throughput of :class:`~.StreamFileProcessor` with the number of workers.
+
+Builds a synthetic file by repeating the lines of the sample data, then cleans it
+with :meth:`~.StreamFileProcessor.process_and_save` in the current process and with
+each number of workers. Verifies that all runs save the same bytes.
+
+Should be run from the root of the repository::
+
+    python -m tools.benchmarks.bench_stream_processor --lines 50000 --workers 2 4
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from maha.processors import StreamFileProcessor
+
+
+def make_processor(path: Path) -> StreamFileProcessor:
+    processor = StreamFileProcessor(path)
+    processor.normalize(all=True).remove(
+        harakat=True, english=True, emails=True, links=True, mentions=True
+    ).reduce_repeated_substring().drop_lines_below_len(5)
+    return processor
+
+
+def measure(source: Path, output: Path, n_lines: int, workers: int) -> float:
+    processor = make_processor(source)
+    start = time.perf_counter()
+    processor.process_and_save(output, n_lines=n_lines, override=True, workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--files", default="sample_data/*.txt", help="glob of files, one text per line"
+    )
+    parser.add_argument("--lines", type=int, default=50000, help="number of lines")
+    parser.add_argument("--n-lines", type=int, default=1000, help="lines per chunk")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[2, 4], help="worker counts"
+    )
+    args = parser.parse_args()
+
+    lines = [
+        line
+        for path in sorted(Path().glob(args.files))
+        for line in path.read_text(encoding="utf8").splitlines()
+    ]
+    lines = (lines * (args.lines // len(lines) + 1))[: args.lines]
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "source.txt"
+        source.write_text("\n".join(lines), encoding="utf8")
+        size = source.stat().st_size / 2**20
+        print(f"{args.lines} lines, {size:.1f} MB, {os.cpu_count()} CPUs")
+
+        expected_path = Path(directory) / "serial.txt"
+        serial = measure(source, expected_path, args.n_lines, 1)
+        expected = expected_path.read_bytes()
+        print(f"{'workers':>8}{'time (s)':>10}{'MB/s':>8}{'speedup':>9}")
+        print(f"{1:>8}{serial:>10.2f}{size / serial:>8.1f}{1:>9.1f}")
+
+        output = Path(directory) / "parallel.txt"
+        for workers in args.workers:
+            elapsed = measure(source, output, args.n_lines, workers)
+            assert output.read_bytes() == expected
+            print(
+                f"{workers:>8}{elapsed:>10.2f}{size / elapsed:>8.1f}"
+                f"{serial / elapsed:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
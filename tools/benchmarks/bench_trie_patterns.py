@@ -0,0 +1,86 @@
+"""
+Benchmark prefix-factored (trie) patterns against flat alternations.
+
+Compiles the same word list as a flat alternation (how :data:`~.RULE_NAME` used to be
+built) and as a :func:`~.trie_pattern`, then reports pattern length, compile time,
+pickled size, load time and search throughput for both. The words are the unique
+Arabic words of ``sample_data`` unless ``--words`` is given (one word per line).
+
+Should be run from the root of the repository::
+
+    python -m tools.benchmarks.bench_trie_patterns --scale 20
+"""
+import argparse
+import pickle
+import timeit
+from pathlib import Path
+
+import regex as re
+
+from maha.cleaners.functions import keep
+from maha.parsers.rules.common import wrap_pattern
+from maha.rexy import capture_group, trie_pattern
+
+
+def load_words(path):
+    if path:
+        words = Path(path).read_text(encoding="utf8").splitlines()
+    else:
+        text = " ".join(
+            p.read_text(encoding="utf8") for p in Path("sample_data").glob("*.txt")
+        )
+        words = keep(text, arabic_letters=True).split()
+    return list(dict.fromkeys(w for w in words if w))
+
+
+def measure(pattern, text, repeat):
+    compile_time = min(
+        timeit.repeat(
+            lambda: (re.purge(), re.compile(pattern, re.MULTILINE)),
+            number=1,
+            repeat=repeat,
+        )
+    )
+    compiled = re.compile(pattern, re.MULTILINE)
+    data = pickle.dumps(compiled)
+    load_time = min(
+        timeit.repeat(lambda: (re.purge(), pickle.loads(data)), number=1, repeat=repeat)
+    )
+    search_time = min(
+        timeit.repeat(lambda: compiled.findall(text), number=1, repeat=repeat)
+    )
+    spans = [m.span() for m in compiled.finditer(text)]
+    return spans, [
+        f"{len(pattern) / 1e3:.1f}K",
+        f"{compile_time * 1e3:.1f}",
+        f"{len(data) / 1e3:.1f}",
+        f"{load_time * 1e3:.2f}",
+        f"{len(text) / 1e6 / search_time:.2f}",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", help="file with one word per line")
+    parser.add_argument("--scale", type=int, default=20, help="times to repeat text")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions")
+    args = parser.parse_args()
+
+    words = load_words(args.words)
+    text = Path("sample_data/wiki_arlang.txt").read_text(encoding="utf8")
+    text *= args.scale
+    print(f"{len(words)} words, {len(text) / 1e6:.2f}M characters\n")
+
+    header = ["pattern", "length", "compile (ms)", "pickle (KB)", "load (ms)", "MB/s"]
+    print("".join(f"{h:>14}" for h in header))
+    flat_spans, flat = measure(wrap_pattern(capture_group(*words)), text, args.repeat)
+    print("".join(f"{h:>14}" for h in ["flat"] + flat))
+    trie_spans, trie = measure(
+        wrap_pattern(capture_group(trie_pattern(words))), text, args.repeat
+    )
+    print("".join(f"{h:>14}" for h in ["trie"] + trie))
+    assert flat_spans == trie_spans
+
+
+if __name__ == "__main__":
+    main()
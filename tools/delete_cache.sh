@@ -1,5 +1,5 @@
-# Remove old rule cache files
-# This scipt should be run before commiting modified cache files to prevent repo bloat
+# Remove old compiled patterns from the rule cache bundle, named pattern sources are kept.
+# This scipt should be run before commiting a modified cache bundle to prevent repo bloat,
+# run the tests afterwards to fill the bundle with the current rules.
 # Should be run from the root of the repository
-git rm --cached maha/rexy/cache/[0-9]*
-rm maha/rexy/cache/[0-9]*
\ No newline at end of file
+python -c "from maha.rexy import PATTERN_CACHE; PATTERN_CACHE.clear_patterns()"
@@ -0,0 +1,20 @@
+from maha.parsers.functions.parse_dimensions import (
+    _RULE_NAMES,
+    _get_anchors_name,
+    _get_rule,
+)
+from maha.parsers.templates import DimensionType
+from maha.rexy import PATTERN_CACHE, derive_anchors
+
+# Anchors of the dimension rules are read from the cache bundle by `parse_dimension`,
+# deriving them from large rules takes a few seconds. Run this script after modifying
+# the rules to save their anchors, parsing never writes to the bundle.
+# Should be run from the root of the repository
+for dimension_type, rule_name in _RULE_NAMES.items():
+    # Names are not gated, see `_parse_dimension_type`
+    if dimension_type is DimensionType.NAME:
+        continue
+    rule = _get_rule(dimension_type)
+    anchors = derive_anchors(rule.pattern)
+    print(f"{rule_name}: {len(anchors)} anchors")
+    PATTERN_CACHE.put_source(_get_anchors_name(rule), "|".join(anchors))